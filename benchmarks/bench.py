@@ -0,0 +1,117 @@
+"""Timeflux benchmarks
+
+Measure the throughput and the cycle latency of the core nodes and of the scheduler,
+and compare two runs to detect performance regressions.
+
+Usage:
+
+    python benchmarks/bench.py run -o baseline.json
+    python benchmarks/bench.py run -o candidate.json
+    python benchmarks/bench.py compare baseline.json candidate.json
+
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import sys
+from datetime import datetime
+
+# Benchmark the source tree this script belongs to, even if it is not installed
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path[:0] = [HERE, os.path.dirname(HERE)]
+
+import timeflux
+from suite import collect
+
+
+def run(args):
+    logging.getLogger("timeflux").setLevel(logging.CRITICAL)
+    cycles = args.cycles or (50 if args.quick else 500)
+    cases = collect(cycles, args.keyword)
+    if not cases:
+        sys.exit("No matching benchmark")
+    results = {}
+    for case in cases:
+        result = case.run()
+        results[case.id] = result
+        print(
+            f"{case.id:<68} {result['throughput']:>14,.0f} samples/s"
+            f" {result['p50']:>9.3f} ms p50 {result['p95']:>9.3f} ms p95"
+        )
+    report = {
+        "timeflux": timeflux.__version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "date": datetime.now().isoformat(timespec="seconds"),
+        "cycles": cycles,
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as stream:
+            json.dump(report, stream, indent=2, default=float)
+        print(f"Results written to {args.output}")
+
+
+def compare(args):
+    with open(args.baseline) as stream:
+        baseline = json.load(stream)["results"]
+    with open(args.candidate) as stream:
+        candidate = json.load(stream)["results"]
+    regressions = 0
+    print(f"{'benchmark':<68} {'throughput':>10} {'p95':>10}")
+    for key in sorted(baseline.keys() & candidate.keys()):
+        before, after = baseline[key], candidate[key]
+        # Relative changes, positive when worse
+        throughput = 1 - after["throughput"] / before["throughput"]
+        latency = after["p95"] / before["p95"] - 1
+        flag = ""
+        if throughput > args.threshold or latency > args.threshold:
+            flag = "  REGRESSION"
+            regressions += 1
+        print(f"{key:<68} {-throughput:>+10.1%} {latency:>+10.1%}{flag}")
+    for key in sorted(baseline.keys() - candidate.keys()):
+        print(f"{key:<68} missing from {args.candidate}")
+    if regressions:
+        print(f"{regressions} regression(s) above {args.threshold:.0%}")
+        sys.exit(1)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Timeflux benchmarks",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    parser_run = commands.add_parser("run", help="run the benchmarks")
+    parser_run.add_argument("-o", "--output", help="path to the JSON results")
+    parser_run.add_argument(
+        "-k",
+        "--keyword",
+        help="only run the benchmarks matching all these comma-separated terms, "
+        "such as 'Slide,chunk=10'",
+    )
+    parser_run.add_argument("-n", "--cycles", type=int, help="timed cycles per case")
+    parser_run.add_argument(
+        "-q", "--quick", action="store_true", help="fewer cycles, for smoke testing"
+    )
+    parser_run.set_defaults(function=run)
+    parser_compare = commands.add_parser("compare", help="compare two runs")
+    parser_compare.add_argument("baseline", help="path to the reference results")
+    parser_compare.add_argument("candidate", help="path to the new results")
+    parser_compare.add_argument(
+        "-t",
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="relative throughput drop or p95 latency increase flagged as regression",
+    )
+    parser_compare.set_defaults(function=compare)
+    args = parser.parse_args()
+    args.function(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,307 @@
+"""Benchmark cases
+
+Each case drives a node (or the scheduler) the same way :class:`Looper` does: ports
+are cleared, the inputs are set from a :class:`DummyData` generator, and the node is
+updated. Only the updates are timed.
+
+"""
+
+import itertools
+import time
+from abc import ABC, abstractmethod
+import numpy as np
+import pandas as pd
+from timeflux.core.node import Node
+from timeflux.core.scheduler import Scheduler
+from timeflux.helpers.testing import DummyData
+
+
+# Default parameter grid
+CHANNELS = [8, 64]
+RATES = [250, 1000]
+CHUNKS = [10, 100]
+
+# Number of discarded cycles, before timing
+WARMUP = 10
+
+
+class Case(ABC):
+
+    """A benchmark case.
+
+    Subclasses implement :meth:`setup` and :meth:`cycle`. The parameters are
+    available as attributes.
+
+    Args:
+        cycles (int): The number of timed cycles.
+        **params: The parameters of the case.
+
+    """
+
+    name = None
+    grid = {"channels": CHANNELS, "rate": RATES, "chunk": CHUNKS}
+
+    def __init__(self, cycles, **params):
+        self.cycles = cycles
+        self.params = params
+        for key, value in params.items():
+            setattr(self, key, value)
+
+    @property
+    def id(self):
+        params = ",".join(f"{key}={value}" for key, value in self.params.items())
+        return f"{self.name}[{params}]"
+
+    def data(self):
+        """Return a generator with enough rows for the whole run."""
+        rows = (self.cycles + WARMUP + 1) * self.chunk
+        return DummyData(num_rows=rows, num_cols=self.channels, rate=self.rate)
+
+    @property
+    def tokens(self):
+        """The terms that select this case: its name, the parts of its name, and
+        its parameters as `key=value` strings."""
+        return {self.name, *self.name.split(".")} | {
+            f"{key}={value}" for key, value in self.params.items()
+        }
+
+    @abstractmethod
+    def setup(self):
+        """Prepare the case, before the warmup cycles."""
+
+    @abstractmethod
+    def cycle(self):
+        """Run one cycle and return its duration, in seconds."""
+
+    def teardown(self):
+        pass
+
+    def run(self):
+        """Run the case.
+
+        Returns:
+            dict: The parameters, the throughput (in samples per second) and the
+            cycle latency statistics (in milliseconds).
+
+        """
+        self.setup()
+        try:
+            for _ in range(WARMUP):
+                self.cycle()
+            durations = np.array([self.cycle() for _ in range(self.cycles)])
+        finally:
+            self.teardown()
+        total = durations.sum()
+        latencies = durations * 1000
+        return {
+            "params": self.params,
+            "cycles": self.cycles,
+            "throughput": self.cycles * self.chunk / total if total else None,
+            "mean": latencies.mean(),
+            "p50": np.percentile(latencies, 50),
+            "p95": np.percentile(latencies, 95),
+            "p99": np.percentile(latencies, 99),
+            "max": latencies.max(),
+        }
+
+
+class NodeCase(Case):
+
+    """Benchmark a node with a single input."""
+
+    @abstractmethod
+    def node(self):
+        """Return the node instance."""
+
+    def setup(self):
+        self._node = self.node()
+        self._generator = self.data()
+
+    def feed(self):
+        self._node.i.data = self._generator.next(self.chunk)
+        self._node.i.meta = {"rate": self.rate}
+
+    def cycle(self):
+        self._node.clear()
+        self.feed()
+        start = time.perf_counter()
+        self._node.update()
+        return time.perf_counter() - start
+
+
+class Slide(NodeCase):
+
+    name = "window.Slide"
+
+    def node(self):
+        from timeflux.nodes.window import Slide
+
+        return Slide(length=1, step=0.1, rate=self.rate)
+
+
+class Samples(NodeCase):
+
+    """Epochs of 0.5 second, triggered every second."""
+
+    name = "epoch.Samples"
+
+    def node(self):
+        from timeflux.nodes.epoch import Samples
+
+        return Samples(trigger="stim", length=0.5, rate=self.rate)
+
+    def setup(self):
+        super().setup()
+        self._next_event = None
+
+    def feed(self):
+        super().feed()
+        index = self._node.i.data.index
+        if self._next_event is None:
+            self._next_event = index[0]
+        onsets = index[index >= self._next_event]
+        if len(onsets):
+            self._node.i_events.data = pd.DataFrame(
+                {"label": ["stim"], "data": [None]}, index=onsets[:1]
+            )
+            self._next_event = onsets[0] + pd.Timedelta(seconds=1)
+
+
+class Interpolate(NodeCase):
+
+    name = "dejitter.Interpolate"
+    grid = dict(Case.grid, method=["linear", "cubic"])
+
+    def node(self):
+        from timeflux.nodes.dejitter import Interpolate
+
+        return Interpolate(rate=self.rate, method=self.method)
+
+
+class PubSub(Case):
+
+    """Publish a chunk and wait until it is received, through a local proxy."""
+
+    name = "zmq.PubSub"
+    address_in = "tcp://127.0.0.1:5759"
+    address_out = "tcp://127.0.0.1:5760"
+    _proxy = None
+
+    def setup(self):
+        from timeflux.nodes.zmq import Pub, Sub
+
+        if PubSub._proxy is None:
+            # The proxy thread cannot be stopped, so it is shared by all the cases
+            import zmq
+            from zmq.devices import ThreadProxy
+
+            PubSub._proxy = ThreadProxy(zmq.XSUB, zmq.XPUB)
+            PubSub._proxy.bind_in(self.address_in)
+            PubSub._proxy.bind_out(self.address_out)
+            PubSub._proxy.start()
+        self._pub = Pub("bench", self.address_in)
+        self._sub = Sub(["bench"], self.address_out)
+        self._generator = self.data()
+        # Wait for the subscription to propagate
+        probe = pd.DataFrame([0])
+        deadline = time.time() + 5
+        while time.time() < deadline:
+            self._pub.i.data = probe
+            self._pub.update()
+            time.sleep(0.01)
+            self._sub.update()
+            if self._sub.o_bench.ready():
+                return
+        raise RuntimeError("The subscriber could not connect")
+
+    def cycle(self):
+        self._pub.clear()
+        self._sub.clear()
+        self._pub.i.data = self._generator.next(self.chunk)
+        start = time.perf_counter()
+        self._pub.update()
+        while True:
+            self._sub.update()
+            if self._sub.o_bench.ready():
+                break
+        return time.perf_counter() - start
+
+    def teardown(self):
+        self._pub._socket.close()
+        self._sub._socket.close()
+
+
+class _Source(Node):
+    def __init__(self, generator, chunk):
+        self._generator = generator
+        self._chunk = chunk
+
+    def update(self):
+        self.o.data = self._generator.next(self._chunk)
+        self.o.meta = {"rate": 0}
+
+
+class _Forward(Node):
+    def update(self):
+        self.o.data = self.i.data
+        self.o.meta = self.i.meta
+
+
+class SchedulerNext(Case):
+
+    """Scheduler overhead for a chain of nodes that forward their input."""
+
+    name = "Scheduler.next"
+    grid = {
+        "channels": CHANNELS,
+        "chunk": CHUNKS,
+        "nodes": [5, 20],
+        "copy": [True, False],
+    }
+    rate = RATES[0]
+
+    def setup(self):
+        nodes = {"0": _Source(self.data(), self.chunk)}
+        path = [{"node": "0", "predecessors": []}]
+        for index in range(1, self.nodes):
+            nodes[str(index)] = _Forward()
+            predecessor = {
+                "node": str(index - 1),
+                "src_port": "o",
+                "dst_port": "i",
+                "copy": self.copy,
+            }
+            path.append({"node": str(index), "predecessors": [predecessor]})
+        self._scheduler = Scheduler(path, nodes, 0)
+
+    def cycle(self):
+        start = time.perf_counter()
+        self._scheduler.next()
+        return time.perf_counter() - start
+
+
+CASES = [Slide, Samples, Interpolate, PubSub, SchedulerNext]
+
+
+def collect(cycles, keyword=None):
+    """Instantiate the benchmark cases.
+
+    Args:
+        cycles (int): The number of timed cycles of each case.
+        keyword (str): If set, only the cases matching all the comma-separated
+            terms of this string. Each term must be a whole token of the case id,
+            such as `Slide`, `window.Slide` or `chunk=10`.
+
+    Returns:
+        list: The cases.
+
+    """
+    terms = {term.strip() for term in keyword.split(",")} if keyword else set()
+    cases = []
+    for cls in CASES:
+        keys = list(cls.grid.keys())
+        for values in itertools.product(*cls.grid.values()):
+            case = cls(cycles, **dict(zip(keys, values)))
+            if terms <= case.tokens:
+                cases.append(case)
+    return cases
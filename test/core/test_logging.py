@@ -0,0 +1,147 @@
+"""Tests for logging.py"""
+
+import logging
+import queue
+import threading
+import timeflux.core.logging
+from timeflux.core.logging import _Throttle, _BatchHandler, Handler, terminate_listener
+
+
+def _record(msg, level=logging.WARNING, created=0, args=None):
+    record = logging.makeLogRecord({'name': 'timeflux.test', 'msg': msg, 'args': args, 'levelno': level, 'levelname': logging.getLevelName(level)})
+    record.created = created
+    return record
+
+
+def test_throttle():
+    throttle = _Throttle(1)
+    assert throttle.filter(_record('Congestion', created=0))
+    assert not throttle.filter(_record('Congestion', created=0.5))
+    assert not throttle.filter(_record('Congestion', created=0.9))
+    assert throttle.filter(_record('Other', created=0.9))
+    assert throttle.filter(_record('Congestion', level=logging.ERROR, created=0.9))
+    record = _record('Congestion', created=1.5)
+    assert throttle.filter(record)
+    assert record.getMessage() == 'Congestion (2 similar messages suppressed)'
+
+
+def test_throttle_disabled():
+    throttle = _Throttle(0)
+    assert throttle.filter(_record('Congestion'))
+    assert throttle.filter(_record('Congestion'))
+
+
+def test_batch():
+    records = queue.Queue()
+    handler = _BatchHandler(records, interval=60)
+    handler.handle(_record('%d items', args=(3,)))
+    handler.handle(_record('done'))
+    assert records.empty()
+    handler.flush()
+    batch = records.get_nowait()
+    assert [record.msg for record in batch] == ['3 items', 'done']
+    assert batch[0].args is None
+
+
+def test_batch_error():
+    records = queue.Queue()
+    handler = _BatchHandler(records, interval=60)
+    handler.handle(_record('boom', level=logging.ERROR))
+    assert records.get(timeout=5)[0].msg == 'boom'
+
+
+def test_batch_drop():
+    records = queue.Queue(1)
+    handler = _BatchHandler(records, interval=60, capacity=2)
+    for index in range(3):
+        handler.handle(_record(str(index)))
+    handler.flush()
+    handler.handle(_record('lost'))
+    handler.flush()
+    assert [record.msg for record in records.get_nowait()] == ['0', '1', 'Log records dropped: 1']
+    handler.flush()
+    assert [record.msg for record in records.get_nowait()] == ['Log records dropped: 1']
+
+
+def test_listener_batch(caplog):
+    caplog.set_level(logging.DEBUG)
+    logger = logging.getLogger('timeflux')
+    propagate = logger.propagate
+    logger.propagate = True
+    try:
+        Handler().handle([_record('first'), _record('second')])
+    finally:
+        logger.propagate = propagate
+    assert caplog.messages == ['first', 'second']
+
+
+def test_throttle_args():
+    throttle = _Throttle(1)
+    assert throttle.filter(_record('\n %s', args=('a',)))
+    assert throttle.filter(_record('\n %s', args=('b',)))
+
+
+def test_batch_format_on_emit():
+    records = queue.Queue()
+    handler = _BatchHandler(records, interval=60)
+    data = [1, 2]
+    handler.handle(_record('%s', args=(data,)))
+    data.append(3)
+    handler.flush()
+    assert records.get_nowait()[0].msg == '[1, 2]'
+
+
+def test_batch_close():
+    records = queue.Queue()
+    handler = _BatchHandler(records, interval=60)
+    handler.handle(_record('last'))
+    handler.close()
+    assert not handler._thread.is_alive()
+    assert records.get_nowait()[0].msg == 'last'
+    handler.handle(_record('late'))
+    assert records.get_nowait()[0].msg == 'late'
+
+
+def test_terminate_listener_full(monkeypatch):
+    records = queue.Queue(1)
+    records.put_nowait(['pending'])
+    monkeypatch.setattr(timeflux.core.logging, '_QUEUE', records)
+    monkeypatch.setattr(timeflux.core.logging, '_LISTENER', None)
+    terminate_listener(timeout=0.1)
+    assert records.get_nowait() is None
+
+
+def test_batch_drop_threads():
+    records = queue.Queue()
+    handler = _BatchHandler(records, interval=0.001, batch=10, capacity=10)
+    def log():
+        for index in range(2000):
+            handler.handle(_record(str(index)))
+    threads = [threading.Thread(target=log) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    handler.close()
+    sent = dropped = 0
+    while not records.empty():
+        for record in records.get_nowait():
+            if record.msg.startswith('Log records dropped: '):
+                dropped += int(record.msg.split(': ')[1])
+            else:
+                sent += 1
+    assert sent + dropped == 8000
+
+
+def test_batch_close_locked():
+    # As in logging.shutdown()
+    records = queue.Queue()
+    handler = _BatchHandler(records, interval=0.001)
+    handler.handle(_record('last'))
+    handler.acquire()
+    try:
+        handler.close()
+    finally:
+        handler.release()
+    assert not handler._thread.is_alive()
+    assert records.get_nowait()[0].msg == 'last'
@@ -62,3 +62,87 @@ def test_validation_success():
     assert m != None
     m = Manager({'graphs': [{'nodes': [{'id': 'node_id', 'module': 'foobar', 'class': 'Foobar'}], 'edges': [{'source': 'node:1', 'target': 'node:abc'}]}]})
     assert m != None
+
+def test_start_method_forkserver(monkeypatch):
+    monkeypatch.setenv('TIMEFLUX_START_METHOD', 'forkserver')
+    monkeypatch.setenv('TIMEFLUX_PRELOAD', 'foo, bar')
+    context = Manager(test_config)._context()
+    assert context.get_start_method() == 'forkserver'
+    modules = os.environ['TIMEFLUX_PRELOAD'].split(',')
+    assert modules[:4] == ['numpy', 'pandas', 'zmq', 'timeflux.core.worker']
+    assert 'foo' in modules and 'timeflux.nodes.random' in modules
+    assert modules.count('timeflux.nodes.random') == 1
+
+def test_preload():
+    from timeflux.core.preload import preload
+    assert preload(['json', ' ', 'foobar']) == ['json']
+
+def test_schedule_options():
+    config = {'graphs': [dict(test_config['graphs'][0], affinity=[0], nice=5, priority=50)]}
+    assert Manager(config)._graphs[0]['priority'] == 50
+    config['graphs'][0]['priority'] = 100
+    with pytest.raises(ValueError):
+        Manager(config)
+
+class FakeProcess:
+    name = 'graph'
+    def __init__(self, alive=True, exitcode=None):
+        self.alive = alive
+        self.exitcode = exitcode
+        self.terminated = False
+    def is_alive(self):
+        return self.alive
+    def terminate(self):
+        self.terminated = True
+
+def _supervise(process, heartbeat=(0, 0, 0), **options):
+    import time
+    from types import SimpleNamespace
+    m = Manager(test_config)
+    graph = dict(test_config['graphs'][0], **options)
+    worker = SimpleNamespace(heartbeat=list(heartbeat))
+    m._workers = [{'graph': graph, 'failures': 0, 'worker': worker, 'started': time.time(), 'restart': None, 'stalled': False}]
+    m._processes = [process]
+    return m
+
+def test_supervise_stall(caplog):
+    import time
+    process = FakeProcess()
+    m = _supervise(process, (42, 0.01, time.time() - 5), stall_timeout=1)
+    assert m._check(0)
+    assert m._workers[0]['stalled']
+    assert not process.terminated
+    assert 'stalled' in caplog.text
+    m._workers[0]['worker'].heartbeat[2] = time.time()
+    assert m._check(0)
+    assert not m._workers[0]['stalled']
+
+def test_supervise_stall_first_cycle(caplog):
+    import time
+    process = FakeProcess()
+    m = _supervise(process, stall_timeout=1, restart=True)
+    assert m._check(0)
+    assert not m._workers[0]['stalled']
+    m._workers[0]['started'] -= 5
+    assert m._check(0)
+    assert m._workers[0]['stalled']
+    assert process.terminated
+    assert 'after start' in caplog.text
+
+def test_supervise_stall_restart():
+    import time
+    process = FakeProcess()
+    m = _supervise(process, (42, 0.01, time.time() - 20), restart=True)
+    assert m._check(0)
+    assert process.terminated
+
+def test_supervise_restart():
+    m = _supervise(FakeProcess(False, 1), restart=True)
+    assert m._check(0)
+    assert m._workers[0]['failures'] == 1
+    assert m._workers[0]['restart'] is not None
+
+def test_supervise_terminate():
+    assert not _supervise(FakeProcess(False, 1))._check(0)
+    assert not _supervise(FakeProcess(False, 0), restart=True)._check(0)
+    assert not _supervise(FakeProcess(False, 2), restart=True)._check(0)
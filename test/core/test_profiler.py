@@ -0,0 +1,71 @@
+"""Tests for profiler.py"""
+
+import os
+import pstats
+import signal
+import time
+import pytest
+from timeflux.core.node import Node
+from timeflux.core.profiler import Profiler
+
+
+class Slow(Node):
+    def update(self):
+        time.sleep(0.002)
+
+
+class Fast(Node):
+    def update(self):
+        pass
+
+
+def _cycle(nodes):
+    def next():
+        for node in nodes.values():
+            node.update()
+    return next
+
+
+def test_session(tmp_path):
+    nodes = {'a': Slow(), 'b': Fast(), 'c': Fast()}
+    profiler = Profiler('graph', nodes, 0.05, str(tmp_path))
+    assert not profiler.active
+    profiler.start()
+    while profiler.active:
+        profiler.run(_cycle(nodes))
+    files = sorted(os.listdir(tmp_path))
+    assert len(files) == 2
+    assert files[0].startswith(f'graph-{os.getpid()}-')
+    stats = pstats.Stats(str(tmp_path / files[0]))
+    classes = profiler.classes(stats)
+    assert [name for name, _, _ in classes] == ['test_profiler.Slow', 'test_profiler.Fast']
+    with open(tmp_path / files[1]) as stream:
+        assert 'test_profiler.Slow' in stream.read()
+
+
+def test_inactive(tmp_path):
+    profiler = Profiler('graph', {}, 1, str(tmp_path))
+    assert profiler.run(lambda: 42) == 42
+    assert profiler.stop() is None
+    assert os.listdir(tmp_path) == []
+
+
+def test_env(tmp_path, monkeypatch):
+    monkeypatch.setenv('TIMEFLUX_PROFILE', 'foo, bar')
+    monkeypatch.setenv('TIMEFLUX_PROFILE_DIR', str(tmp_path))
+    assert Profiler.from_env('bar', {}).active
+    assert not Profiler.from_env('baz', {}).active
+    monkeypatch.setenv('TIMEFLUX_PROFILE', '*')
+    assert Profiler.from_env('baz', {}).active
+
+
+@pytest.mark.skipif(not hasattr(signal, 'SIGUSR1'), reason='SIGUSR1 is not available')
+def test_signal(tmp_path):
+    handler = signal.getsignal(signal.SIGUSR1)
+    try:
+        profiler = Profiler('graph', {}, 1, str(tmp_path))
+        profiler.install()
+        os.kill(os.getpid(), signal.SIGUSR1)
+        assert profiler.active
+    finally:
+        signal.signal(signal.SIGUSR1, handler)
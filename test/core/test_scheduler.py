@@ -0,0 +1,84 @@
+"""Tests for scheduler.py"""
+
+import numpy as np
+import pytest
+import timeflux.helpers.clock as clock
+from timeflux.core.node import Node
+from timeflux.core.registry import Registry
+from timeflux.core.scheduler import Scheduler
+from timeflux.core.exceptions import WorkerInterrupt
+
+
+class DummyNode(Node):
+    def __init__(self, cycles=3):
+        self.cycles = cycles
+        self.starts = []
+
+    def update(self):
+        if len(self.starts) == self.cycles:
+            raise WorkerInterrupt()
+        self.starts.append(Registry.cycle_start)
+
+
+def test_virtual_clock():
+    node = DummyNode()
+    path = [{"node": "dummy", "predecessors": []}]
+    # A wall clock scheduler would sleep for a thousand seconds between cycles
+    scheduler = Scheduler(path, {"dummy": node}, 0.001)
+    clock.set_virtual(np.datetime64("2018-01-01 00:00:00"), 0.5)
+    try:
+        with pytest.raises(WorkerInterrupt):
+            scheduler.run()
+    finally:
+        clock.set_virtual(None)
+    assert node.starts == [1514764800.5, 1514764801.0, 1514764801.5]
+    assert not clock.is_virtual()
+
+
+def test_heartbeat():
+    node = DummyNode()
+    path = [{"node": "dummy", "predecessors": []}]
+    heartbeat = [0.0, 0.0, 0.0]
+    scheduler = Scheduler(path, {"dummy": node}, 0, heartbeat)
+    with pytest.raises(WorkerInterrupt):
+        scheduler.run()
+    assert heartbeat[0] == 3
+    assert 0 <= heartbeat[1] < 1
+    assert heartbeat[2] >= node.starts[-1]
+
+
+class GarbageNode(DummyNode):
+    def update(self):
+        super().update()
+        # Create reference cycles, only reclaimable by the garbage collector
+        for _ in range(2000):
+            a = []
+            a.append(a)
+
+
+def test_gc_manual():
+    import gc
+    node = GarbageNode(cycles=20)
+    path = [{"node": "dummy", "predecessors": []}]
+    scheduler = Scheduler(path, {"dummy": node}, 1000, gc_mode="manual")
+    with pytest.raises(WorkerInterrupt):
+        scheduler.run()
+    assert gc.isenabled()
+    assert gc.get_freeze_count() == 0
+    assert scheduler.stats["gc_collections"][0] > 0
+    assert scheduler.stats["gc_in_cycle"] == 0
+    assert scheduler.stats["gc_pause"] > 0
+
+
+def test_gc_auto():
+    node = GarbageNode(cycles=20)
+    path = [{"node": "dummy", "predecessors": []}]
+    scheduler = Scheduler(path, {"dummy": node}, 0)
+    with pytest.raises(WorkerInterrupt):
+        scheduler.run()
+    assert scheduler.stats["gc_in_cycle"] > 0
+
+
+def test_gc_invalid():
+    with pytest.raises(ValueError):
+        Scheduler([], {}, 1, gc_mode="foo")
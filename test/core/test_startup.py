@@ -0,0 +1,57 @@
+"""Startup time profile, based on `python -X importtime`"""
+
+import subprocess
+import sys
+import pytest
+
+
+def _importtime(statement):
+    """Run a statement in a fresh interpreter and profile the imports.
+
+    Returns:
+        dict: The cumulative import time of each module, in microseconds.
+
+    """
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', statement],
+        capture_output=True, text=True, check=True
+    )
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        _, cumulative, name = line.split('|')
+        if cumulative.strip().isdigit():
+            modules[name.strip()] = int(cumulative)
+    return modules
+
+
+def test_import_package():
+    modules = _importtime('import timeflux')
+    assert 'setuptools_scm' not in modules
+    assert 'numpy' not in modules
+
+
+def test_import_cli():
+    modules = _importtime('import timeflux.timeflux')
+    assert 'timeflux.core.manager' not in modules
+    assert 'networkx' not in modules
+
+
+@pytest.mark.parametrize('module,heavy', [
+    ('timeflux.nodes.dejitter', 'scipy.interpolate'),
+    ('timeflux.nodes.ml', 'sklearn.pipeline'),
+    ('timeflux.core.sync', 'scipy.stats'),
+])
+def test_import_nodes(module, heavy):
+    modules = _importtime(f'import {module}')
+    assert module in modules
+    assert heavy not in modules
+
+
+def test_import_worker():
+    modules = _importtime('import timeflux.core.worker')
+    assert 'timeflux.core.worker' in modules
+    # Node dependencies are only imported when the graph is loaded
+    for heavy in ('timeflux.core.manager', 'scipy.interpolate', 'scipy.stats', 'sklearn', 'zmq', 'tables'):
+        assert heavy not in modules
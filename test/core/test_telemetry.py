@@ -0,0 +1,56 @@
+"""Tests for telemetry.py"""
+
+import os
+import queue
+import pandas as pd
+from timeflux.core.telemetry import Sampler, Telemetry
+from timeflux.nodes.window import Slide
+from timeflux.nodes.gate import Gate
+
+
+def _nodes():
+    slide = Slide(length=1, step=0.5, rate=10)
+    slide.i.data = pd.DataFrame({'a': range(7)})
+    slide.update()
+    return {'slide': slide, 'gate': Gate('start', 'stop')}
+
+
+def test_sample():
+    sample = Sampler(queue.Queue(), 1, _nodes()).sample()
+    assert sample['pid'] == os.getpid()
+    assert sample['cpu'] > 0
+    assert len(sample['gc_objects']) == 3
+    assert sample['buffers'] == {'slide.windows': 2, 'slide.rows': 9, 'gate.segments': 0}
+
+
+def test_sampler_thread():
+    samples = queue.Queue()
+    sampler = Sampler(samples, 0.01, {})
+    sampler.start()
+    sample = samples.get(timeout=5)
+    sampler.stop()
+    sampler.join()
+    assert sample['buffers'] == {}
+
+
+def test_export(tmp_path):
+    samples = queue.Queue()
+    prometheus = str(tmp_path / 'timeflux.prom')
+    csv = str(tmp_path / 'timeflux.csv')
+    telemetry = Telemetry(samples, prometheus, csv)
+    sampler = Sampler(samples, 1, _nodes())
+    first = sampler.sample()
+    second = dict(first, time=first['time'] + 2, cpu=first['cpu'] + 1)
+    samples.put(first)
+    samples.put(second)
+    assert telemetry.update() == 2
+    assert telemetry.update() == 0
+    assert telemetry.samples[first['graph']]['cpu_percent'] == 50
+    with open(prometheus) as stream:
+        text = stream.read()
+    assert '# TYPE timeflux_cpu_seconds_total counter' in text
+    assert f'timeflux_buffer_size{{graph="{first["graph"]}",node="slide",buffer="rows"}} 9' in text
+    data = pd.read_csv(csv)
+    assert list(data.columns) == ['time', 'graph', 'pid', 'metric', 'value']
+    assert 'buffer_size.slide.rows' in data['metric'].values
+    assert 'cpu_percent' in data['metric'].values
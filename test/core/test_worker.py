@@ -3,7 +3,7 @@
 import sys
 import logging
 import pytest
-from timeflux.core.worker import Worker
+from timeflux.core.worker import Worker, get_context
 
 def test_invalid_module(caplog):
     graph = {'id': 'graph_id', 'rate': 1, 'nodes': [{'id': 'node_id', 'module': 'foobar', 'class': 'Foobar', 'params': {}}]}
@@ -32,4 +32,48 @@ def test_invalid_param(caplog):
         msg = "Node 'node_id': Random.__init__() got an unexpected keyword argument 'foo'"
     else:
         msg = "Node 'node_id': __init__() got an unexpected keyword argument 'foo'"
-    assert caplog.record_tuples == [('timeflux.core.worker', logging.ERROR, msg),]
\ No newline at end of file
+    assert caplog.record_tuples == [('timeflux.core.worker', logging.ERROR, msg),]
+
+def test_run_forkserver(monkeypatch):
+    import timeflux.core.logging
+    monkeypatch.setenv('TIMEFLUX_START_METHOD', 'forkserver')
+    monkeypatch.setattr(timeflux.core.logging, '_QUEUE', None)
+    graph = {'id': 'graph_id', 'rate': 1, 'nodes': [{'id': 'node_id', 'module': 'foobar', 'class': 'Foobar', 'params': {}}]}
+    process = Worker(graph).run()
+    process.join(30)
+    assert process.exitcode == 2
+
+def test_invalid_start_method(monkeypatch):
+    monkeypatch.setenv('TIMEFLUX_START_METHOD', 'foobar')
+    with pytest.raises(ValueError):
+        get_context()
+
+def test_schedule(caplog):
+    # Affinity and niceness are per-thread on Linux, so keep the test process intact
+    import os
+    import threading
+    caplog.set_level(logging.INFO)
+    core = min(os.sched_getaffinity(0))
+    nice = min(os.getpriority(os.PRIO_PROCESS, 0) + 1, 19)
+    graph = {'id': 'graph_id', 'rate': 1, 'affinity': [core], 'nice': nice, 'nodes': [{'id': 'node_id', 'module': 'foobar', 'class': 'Foobar', 'params': {}}]}
+    thread = threading.Thread(target=Worker(graph)._run)
+    thread.start()
+    thread.join()
+    messages = [record[2] for record in caplog.record_tuples]
+    assert f'CPU affinity: [{core}]' in messages
+    assert f'Niceness: {nice}' in messages
+
+def test_schedule_before_logging(monkeypatch):
+    # Threads inherit the scheduling options, so they must be set before logging starts
+    import os
+    import threading
+    import timeflux.core.worker
+    core = min(os.sched_getaffinity(0))
+    nice = min(os.getpriority(os.PRIO_PROCESS, 0) + 1, 19)
+    options = []
+    monkeypatch.setattr(timeflux.core.worker, 'init_worker', lambda *args: options.append((os.sched_getaffinity(0), os.getpriority(os.PRIO_PROCESS, 0))))
+    graph = {'id': 'graph_id', 'rate': 1, 'affinity': [core], 'nice': nice, 'nodes': [{'id': 'node_id', 'module': 'foobar', 'class': 'Foobar', 'params': {}}]}
+    thread = threading.Thread(target=Worker(graph)._run, args=(object(),))
+    thread.start()
+    thread.join()
+    assert options == [({core}, nice)]
@@ -6,6 +6,7 @@ import hashlib
 import pytest
 from timeflux.helpers.testing import DummyData
 from timeflux.helpers.bdf import convert
+from timeflux.helpers.hdf5 import append_array
 
 @pytest.mark.filterwarnings("ignore:.*deprecated")
 def test_convert():
@@ -44,4 +45,26 @@ def test_convert():
     assert True
 
     os.unlink(src)
-    #os.unlink(dst)
\ No newline at end of file
+    #os.unlink(dst)
+@pytest.mark.filterwarnings("ignore:.*deprecated")
+def test_convert_array():
+
+    # Filenames
+    src = os.path.join(tempfile.gettempdir(), "test_array.hdf")
+    dst = os.path.join(tempfile.gettempdir(), "test_array.bdf")
+
+    # Save a fake signal with the column-oriented layout
+    rate = 100
+    channels = ["ch1", "ch2", "ch3"]
+    eeg = DummyData(rate=rate, round=2, cols=channels).next(300)
+    store = pd.HDFStore(src)
+    append_array(store, "/eeg", eeg)
+    store.get_node("/eeg")._v_attrs["meta"] = {"rate": rate}
+    store.close()
+
+    # Convert
+    assert convert(src) is not False
+    assert os.path.getsize(dst) > 0
+
+    os.unlink(src)
+    os.unlink(dst)
@@ -0,0 +1,80 @@
+"""Tests for ring.py"""
+
+import numpy as np
+import pytest
+from threading import Thread
+from timeflux.helpers.ring import Ring
+
+
+def test_push_pull():
+    ring = Ring(8, 2)
+    assert ring.pull() == (None, None)
+    ring.push(np.arange(10).reshape(5, 2), np.arange(5.0))
+    assert len(ring) == 5
+    values, stamps = ring.pull()
+    np.testing.assert_array_equal(values, np.arange(10).reshape(5, 2))
+    np.testing.assert_array_equal(stamps, np.arange(5.0))
+    assert len(ring) == 0
+
+
+def test_wrap_around():
+    ring = Ring(4)
+    ring.push([1, 2, 3], [1, 2, 3])
+    ring.pull()
+    ring.push([4, 5, 6], [4, 5, 6])
+    values, stamps = ring.pull()
+    np.testing.assert_array_equal(values, [4, 5, 6])
+    np.testing.assert_array_equal(stamps, [4, 5, 6])
+
+
+def test_overflow():
+    ring = Ring(4)
+    assert ring.push([1, 2, 3], [1, 2, 3]) == 3
+    assert ring.push([4, 5, 6], [4, 5, 6]) == 1
+    assert ring.dropped == 2
+    values, _ = ring.pull()
+    np.testing.assert_array_equal(values, [1, 2, 3, 4])
+
+
+def test_objects():
+    ring = Ring(4, dtype=object)
+    ring.push(np.array([["a", 1], ("b",)], dtype=object), [1, 2])
+    values, _ = ring.pull()
+    assert list(values) == [["a", 1], ("b",)]
+
+
+def test_threads():
+    ring = Ring(64)
+    count = 10000
+
+    def produce():
+        sent = 0
+        while sent < count:
+            rows = np.arange(sent, min(sent + 7, count))
+            sent += ring.push(rows, np.zeros(len(rows)))
+
+    thread = Thread(target=produce)
+    thread.start()
+    received = []
+    while len(received) < count:
+        values, _ = ring.pull()
+        if values is not None:
+            received.extend(values)
+    thread.join()
+    assert received == list(range(count))
+
+
+def test_invalid_capacity():
+    with pytest.raises(ValueError):
+        Ring(0)
+
+
+def test_append():
+    ring = Ring(2, dtype=object)
+    assert ring.append([1, 'a'], 1.0)
+    assert ring.append([2], 2.0)
+    assert not ring.append([3], 3.0)
+    assert ring.dropped == 1
+    values, stamps = ring.pull()
+    assert values.tolist() == [[1, 'a'], [2]]
+    np.testing.assert_array_equal(stamps, [1.0, 2.0])
@@ -1,4 +1,5 @@
 """Tests for accumulate.py"""
+import pytest
 import pandas as pd
 import xarray as xr
 from timeflux.helpers.testing import DummyData, DummyXArray
@@ -21,7 +22,7 @@ def test_append_dataframe():
     # assert no output
     assert node.o.data == None
     # assert the data has been buffered
-    pd.testing.assert_frame_equal(pandas_data._data.iloc[:5, :], node._data)
+    pd.testing.assert_frame_equal(pandas_data._data.iloc[:5, :], pd.concat(node._data_list))
     # second chunk
     node.clear()
     node.i.data = pandas_data.next(10)
@@ -29,7 +30,7 @@ def test_append_dataframe():
     # assert no output
     assert node.o.data == None
     # assert the buffer is the concatenation of the 2 accumulated chunks
-    pd.testing.assert_frame_equal(pandas_data._data.iloc[:15, :], node._data)
+    pd.testing.assert_frame_equal(pandas_data._data.iloc[:15, :], pd.concat(node._data_list))
     # now a meta is received, assessing that the gate has just closed
     node.i.data = pandas_data.next(5)
     node.i.meta = {'gate_status': 'closed'}
@@ -67,3 +68,61 @@ def test_append_dataarray():
     node.update()
     # assert output data is the concatenation of the 3 chunks
     xr.testing.assert_equal(xarray_data._data.isel({'time': slice(0, 20)}), node.o.data)
+
+
+def _accumulate(node, data, sizes):
+    outputs = []
+    for size in sizes:
+        node.clear()
+        node.i.data = data.next(size)
+        node.update()
+        if node.o.data is not None:
+            outputs.append(node.o.data)
+    node.clear()
+    node.i.meta = {'gate_status': 'closed'}
+    node.update()
+    if node.o.data is not None:
+        outputs.append(node.o.data)
+    return outputs
+
+
+def test_append_dataframe_max_rows_drop_oldest():
+    pandas_data.reset()
+    node = AppendDataFrame(max_rows=12)
+    outputs = _accumulate(node, pandas_data, [5, 5, 5])
+    assert len(outputs) == 1
+    pd.testing.assert_frame_equal(outputs[0], pandas_data._data.iloc[3:15])
+
+
+def test_append_dataframe_max_rows_drop_newest():
+    pandas_data.reset()
+    node = AppendDataFrame(max_rows=12, overflow='drop_newest')
+    outputs = _accumulate(node, pandas_data, [5, 5, 5])
+    pd.testing.assert_frame_equal(outputs[0], pandas_data._data.iloc[:12])
+
+
+def test_append_dataframe_max_rows_release():
+    pandas_data.reset()
+    node = AppendDataFrame(max_rows=8, overflow='release')
+    outputs = _accumulate(node, pandas_data, [5, 5, 5])
+    assert [len(output) for output in outputs] == [10, 5]
+
+
+def test_append_dataframe_max_duration():
+    pandas_data.reset()
+    # DummyData has a rate of 10 Hz with a small jitter
+    node = AppendDataFrame(max_duration=0.95)
+    outputs = _accumulate(node, pandas_data, [5, 5, 5])
+    pd.testing.assert_frame_equal(outputs[0], pandas_data._data.iloc[5:15])
+
+
+def test_append_dataarray_max_rows():
+    xarray_data.reset()
+    node = AppendDataArray(dim='time', max_rows=12)
+    outputs = _accumulate(node, xarray_data, [5, 5, 5])
+    xr.testing.assert_equal(outputs[0], xarray_data._data.isel({'time': slice(3, 15)}))
+
+
+def test_append_invalid_overflow():
+    with pytest.raises(ValueError):
+        AppendDataFrame(overflow='foo')
@@ -46,3 +46,72 @@ def test_apply_reduce():
         node = ApplyMethod(method='numpy.summ', apply_mode='reduce', closed='right', axis=1)
         node.i.data = test_data
         node.update()
+
+
+@pytest.mark.parametrize('method,apply_mode,axis', [
+    ('numpy.sqrt', 'universal', 0),
+    ('numpy.cumsum', 'universal', 1),
+    ('numpy.mean', 'reduce', 0),
+    ('numpy.std', 'reduce', 1),
+])
+def test_apply_vectorized(method, apply_mode, axis):
+    """ufuncs and axis-aware functions are applied once, with the same result"""
+    node = ApplyMethod(method=method, apply_mode=apply_mode, axis=axis)
+    assert node._vectorized
+    node.i.data = test_data
+    node.update()
+    vectorized = node.o.data
+    node = ApplyMethod(method=method, apply_mode=apply_mode, axis=axis, vectorized=False)
+    node.i.data = test_data
+    node.update()
+    assert_frame_equal(vectorized, node.o.data)
+
+
+def test_apply_vectorized_func():
+    calls = []
+
+    def center(x):
+        calls.append(x.shape)
+        return x - x.mean(axis=0)
+
+    node = ApplyMethod(method=None, func=center, vectorized=True)
+    node.i.data = test_data
+    node.update()
+    assert calls == [(4, 2)]
+    assert_frame_equal(node.o.data, test_data - test_data.mean())
+
+
+def test_apply_expand():
+    node = ApplyMethod(method=None, func=lambda x: np.stack([x, x ** 2], axis=-1), apply_mode='expand')
+    node.i.data = test_data
+    node.update()
+    assert node.o.data.dims == ('time', 'space', 'feature')
+    assert node.o.data.shape == (4, 2, 2)
+    np.testing.assert_array_equal(node.o.data.sel(feature=1).values, test_data.values ** 2)
+    node = ApplyMethod(method=None, func=lambda x: np.stack([x, -x], axis=-1), apply_mode='expand', axis=1)
+    node.i.data = test_data
+    node.update()
+    np.testing.assert_array_equal(node.o.data.sel(feature=1).values, -test_data.values)
+    node = ApplyMethod(method=None, func=lambda x: x[..., np.newaxis] * [1, 2, 3], apply_mode='expand',
+                       vectorized=True)
+    node.i.data = test_data
+    node.update()
+    np.testing.assert_array_equal(node.o.data.sel(feature=2).values, test_data.values * 3)
+
+
+def test_apply_invalid_mode():
+    with pytest.raises(ValueError):
+        ApplyMethod(method='numpy.sum', apply_mode='foo')
+
+
+def test_apply_vectorized_shape_mismatch():
+    # A reducer in universal mode keeps the behaviour of DataFrame.apply
+    node = ApplyMethod(method='numpy.mean')
+    node.i.data = test_data
+    node.update()
+    assert not node._vectorized
+    pd.testing.assert_series_equal(node.o.data, test_data.apply(np.mean, raw=True))
+    node = ApplyMethod(method='numpy.mean', vectorized=True)
+    node.i.data = test_data
+    with pytest.raises(ValueError, match='universal'):
+        node.update()
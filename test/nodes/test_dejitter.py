@@ -4,7 +4,7 @@ import pytest
 import logging
 from timeflux.core.exceptions import WorkerInterrupt
 from timeflux.helpers.testing import DummyData, Looper
-from timeflux.nodes.dejitter import Snap, Interpolate, Reindex
+from timeflux.nodes.dejitter import Snap, Interpolate, Reindex, Drift
 
 rate = 10
 
@@ -145,3 +145,74 @@ def test_reindex_indices():
     node.update()
     assert node.o.data.index.values[0] == np.datetime64("2018-01-01 00:00:00.998745401")
     assert node.o.data.index.values[-1] == np.datetime64("2018-01-01 00:00:01.898745401")
+
+def test_interpolate_chunk_independent():
+    data = DummyData(rate=rate, jitter=.2, num_rows=200)
+    outputs = []
+    for chunk_size in (4, 9, 50):
+        data.reset()
+        node = Interpolate(rate=rate, method='linear')
+        dejittered_data, _ = Looper(data, node).run(chunk_size=chunk_size)
+        outputs.append(dejittered_data)
+    assert (np.diff(outputs[0].index.values) == np.timedelta64(100, 'ms')).all()
+    for output in outputs[1:]:
+        pd.testing.assert_frame_equal(output, outputs[0])
+
+def test_interpolate_bounded_buffer():
+    data = DummyData(rate=rate, jitter=.2, num_rows=100)
+    node = Interpolate(rate=rate, method='linear', n_max=10)
+    for _ in range(10):
+        node.clear()
+        chunk = data.next(10)
+        chunk[0] = np.nan
+        node.i.data = chunk
+        node.update()
+        assert node.o.data is None
+        assert len(node._times) == len(node._values) == 10
+
+def test_interpolate_invalid_method():
+    with pytest.raises(ValueError):
+        Interpolate(rate=rate, method='foobar')
+
+
+def test_drift():
+    # A 250 Hz device running 200 ppm fast, delivering blocks of 25 samples
+    nominal = 250
+    true = nominal * (1 + 200e-6)
+    count = nominal * 600
+    expected = 1.5e9 + np.arange(count) / true
+    blocks = np.arange(count) // 25
+    latency = np.random.default_rng(42).exponential(0.004, blocks[-1] + 1)
+    arrival = expected[blocks * 25 + 24] + latency[blocks]
+    data = pd.DataFrame(np.arange(count), index=pd.to_datetime(arrival, unit='s'))
+    node = Drift(rate=nominal, window=60)
+    stamps = []
+    for start in range(0, count, 25):
+        node.clear()
+        node.i.data = data.iloc[start:start + 25].copy()
+        node.update()
+        stamps.append(node.o.data.index.values.astype(np.int64) / 1e9)
+    stamps = np.concatenate(stamps)
+    assert np.all(np.diff(stamps) > 0)
+    assert node.o.meta['rate'] == nominal
+    assert node.o.meta['drift']['ppm'] == pytest.approx(200, abs=10)
+    # Once converged, the residual jitter is negligible compared to the block size
+    error = (stamps - expected)[-nominal * 60:]
+    assert np.std(error) < 0.001
+    assert np.std(np.diff(stamps[-nominal * 60:])) < 1e-5
+
+
+def test_drift_rate_from_meta():
+    node = Drift()
+    node.i.data = DummyData(rate=rate, jitter=0).next(5)
+    node.i.meta = {'rate': rate}
+    node.update()
+    assert node.o.meta['rate'] == rate
+    assert node.o.meta['drift']['ppm'] == pytest.approx(0)
+
+
+def test_drift_no_rate():
+    node = Drift()
+    node.i.data = DummyData(rate=rate, jitter=0).next(5)
+    with pytest.raises(WorkerInterrupt):
+        node.update()
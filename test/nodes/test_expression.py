@@ -3,6 +3,7 @@
 from datetime import datetime
 
 import numpy as np
+import pytest
 import pandas as pd
 from pandas.testing import assert_frame_equal
 from timeflux.nodes.expression import Expression
@@ -55,3 +56,40 @@ def test_expression_sum_columns():
                             columns=['col0', 'col1', 'col2'])
 
     assert_frame_equal(node.o.data, expected)
+
+
+def test_expression_engine_ports():
+    """numexpr is used on aligned numeric ports, pandas otherwise"""
+    pytest.importorskip('numexpr')
+    index = pd.date_range('2018-01-01', periods=3, freq='s')
+    node = Expression(expr='i_1 * 2 + sqrt(i_2)', eval_on='ports')
+    assert node._engine == 'numexpr'
+    node.i_1.data = pd.DataFrame([[1., 2.], [3., 4.], [5., 6.]], index=index)
+    node.i_2.data = pd.DataFrame([[1., 4.], [9., 16.], [25., 36.]], index=index)
+    node.update()
+    assert node._engine == 'numexpr'
+    assert_frame_equal(node.o.data, node.i_1.data * 2 + np.sqrt(node.i_2.data))
+    # Misaligned indices require pandas
+    node.i_2.data = node.i_2.data.iloc[::-1]
+    node.update()
+    assert node._engine == 'pandas'
+    assert_frame_equal(node.o.data, node.i_1.data * 2 + np.sqrt(node.i_2.data.iloc[::-1]))
+
+
+def test_expression_engine_columns():
+    pytest.importorskip('numexpr')
+    data = pd.DataFrame([[1, 2, 'a'], [3, 4, 'b']], columns=['col0', 'col1', 'label'])
+    node = Expression(expr='col2 = col0 - col1', eval_on='columns')
+    node.i.data = data
+    node.update()
+    assert node._engine == 'numexpr'
+    assert_frame_equal(node.o.data, data.eval('col2 = col0 - col1'))
+
+
+def test_expression_engine_precedence():
+    """Expressions relying on the pandas operator precedence are delegated to pandas"""
+    node = Expression(expr='col0 > 1 & col1 < 4', eval_on='columns')
+    assert node._engine == 'pandas'
+    node.i.data = pd.DataFrame([[1, 2], [3, 4], [2, 3]], columns=['col0', 'col1'])
+    node.update()
+    assert node.o.data.tolist() == [False, False, True]
@@ -147,3 +147,76 @@ def test_xarray_data():
 
     assert node._status == 'closed'
     assert node._trigger == 'foo_begins'
+
+
+def test_multiple_segments_in_same_chunk():
+    pandas_data.reset()
+    data = pandas_data.next(10)
+    node = Gate(event_opens='foo_begins', event_closes='foo_ends', truncate=True)
+    times = data.index
+    event = pd.DataFrame(
+        [['foo_begins'], ['foo_begins'], ['foo_ends'], ['foo_begins'], ['foo_ends'], ['foo_begins']],
+        [times[1], times[2], times[3], times[5], times[6], times[8]],
+        columns=['label'])
+    node.i.data = data
+    node.i_events.data = event
+    node.update()
+    assert node.o.meta == {'gate_status': 'closed', 'gate_times': [times[1], times[3]]}
+    pd.testing.assert_frame_equal(node.o.data, data.iloc[1:4])
+    assert node._status == 'open'
+    # The pending segment is released at the next update
+    node.clear()
+    node.i.data = pandas_data.next(2)
+    node.update()
+    assert node.o.meta == {'gate_status': 'closed', 'gate_times': [times[5], times[6]]}
+    pd.testing.assert_frame_equal(node.o.data, data.iloc[5:7])
+    # Then the open segment, including the data received in the meantime
+    node.clear()
+    node.update()
+    assert node.o.meta == {'gate_status': 'open'}
+    assert len(node.o.data) == 4
+    node.clear()
+    node.update()
+    assert node.o.meta == {'gate_status': 'open'}
+    assert node.o.data is None
+
+
+def test_multiple_ports():
+    pandas_data.reset()
+    xarray_data.reset()
+    node = Gate(event_opens='foo_begins', event_closes='foo_ends', truncate=True)
+    eeg = pandas_data.next(5)
+    ppg = xarray_data.next(5)
+    event = pd.DataFrame([['foo_begins'], ['foo_ends']], [eeg.index[1], eeg.index[2]],
+                         columns=['label'])
+    node.i_eeg.data = eeg
+    node.i_eeg.meta = {'rate': 10}
+    node.i_ppg.data = ppg
+    node.i_events.data = event
+    node.update()
+    pd.testing.assert_frame_equal(node.o_eeg.data, eeg.iloc[1:3])
+    xr.testing.assert_equal(node.o_ppg.data, ppg.isel(time=slice(1, 3)))
+    assert node.o_eeg.meta == {'rate': 10, 'gate_status': 'closed', 'gate_times': [eeg.index[1], eeg.index[2]]}
+    assert node.o_ppg.meta['gate_status'] == 'closed'
+    assert 'o_events' not in node.ports
+
+
+def test_toggle_marker():
+    pandas_data.reset()
+    toggle = Gate(event_opens='toggle', event_closes='toggle', truncate=True)
+    data = pandas_data.next(10)
+    toggle.i.data = data
+    toggle.i_events.data = pd.DataFrame([['toggle'], ['toggle']], [data.index[2], data.index[5]], columns=['label'])
+    toggle.update()
+    assert toggle._status == 'closed'
+    assert toggle.o.meta['gate_status'] == 'closed'
+    assert toggle.o.meta['gate_times'] == [data.index[2], data.index[5]]
+    pd.testing.assert_frame_equal(toggle.o.data, data.iloc[2:6])
+    # The next marker opens the gate again
+    toggle.clear()
+    data = pandas_data.next(5)
+    toggle.i.data = data
+    toggle.i_events.data = pd.DataFrame([['toggle']], [data.index[1]], columns=['label'])
+    toggle.update()
+    assert toggle._status == 'open'
+    assert toggle.o.meta == {'gate_status': 'open'}
@@ -0,0 +1,212 @@
+"""Tests for hdf5.py"""
+
+import os
+import tempfile
+import pytest
+import pandas as pd
+import timeflux.helpers.clock as clock
+from timeflux.core.registry import Registry
+from timeflux.core.exceptions import WorkerInterrupt
+from timeflux.helpers.testing import DummyData
+from timeflux.helpers.hdf5 import is_array, select_array, read_manifest
+from timeflux.nodes.hdf5 import Replay, Save
+
+rate = 100
+eeg = DummyData(rate=rate, jitter=0, num_rows=300).next(300)
+
+
+@pytest.fixture(autouse=True)
+def registry(monkeypatch):
+    # Replaying sets the cycle start, restore it after each test
+    monkeypatch.setattr(Registry, "cycle_start", Registry.cycle_start)
+
+
+@pytest.fixture()
+def recording():
+    filename = os.path.join(tempfile.gettempdir(), "test_replay.hdf5")
+    store = pd.HDFStore(filename, "w")
+    store.append("/eeg", eeg)
+    store.get_node("/eeg")._v_attrs["meta"] = {"rate": rate}
+    store.close()
+    yield filename
+    os.unlink(filename)
+
+
+def _replay(node):
+    chunks = []
+    while True:
+        Registry.cycle_start = clock.tick()
+        try:
+            node.update()
+        except WorkerInterrupt:
+            break
+        chunks.append(node.o_eeg.data)
+    node.terminate()
+    return chunks
+
+
+def test_replay_offline(recording):
+    node = Replay(recording, ["/eeg"], timespan=0.5, offline=True)
+    assert clock.is_virtual()
+    assert clock.now() == eeg.index[0]
+    chunks = _replay(node)
+    assert not clock.is_virtual()
+    assert len(chunks) == 6
+    assert node.o_eeg.meta == {"rate": rate}
+    pd.testing.assert_frame_equal(pd.concat(chunks), eeg, check_freq=False)
+
+
+def test_replay_offline_reproducible(recording):
+    first = _replay(Replay(recording, ["/eeg"], timespan=0.07, offline=True))
+    second = _replay(Replay(recording, ["/eeg"], timespan=0.07, offline=True))
+    assert len(first) == len(second)
+    for a, b in zip(first, second):
+        pd.testing.assert_frame_equal(a, b)
+
+
+def test_replay_offline_graph_rate(recording, monkeypatch):
+    monkeypatch.setattr(Registry, "rate", 10)
+    node = Replay(recording, ["/eeg"], offline=True)
+    chunks = _replay(node)
+    assert len(chunks) == 30
+    assert len(chunks[0]) == 10
+
+
+def test_replay_offline_no_step(recording, monkeypatch):
+    monkeypatch.setattr(Registry, "rate", 0)
+    with pytest.raises(ValueError):
+        Replay(recording, ["/eeg"], offline=True)
+
+
+@pytest.mark.parametrize("threaded", [True, False])
+def test_save_batches(threaded):
+    path = tempfile.gettempdir()
+    node = Save("test_save.hdf5", path, batch_size=25, threaded=threaded)
+    data = DummyData(rate=rate, num_rows=100)
+    for _ in range(10):
+        node.clear()
+        node.i_eeg.data = data.next(10)
+        node.i_eeg.meta = {"rate": rate}
+        node.update()
+    node.terminate()
+    filename = os.path.join(path, "test_save.hdf5")
+    store = pd.HDFStore(filename, "r")
+    pd.testing.assert_frame_equal(store.select("/eeg"), data._data, check_freq=False)
+    assert store.get_node("/eeg")._v_attrs["meta"] == {"rate": rate}
+    store.close()
+    os.unlink(filename)
+
+
+def test_save_buffer_copies():
+    path = tempfile.gettempdir()
+    node = Save("test_save.hdf5", path, batch_size=100, threaded=False)
+    chunk = eeg.iloc[:10].copy()
+    meta = {"rate": rate}
+    node.i_eeg.data = chunk
+    node.i_eeg.meta = meta
+    node.update()
+    # Downstream nodes modify the shared objects in place
+    chunk.index = chunk.index + pd.Timedelta(seconds=1)
+    chunk.iloc[:, :] = 0
+    meta["rate"] = 0
+    node.terminate()
+    filename = os.path.join(path, "test_save.hdf5")
+    store = pd.HDFStore(filename, "r")
+    pd.testing.assert_frame_equal(store.select("/eeg"), eeg.iloc[:10], check_freq=False)
+    assert store.get_node("/eeg")._v_attrs["meta"] == {"rate": rate}
+    store.close()
+    os.unlink(filename)
+
+
+def test_save_flush_interval():
+    path = tempfile.gettempdir()
+    node = Save("test_save.hdf5", path, flush_interval=0, threaded=False)
+    node.i_eeg.data = eeg.iloc[:10]
+    node.update()
+    assert node._store.select("/eeg").shape == (10, 5)
+    node.terminate()
+    os.unlink(os.path.join(path, "test_save.hdf5"))
+
+
+def test_save_array_layout(monkeypatch):
+    path = tempfile.gettempdir()
+    filename = os.path.join(path, "test_save.hdf5")
+    events = pd.DataFrame([["foo", "{}"]], [eeg.index[3]], columns=["label", "data"])
+    node = Save("test_save.hdf5", path, profile="fast")
+    node.i_eeg.data = eeg
+    node.i_eeg.meta = {"rate": rate}
+    node.i_events.data = events
+    node.update()
+    node.terminate()
+    store = pd.HDFStore(filename, "r")
+    assert is_array(store, "/eeg")
+    assert not is_array(store, "/events")
+    assert store.get_node("/eeg")._v_attrs["meta"] == {"rate": rate}
+    assert store.get_node("/eeg").values.filters.complib == "blosc:lz4"
+    pd.testing.assert_frame_equal(
+        select_array(store, "/eeg"), eeg.astype("float32"), check_freq=False
+    )
+    pd.testing.assert_frame_equal(store.select("/events"), events)
+    store.close()
+    monkeypatch.setattr(Registry, "rate", 10)
+    node = Replay(filename, ["/eeg", "/events"], offline=True)
+    chunks = _replay(node)
+    assert len(chunks) == 30
+    pd.testing.assert_frame_equal(
+        pd.concat(chunks), eeg.astype("float32"), check_freq=False
+    )
+    os.unlink(filename)
+
+
+def test_save_invalid_profile():
+    with pytest.raises(ValueError):
+        Save(profile="foobar")
+
+
+def test_save_rotate():
+    path = tempfile.gettempdir()
+    events = pd.DataFrame(
+        [["foo", "{}"], ["bar", "{}"]],
+        [eeg.index[50], eeg.index[250]],
+        columns=["label", "data"],
+    )
+    node = Save("test_rotate.hdf5", path, rotate_duration=1, threaded=False)
+    for index in range(0, 300, 20):
+        node.clear()
+        node.i_eeg.data = eeg.iloc[index : index + 20]
+        node.i_events.data = events[
+            (events.index >= eeg.index[index])
+            & (events.index < eeg.index[min(index + 20, 299)])
+        ]
+        if index == 0:
+            node.i_eeg.meta = {"rate": rate}
+        node.update()
+        node._flush_all()
+    node.terminate()
+    manifest = os.path.join(path, "test_rotate.json")
+    segments = read_manifest(manifest)
+    assert len(segments) == 3
+    assert segments[0]["start"] == eeg.index[0]
+    assert segments[-1]["stop"] == eeg.index[-1]
+    for segment in segments:
+        store = pd.HDFStore(segment["filename"], "r")
+        assert store.get_node("/eeg")._v_attrs["meta"] == {"rate": rate}
+        store.close()
+    node = Replay(manifest, ["/eeg", "/events"], timespan=0.3, offline=True)
+    chunks = []
+    while True:
+        Registry.cycle_start = clock.tick()
+        try:
+            node.update()
+        except WorkerInterrupt:
+            break
+        chunks.append((node.o_eeg.data, node.o_events.data))
+        assert node.o_eeg.meta == {"rate": rate}
+    node.terminate()
+    pd.testing.assert_frame_equal(
+        pd.concat([chunk[0] for chunk in chunks]), eeg, check_freq=False
+    )
+    pd.testing.assert_frame_equal(pd.concat([chunk[1] for chunk in chunks]), events)
+    for segment in segments:
+        os.unlink(segment["filename"])
+    os.unlink(manifest)
@@ -0,0 +1,153 @@
+"""Tests for lsl.py"""
+
+import time
+import uuid
+import numpy as np
+import pandas as pd
+import pytest
+
+pylsl = pytest.importorskip('pylsl')
+
+import timeflux.nodes.lsl
+from timeflux.nodes.lsl import Send, Receive, MultiReceive
+
+rate = 100
+
+
+def _outlet(name, channels=3, format='float32'):
+    info = pylsl.StreamInfo(name, 'EEG', channels, rate, format, name)
+    labels = info.desc().append_child('channels')
+    for channel in range(channels):
+        labels.append_child('channel').append_child_value('label', f'ch{channel}')
+    return pylsl.StreamOutlet(info)
+
+
+def _name():
+    return 'timeflux-test-' + uuid.uuid4().hex
+
+
+def _until(condition, timeout=5):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def test_receive():
+    name = _name()
+    outlet = _outlet(name)
+    node = Receive(value=name, max_samples=4, timeout=5)
+    node.update()
+    assert node._inlet is not None
+    node._inlet.open_stream(5)
+    assert outlet.wait_for_consumers(5)
+    values = np.arange(30, dtype=np.float32).reshape(10, 3)
+    stamps = pylsl.local_clock() + np.arange(10) / rate
+    outlet.push_chunk(values.tolist(), stamps.tolist())
+    chunks = []
+
+    def received():
+        node.clear()
+        node.update()
+        if node.o.ready():
+            chunks.append(node.o.data)
+        return sum(len(chunk) for chunk in chunks) >= 10
+
+    assert _until(received)
+    # The buffer is partially filled by the last pull
+    assert [len(chunk) for chunk in chunks] == [4, 4, 2]
+    data = pd.concat(chunks)
+    assert list(data.columns) == ['ch0', 'ch1', 'ch2']
+    assert (data.dtypes == np.float64).all()
+    np.testing.assert_array_equal(data.values, values)
+    received_stamps = data.index.values.astype(np.float64) / 1e9
+    np.testing.assert_allclose(received_stamps, stamps + node._offset, atol=1e-3)
+    assert node.o.meta['name'] == name
+    assert node.o.meta['rate'] == rate
+
+
+def _inlet(name):
+    streams = pylsl.resolve_byprop('name', name, timeout=5)
+    inlet = pylsl.StreamInlet(streams[0])
+    inlet.open_stream(5)
+    return inlet
+
+
+def _pull(inlet, count):
+    values, stamps = [], []
+    deadline = time.time() + 5
+    while len(stamps) < count and time.time() < deadline:
+        chunk, chunk_stamps = inlet.pull_chunk(timeout=0.1)
+        values += chunk
+        stamps += chunk_stamps
+    return np.array(values), np.array(stamps)
+
+
+@pytest.mark.parametrize('stamped', [True, False])
+def test_send(stamped, monkeypatch):
+    outlets = []
+
+    def outlet(*args):
+        outlets.append(args)
+        return pylsl.StreamOutlet(*args)
+
+    monkeypatch.setattr(timeflux.nodes.lsl, 'StreamOutlet', outlet)
+    name = _name()
+    node = Send(name, rate=rate, chunk_size=5, max_buffered=10)
+    data = pd.DataFrame(np.arange(30, dtype=np.float64).reshape(10, 3), columns=['a', 'b', 'c'],
+                        index=pd.to_datetime(1e9 + np.arange(10) / rate, unit='s'))
+    data['label'] = 'foo'  # Not numeric, so not sent
+    # Create the outlet without sending anything
+    node.i.data = data.iloc[:0]
+    node.update()
+    assert outlets[0][1:] == (5, 10)
+    if not stamped:
+        # Older versions of pylsl only accept the timestamp of the last sample
+        def push_chunk(values, stamps):
+            if not np.isscalar(stamps):
+                raise TypeError()
+        monkeypatch.setattr(node._outlet, 'push_chunk', push_chunk)
+    inlet = _inlet(name)
+    assert node._outlet.wait_for_consumers(5)
+    node.clear()
+    node.i.data = data
+    node.update()
+    assert node._stamped == stamped
+    values, stamps = _pull(inlet, 10)
+    np.testing.assert_array_equal(values, data[['a', 'b', 'c']].values)
+    np.testing.assert_allclose(stamps, 1e9 + np.arange(10) / rate)
+
+
+def test_multi_receive(caplog):
+    names = [_name(), _name()]
+    outlets = [_outlet(names[0]), _outlet(names[1], channels=2, format='int16')]
+    node = MultiReceive({'a': {'prop': 'name', 'value': names[0]},
+                         'b': {'prop': 'name', 'value': names[1], 'channels': ['x', 'y']}},
+                        buffer=0.1, max_samples=4)
+    try:
+        assert _until(lambda: all(stream['inlet'] is not None for stream in node._streams.values()))
+        for stream in node._streams.values():
+            stream['inlet'].open_stream(5)
+        assert all(outlet.wait_for_consumers(5) for outlet in outlets)
+        outlets[0].push_chunk(np.arange(15, dtype=np.float32).reshape(5, 3).tolist())
+        outlets[1].push_chunk(np.arange(8, dtype=np.int16).reshape(4, 2).tolist())
+        assert _until(lambda: len(node._streams['a']['ring']) == 5 and len(node._streams['b']['ring']) == 4)
+        node.update()
+        np.testing.assert_array_equal(node.o_a.data.values, np.arange(15).reshape(5, 3))
+        assert list(node.o_a.data.columns) == ['ch0', 'ch1', 'ch2']
+        assert node.o_a.meta['name'] == names[0]
+        np.testing.assert_array_equal(node.o_b.data.values, np.arange(8).reshape(4, 2))
+        assert list(node.o_b.data.columns) == ['x', 'y']
+        assert (node.o_b.data.dtypes == np.int64).all()
+        # The ring capacity is 10 samples: the oldest samples are kept
+        outlets[0].push_chunk(np.zeros((25, 3), dtype=np.float32).tolist())
+        assert _until(lambda: node._streams['a']['ring'].dropped == 15)
+        node.clear()
+        node.update()
+        assert len(node.o_a.data) == 10
+        assert node.o_b.data is None
+        assert '15 samples dropped from \'a\'' in caplog.messages
+    finally:
+        node.terminate()
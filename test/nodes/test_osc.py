@@ -0,0 +1,51 @@
+"""Tests for osc.py"""
+
+import time
+import numpy as np
+import pandas as pd
+import pytest
+from timeflux.helpers.testing import DummyData
+from timeflux.nodes.osc import Server, Client
+
+
+def _receive(server, count):
+    rows = []
+    for _ in range(100):
+        server.clear()
+        server.update()
+        if server.o_foo.ready():
+            rows.append(server.o_foo.data)
+        if sum(len(chunk) for chunk in rows) >= count:
+            break
+        time.sleep(0.01)
+    return pd.concat(rows)
+
+
+@pytest.mark.parametrize('bundle', [False, True])
+def test_client_server(bundle):
+    server = Server(['/foo'], port=5015)
+    try:
+        client = Client('/foo', port=5015, bundle=bundle)
+        data = DummyData(num_rows=20, cols=['a', 'b', 'c'])
+        client.i.data = data.next(20)
+        client.update()
+        received = _receive(server, 20)
+        assert received.shape == (20, 3)
+        np.testing.assert_allclose(received.values.astype(float), client.i.data.values, rtol=1e-6)
+        assert received.index.is_monotonic_increasing
+    finally:
+        server.terminate()
+
+
+def test_server_overflow(caplog):
+    server = Server(['/foo'], port=5016, capacity=5)
+    try:
+        client = Client('/foo', port=5016, bundle=True)
+        client.i.data = DummyData(num_rows=10).next(10)
+        client.update()
+        time.sleep(0.2)
+        server.update()
+        assert len(server.o_foo.data) == 5
+        assert '5 messages dropped' in caplog.text
+    finally:
+        server.terminate()
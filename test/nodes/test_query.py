@@ -98,3 +98,65 @@ def test_match_no_match(caplog):
     with pytest.raises(WorkerInterrupt):
         node.update()
     assert caplog.record_tuples[0][2].startswith('No matching column')
+
+
+def test_selector_cache():
+    data.reset()
+    data._data.columns = ['A', 'B', 'C', 'D', 'E', 'F']
+    node = LocQuery(key=['E', 'A'])
+    node.i.data = data.next(3)
+    node.update()
+    positions = node._selector._positions
+    assert list(positions) == [4, 0]
+    node.clear()
+    node.i.data = data.next(3)
+    node.update()
+    assert node._selector._positions is positions
+    assert list(node.o.data.columns) == ['E', 'A']
+    # Changing the schema invalidates the cache
+    node.clear()
+    node.i.data = data.next(3)[['F', 'E', 'D', 'C', 'B', 'A']]
+    node.update()
+    assert list(node._selector._positions) == [1, 5]
+    pd.testing.assert_frame_equal(node.o.data, node.i.data[['E', 'A']])
+
+
+def test_selectrange_schema_change():
+    data.reset()
+    node = SelectRange(ranges={'second': [1, 1.5]}, axis=1, inclusive=True)
+    data._data.columns = pd.MultiIndex.from_product([['A', 'B'], [1.3, 1.6, 1.9]],
+                                                    names=['first', 'second'])
+    node.i.data = data.next(3)
+    node.update()
+    assert list(node.o.data.columns) == [('A', 1.3), ('B', 1.3)]
+    node.clear()
+    chunk = data.next(3)
+    chunk.columns = pd.MultiIndex.from_product([['A', 'B'], [1.1, 1.4, 1.9]],
+                                               names=['first', 'second'])
+    node.i.data = chunk
+    node.update()
+    assert list(node.o.data.columns) == [('A', 1.1), ('A', 1.4), ('B', 1.1), ('B', 1.4)]
+
+
+def test_locquery_partial_key():
+    data.reset()
+    data._data.columns = pd.MultiIndex.from_product([['A', 'B'], [1, 2, 3]],
+                                                    names=['first', 'second'])
+    node = LocQuery(key=('A',), axis=1)
+    chunk = data.next(3)
+    node.i.data = chunk
+    node.update()
+    pd.testing.assert_frame_equal(node.o.data, chunk.loc[:, ('A',)])
+    assert list(node.o.data.columns) == [1, 2, 3]
+
+
+def test_selector_no_cache_on_index():
+    data.reset()
+    node = SelectRange(ranges={'first': [0, 0.5]}, axis=0)
+    data._data.columns = ['first', 'B', 'C', 'D', 'E', 'F']
+    data._data = data._data.set_index('first', append=True)
+    node.i.data = data.next(5)
+    node.update()
+    assert node._selector._positions is None
+    first = node.i.data.index.get_level_values('first')
+    pd.testing.assert_frame_equal(node.o.data, node.i.data[(first > 0) & (first < 0.5)])
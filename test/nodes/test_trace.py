@@ -0,0 +1,77 @@
+"""Tests for trace.py"""
+
+import time
+import pandas as pd
+import pytest
+import timeflux.helpers.trace as trace
+from timeflux.core.node import Node
+from timeflux.core.scheduler import Scheduler
+from timeflux.helpers.testing import DummyData
+from timeflux.nodes.trace import Origin, Hop, Latency
+
+
+def test_helpers():
+    meta = {'rate': 10}
+    traced = trace.origin(meta, 'a', 1.0)
+    assert meta == {'rate': 10}
+    assert traced == {'rate': 10, 'trace': [['a', 1.0]]}
+    hopped = trace.hop(traced, 'b', 2.0)
+    assert traced['trace'] == [['a', 1.0]]
+    assert hopped['trace'] == [['a', 1.0], ['b', 2.0]]
+    assert trace.hop(meta, 'b') is meta
+    assert trace.hop(None, 'b') is None
+
+
+def test_origin_index():
+    data = DummyData().next(5)
+    node = Origin(source='index')
+    node.i.data = data
+    node.update()
+    assert node.o.data is data
+    assert node.o.meta['trace'] == [['origin', data.index[-1].value / 1e9]]
+
+
+def test_origin_invalid():
+    with pytest.raises(ValueError):
+        Origin(source='foo')
+
+
+def test_latency():
+    node = Latency(interval=0)
+    now = time.time()
+    node.i_a.data = pd.DataFrame([1])
+    node.i_a.meta = {'trace': [['origin', now - 0.010], ['hop', now - 0.004]]}
+    node.i_b.data = pd.DataFrame([1])
+    node.i_b.meta = {}
+    node.update()
+    report = node.o.data.set_index('name')
+    assert list(report['kind']) == ['hop', 'hop', 'path']
+    assert report.loc['origin > hop', 'count'] == 1
+    assert report.loc['origin > hop', 'mean'] == pytest.approx(6, abs=0.01)
+    assert report.loc['origin > hop > sink', 'max'] >= 10
+    assert report.loc['origin > hop > sink', 'p50'] == report.loc['origin > hop > sink', 'max']
+
+
+class Source(Node):
+    def update(self):
+        self.o.data = pd.DataFrame([1])
+
+
+class Sink(Node):
+    def update(self):
+        self.meta = self.i.meta
+
+
+def test_scheduler_hops():
+    nodes = {'source': Source(), 'origin': Origin(), 'hop': Hop('checkpoint'), 'sink': Sink()}
+    path = [
+        {'node': 'source', 'predecessors': []},
+        {'node': 'origin', 'predecessors': [{'node': 'source', 'src_port': 'o', 'dst_port': 'i', 'copy': False}]},
+        {'node': 'hop', 'predecessors': [{'node': 'origin', 'src_port': 'o', 'dst_port': 'i', 'copy': False}]},
+        {'node': 'sink', 'predecessors': [{'node': 'hop', 'src_port': 'o', 'dst_port': 'i', 'copy': False}]},
+    ]
+    Scheduler(path, nodes, 0).next()
+    labels = [label for label, _ in nodes['sink'].meta['trace']]
+    assert labels == ['origin', 'MainProcess/hop', 'checkpoint', 'MainProcess/sink']
+    times = [timestamp for _, timestamp in nodes['sink'].meta['trace']]
+    assert times == sorted(times)
@@ -5,15 +5,27 @@ import os
 
 os.environ["FOR_DISABLE_CONSOLE_CTRL_HANDLER"] = "1"
 
-# Versioning
-try:
-    from setuptools_scm import get_version
 
-    __version__ = get_version(root="..", relative_to=__file__)
-except:
+def __getattr__(name):
+    # Resolve the version on first access only, and cache it
+    if name == "__version__":
+        globals()["__version__"] = _get_version()
+        return globals()["__version__"]
+    raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
+
+
+def _get_version():
+    # The version file is written by setuptools_scm at install time
     try:
         from .version import version
 
-        __version__ = version
+        return version
+    except:
+        pass
+    # Fall back to git, for source checkouts that were never installed
+    try:
+        from setuptools_scm import get_version
+
+        return get_version(root="..", relative_to=__file__)
     except:
-        __version__ = "0.0.0"
+        return "0.0.0"
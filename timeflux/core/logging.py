@@ -1,16 +1,22 @@
 import os
 import sys
+import queue
 import threading
 import time
 import logging
 import logging.config
 import logging.handlers
 import coloredlogs
-from multiprocessing import Queue
+from collections import deque
 from datetime import datetime, timezone
 
 
 _QUEUE = None
+_LISTENER = None
+_LEVEL = "DEBUG"
+
+# Maximum number of batches waiting to be handled by the listener
+QUEUE_SIZE = 1000
 
 
 class _UTCFormatterConsole(coloredlogs.ColoredFormatter):
@@ -26,12 +32,170 @@ class Handler:
         self.logger = logging.getLogger("timeflux")
 
     def handle(self, record):
-        self.logger.handle(record)
+        # Workers send batches of records
+        if isinstance(record, list):
+            for item in record:
+                self.logger.handle(item)
+        else:
+            self.logger.handle(record)
+
+
+class _Throttle(logging.Filter):
+    """Suppress repeated messages.
+
+    Records with the same logger, level and message are emitted at most once per
+    interval. The number of suppressed records is appended to the next emitted one.
+    Errors, and records with formatting arguments (which are not formatted here, to
+    keep the filter cheap), are never suppressed.
+
+    Args:
+        interval (float): The minimum delay between two identical records, in seconds.
+
+    """
+
+    def __init__(self, interval=1):
+        super().__init__()
+        self._interval = interval
+        self._seen = {}
+
+    def filter(self, record):
+        if (
+            self._interval <= 0
+            or record.levelno >= logging.ERROR
+            or record.args
+            or not isinstance(record.msg, str)
+        ):
+            return True
+        key = (record.name, record.levelno, record.msg)
+        seen = self._seen.get(key)
+        if seen and record.created - seen[0] < self._interval:
+            seen[1] += 1
+            return False
+        if seen and seen[1]:
+            record.msg += f" ({seen[1]} similar messages suppressed)"
+        if len(self._seen) >= 1000:
+            self._seen.clear()
+        self._seen[key] = [record.created, 0]
+        return True
+
+
+class _BatchHandler(logging.Handler):
+    """Send records to the listener in batches, without ever blocking.
+
+    Records are formatted by the calling thread, so that they reflect the logged
+    objects at the time of the call, then buffered locally and sent periodically by
+    a background thread. When the local buffer or the listener queue is full,
+    records are dropped, and a warning is sent once there is room again. Closing the
+    handler stops the thread and sends the last batch.
+
+    Args:
+        queue (Queue): The listener queue.
+        interval (float): The maximum delay before a record is sent, in seconds.
+        batch (int): The number of buffered records that triggers an early send.
+        capacity (int): The maximum number of buffered records.
+
+    """
+
+    def __init__(self, queue, interval=0.05, batch=100, capacity=10000):
+        super().__init__()
+        self._queue = queue
+        self._interval = interval
+        self._batch = batch
+        self._capacity = capacity
+        self._records = deque()
+        self._dropped = 0
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="logging", daemon=True)
+        self._thread.start()
+
+    def emit(self, record):
+        # Called by handle(), with the handler lock held
+        if len(self._records) >= self._capacity:
+            self._dropped += 1
+            return
+        try:
+            self._records.append(self._prepare(record))
+        except Exception:
+            self.handleError(record)
+            return
+        if self._stopped.is_set():
+            # Records logged after closing are sent directly
+            self.flush()
+        elif record.levelno >= logging.ERROR or len(self._records) >= self._batch:
+            self._wakeup.set()
+
+    def flush(self):
+        """Send the buffered records immediately."""
+        # The lock is reentrant, so that emit() can flush once the handler is closed
+        with self.lock:
+            batch = []
+            while self._records:
+                batch.append(self._records.popleft())
+            dropped = self._dropped
+            if dropped:
+                self._dropped -= dropped
+                batch.append(
+                    self._prepare(
+                        logging.makeLogRecord(
+                            {
+                                "name": __name__,
+                                "levelno": logging.WARNING,
+                                "levelname": "WARNING",
+                                "msg": f"Log records dropped: {dropped}",
+                            }
+                        )
+                    )
+                )
+            if not batch:
+                return
+            try:
+                self._queue.put_nowait(batch)
+            except queue.Full:
+                self._dropped += len(batch)
+            except (OSError, ValueError):
+                # The queue is closed
+                pass
+
+    def close(self):
+        """Stop the background thread, and send the pending records."""
+        self._stopped.set()
+        self._wakeup.set()
+        if self._thread is not threading.current_thread():
+            self._thread.join()
+        self.flush()
+        super().close()
+
+    def _run(self):
+        while not self._stopped.is_set():
+            self._wakeup.wait(self._interval)
+            self._wakeup.clear()
+            # Give up once closing, as logging.shutdown() holds the lock during close()
+            while not self.lock.acquire(timeout=0.1):
+                if self._stopped.is_set():
+                    return
+            try:
+                self.flush()
+            finally:
+                self.lock.release()
+
+    def _prepare(self, record):
+        # Make the record picklable, as in QueueHandler
+        record.msg = self.format(record)
+        record.args = None
+        record.exc_info = None
+        record.exc_text = None
+        record.stack_info = None
+        return record
 
 
 def init_listener(level_console="INFO", level_file="DEBUG", file=None):
     q = get_queue()
 
+    # Records below this level are discarded directly by the workers
+    levels = [level_console, level_file] if file else [level_console]
+    globals()["_LEVEL"] = min(levels, key=logging.getLevelName)
+
     level_styles = {
         "debug": {"color": "white"},
         "info": {"color": "cyan"},
@@ -112,21 +276,50 @@ def init_listener(level_console="INFO", level_file="DEBUG", file=None):
     queue = get_queue()
     listener = logging.handlers.QueueListener(queue, Handler())
     listener.start()
+    globals()["_LISTENER"] = listener
 
 
-def terminate_listener():
-    if _QUEUE:
-        _QUEUE.put_nowait(None)
+def terminate_listener(timeout=5):
+    """Stop the listener, once it has handled the pending records.
+
+    Args:
+        timeout (float): The maximum time to wait for the listener, in seconds.
+
+    """
+    if not _QUEUE:
+        return
+    try:
+        _QUEUE.put(None, timeout=timeout)
+    except queue.Full:
+        # The listener is stuck: discard a batch to make room for the sentinel
+        try:
+            _QUEUE.get_nowait()
+            _QUEUE.put_nowait(None)
+        except (queue.Empty, queue.Full):
+            pass
+    if _LISTENER and _LISTENER._thread:
+        _LISTENER._thread.join(timeout)
+        _LISTENER._thread = None
 
 
-def init_worker(queue):
+def init_worker(queue, level="DEBUG"):
     config = {
         "version": 1,
+        "filters": {
+            "throttle": {
+                "()": "timeflux.core.logging._Throttle",
+                "interval": float(os.getenv("TIMEFLUX_LOG_THROTTLE", 1)),
+            },
+        },
         "handlers": {
-            "queue": {"class": "logging.handlers.QueueHandler", "queue": queue},
+            "queue": {
+                "()": "timeflux.core.logging._BatchHandler",
+                "queue": queue,
+                "filters": ["throttle"],
+            },
         },
         "loggers": {
-            "timeflux": {"propagate": False, "level": "DEBUG", "handlers": ["queue"]}
+            "timeflux": {"propagate": False, "level": level, "handlers": ["queue"]}
         },
         "root": {"handlers": ["queue"]},
     }
@@ -134,7 +327,21 @@ def init_worker(queue):
     logging.config.dictConfig(config)
 
 
+def terminate_worker():
+    """Send the pending records of the worker, and stop its logging thread."""
+    for handler in logging.getLogger("timeflux").handlers:
+        handler.close()
+
+
+def get_level():
+    """Return the lowest level handled by the listener."""
+    return _LEVEL
+
+
 def get_queue():
     if not _QUEUE:
-        globals()["_QUEUE"] = Queue()
+        # The queue must be created with the same start method as the workers
+        from timeflux.core.worker import get_context
+
+        globals()["_QUEUE"] = get_context().Queue(QUEUE_SIZE)
     return _QUEUE
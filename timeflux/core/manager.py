@@ -9,7 +9,14 @@ import json
 import yaml
 from jinja2 import Template
 from timeflux.core.validate import validate
-from timeflux.core.worker import Worker
+from timeflux.core.worker import Worker, get_context
+from timeflux.core.telemetry import Telemetry, get_interval
+
+# Default number of seconds without a completed cycle before a worker is stalled
+STALL_TIMEOUT = 10
+
+# Maximum delay between two restarts, in seconds
+BACKOFF_MAX = 60
 
 
 class Manager:
@@ -36,6 +43,15 @@ class Manager:
         # Hold the children processes
         self._processes = []
 
+        # Hold the supervision state of each worker, in the same order
+        self._workers = []
+
+        # Multiprocessing context, set at launch
+        self._ctx = None
+
+        # Resource usage aggregator, set at launch if enabled
+        self._telemetry = None
+
         # Load application
         if isinstance(config, dict):
             app = config
@@ -79,21 +95,131 @@ class Manager:
 
     def _launch(self):
         """Launch workers."""
+        self._ctx = self._context()
+        if get_interval() > 0:
+            self._telemetry = Telemetry(
+                self._ctx.Queue(1000),
+                os.getenv("TIMEFLUX_TELEMETRY_PROMETHEUS"),
+                os.getenv("TIMEFLUX_TELEMETRY_CSV"),
+            )
         for graph in self._graphs:
-            worker = Worker(graph)
-            process = worker.run()
-            self._processes.append(process)
-            self.logger.debug("Worker spawned with PID %d", process.pid)
+            self._workers.append({"graph": graph, "failures": 0})
+            self._processes.append(None)
+            self._spawn(len(self._workers) - 1)
+
+    def _spawn(self, index):
+        """Start or restart a worker."""
+        state = self._workers[index]
+        worker = Worker(state["graph"])
+        queue = self._telemetry.queue if self._telemetry else None
+        process = worker.run(self._ctx, queue)
+        state.update(worker=worker, started=time.time(), restart=None, stalled=False)
+        self._processes[index] = process
+        self.logger.debug("Worker spawned with PID %d", process.pid)
+
+    def _context(self):
+        """Get the multiprocessing context.
+
+        With the `forkserver` start method, the server is preloaded with the heavy
+        common modules and the node modules referenced in the application.
+
+        """
+        context = get_context()
+        method = context.get_start_method()
+        self.logger.debug("Start method: %s", method)
+        if method == "forkserver":
+            modules = ["numpy", "pandas", "zmq", "timeflux.core.worker"]
+            modules += os.getenv("TIMEFLUX_PRELOAD", "").split(",")
+            for graph in self._graphs:
+                modules += [node["module"] for node in graph["nodes"]]
+            modules = [module.strip() for module in modules if module.strip()]
+            # Inherited by the server when it starts
+            os.environ["TIMEFLUX_PRELOAD"] = ",".join(dict.fromkeys(modules))
+            context.set_forkserver_preload(["timeflux.core.preload"])
+        return context
 
     def _monitor(self):
-        """Wait for at least one worker to terminate."""
+        """Supervise the workers until one of them terminates for good."""
         if not self._processes:
             return
         while True:
-            if any(not process.is_alive() for process in self._processes):
-                return
+            for index in range(len(self._workers)):
+                if not self._check(index):
+                    return
+            if self._telemetry:
+                self._telemetry.update()
             time.sleep(0.1)
 
+    def _check(self, index):
+        """Check the health of a worker, and restart it if required.
+
+        A worker is stalled when its scheduler has not completed a cycle for more
+        than `stall_timeout` seconds, or has not completed its first cycle within
+        `stall_timeout` seconds of starting. If the graph has the `restart` property,
+        stalled and failed workers are restarted, with an exponential backoff.
+
+        Returns:
+            bool: `False` if the application must be terminated.
+
+        """
+        state = self._workers[index]
+        graph = state["graph"]
+        process = self._processes[index]
+        now = time.time()
+        if state["restart"] is not None:
+            # Waiting for a restart
+            if now >= state["restart"]:
+                self._spawn(index)
+            return True
+        if process.is_alive():
+            cycles, duration, beat = state["worker"].heartbeat
+            timeout = graph.get("stall_timeout", STALL_TIMEOUT)
+            # Until the first cycle, loading the graph counts as a cycle
+            since = beat or state["started"]
+            if now - since > timeout:
+                if not state["stalled"]:
+                    state["stalled"] = True
+                    if beat:
+                        self.logger.error(
+                            "Graph '%s' stalled: no cycle completed for %.1fs "
+                            "(cycles: %d, last cycle duration: %.3fs)",
+                            process.name,
+                            now - beat,
+                            cycles,
+                            duration,
+                        )
+                    else:
+                        self.logger.error(
+                            "Graph '%s' stalled: no cycle completed %.1fs after start",
+                            process.name,
+                            now - since,
+                        )
+                    if graph.get("restart"):
+                        # A stalled worker is unlikely to handle interrupts
+                        process.terminate()
+            elif state["stalled"]:
+                state["stalled"] = False
+                self.logger.info("Graph '%s' resumed", process.name)
+            if state["failures"] and now - state["started"] > BACKOFF_MAX:
+                # The worker has been healthy long enough
+                state["failures"] = 0
+            return True
+        if process.exitcode == 0 or not graph.get("restart"):
+            return False
+        if process.exitcode == 2:
+            self.logger.error("Graph '%s' cannot be loaded", process.name)
+            return False
+        delay = min(2 ** state["failures"], BACKOFF_MAX)
+        state["failures"] += 1
+        state["restart"] = now + delay
+        self.logger.warning(
+            "Graph '%s' exited with code %d, restarting in %ds",
+            process.name,
+            process.exitcode,
+            delay,
+        )
+        return True
+
     def _terminate(self):
         """Terminate all workers."""
         # https://bugs.python.org/issue26350
@@ -128,3 +128,15 @@ class Node(ABC):
         """Perform cleanup upon termination."""
 
         pass
+
+    def buffers(self):
+        """Report the size of the internal buffers, for telemetry.
+
+        Nodes that keep data across updates should override this method.
+
+        Returns:
+            dict: The number of rows (or items) held in each buffer, by name.
+
+        """
+
+        return {}
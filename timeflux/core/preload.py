@@ -0,0 +1,40 @@
+"""timeflux.core.preload: warm up the forkserver.
+
+This module is imported by the forkserver process when workers are started with the
+`forkserver` method. It imports the modules listed in the ``TIMEFLUX_PRELOAD``
+environment variable (comma-separated), so that every worker is forked from an image
+where they are already loaded.
+
+Failures are ignored: any exception raised here would kill the forkserver, and the
+worker will report the error anyway when it loads the graph.
+
+"""
+
+import importlib
+import os
+
+
+def preload(modules):
+    """Import modules, ignoring errors.
+
+    Args:
+        modules (list): The module names.
+
+    Returns:
+        list: The modules that were successfully imported.
+
+    """
+    loaded = []
+    for module in modules:
+        module = module.strip()
+        if not module:
+            continue
+        try:
+            importlib.import_module(module)
+            loaded.append(module)
+        except (Exception, SystemExit):
+            pass
+    return loaded
+
+
+preload(os.getenv("TIMEFLUX_PRELOAD", "").split(","))
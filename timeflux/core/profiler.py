@@ -0,0 +1,186 @@
+"""timeflux.core.profiler: profile the scheduler cycles of a graph.
+
+Profiling is enabled per graph with the ``TIMEFLUX_PROFILE`` environment variable
+(a comma-separated list of graph ids, or `*` for all the graphs), or at any time by
+sending a ``SIGUSR1`` signal to the worker process. Each session lasts
+``TIMEFLUX_PROFILE_DURATION`` seconds (default: `10`), after which two files are
+written in ``TIMEFLUX_PROFILE_DIR`` (default: the directory of the log file, or the
+current directory):
+
+- a `.prof` file, in the `pstats` format, that can be opened with the usual tools
+  (`snakeviz`, `flameprof`, `gprof2dot`, etc.),
+- a `.txt` summary, with the time spent in each node class and the top functions.
+
+"""
+
+import cProfile
+import io
+import logging
+import os
+import pstats
+import signal
+import threading
+from datetime import datetime
+from time import time
+
+
+class Profiler:
+
+    """Profile the scheduler cycles for a limited duration.
+
+    Args:
+        graph (str): The graph id, used to name the output files.
+        nodes (dict): The node instances, by id.
+        duration (float): The duration of a profiling session, in seconds.
+        directory (str): The output directory.
+
+    """
+
+    def __init__(self, graph, nodes, duration=10, directory="."):
+        self.logger = logging.getLogger(__name__)
+        self._graph = graph
+        self._nodes = nodes
+        self._duration = duration
+        self._directory = directory
+        self._profile = None
+        self._end = None
+
+    @classmethod
+    def from_env(cls, graph, nodes):
+        """Create a profiler configured from the environment.
+
+        The profiler is started immediately if the graph is listed in the
+        ``TIMEFLUX_PROFILE`` environment variable.
+
+        """
+        directory = os.getenv("TIMEFLUX_PROFILE_DIR")
+        if not directory:
+            directory = os.path.dirname(os.getenv("TIMEFLUX_LOG_FILE", "")) or "."
+        duration = float(os.getenv("TIMEFLUX_PROFILE_DURATION", 10))
+        profiler = cls(graph, nodes, duration, directory)
+        graphs = [item.strip() for item in os.getenv("TIMEFLUX_PROFILE", "").split(",")]
+        if "*" in graphs or str(graph) in graphs:
+            profiler.start()
+        return profiler
+
+    def install(self):
+        """Start profiling when a ``SIGUSR1`` signal is received.
+
+        This has no effect on platforms without ``SIGUSR1``, or outside of the main
+        thread.
+
+        """
+        if not hasattr(signal, "SIGUSR1"):
+            return
+        if threading.current_thread() is not threading.main_thread():
+            return
+        signal.signal(signal.SIGUSR1, lambda signum, frame: self.start())
+
+    @property
+    def active(self):
+        return self._profile is not None
+
+    def start(self):
+        """Start a profiling session, unless one is already running."""
+        if self.active:
+            return
+        self.logger.info("Profiling for %gs", self._duration)
+        self._end = time() + self._duration
+        self._profile = cProfile.Profile()
+
+    def run(self, function):
+        """Call a function, and profile it if a session is running.
+
+        Args:
+            function (callable): Typically, `Scheduler.next`.
+
+        """
+        profile = self._profile
+        if profile is None:
+            return function()
+        profile.enable()
+        try:
+            return function()
+        finally:
+            profile.disable()
+            if time() >= self._end:
+                self.stop()
+
+    def stop(self):
+        """Stop the running session, and write the results.
+
+        Returns:
+            str: The path of the `pstats` file, or `None` if no session was running.
+
+        """
+        profile = self._profile
+        if profile is None:
+            return None
+        self._profile = None
+        stats = pstats.Stats(profile)
+        if not stats.stats:
+            return None
+        name = "{}-{}-{}".format(
+            self._graph, os.getpid(), datetime.now().strftime("%Y%m%d-%H%M%S")
+        )
+        path = os.path.join(self._directory, name)
+        try:
+            os.makedirs(self._directory, exist_ok=True)
+            stats.dump_stats(path + ".prof")
+            with open(path + ".txt", "w") as stream:
+                stream.write(self.summary(stats))
+        except OSError as error:
+            self.logger.warning("Could not write the profile: %s", error)
+            return None
+        self.logger.info("Profile written to %s.prof", path)
+        return path + ".prof"
+
+    def classes(self, stats):
+        """Aggregate the time spent updating the nodes, by node class.
+
+        Args:
+            stats (Stats): The profiling statistics.
+
+        Returns:
+            list: A list of `(class name, calls, cumulative time)` tuples, sorted by
+            decreasing time.
+
+        """
+        classes = {}
+        for node in self._nodes.values():
+            cls = type(node)
+            code = getattr(cls.update, "__code__", None)
+            if code is None:
+                continue
+            key = (code.co_filename, code.co_firstlineno, code.co_name)
+            name = f"{cls.__module__}.{cls.__name__}"
+            if key in stats.stats and name not in classes:
+                _, calls, _, cumulative, _ = stats.stats[key]
+                classes[name] = (calls, cumulative)
+        return sorted(
+            [(name, calls, time) for name, (calls, time) in classes.items()],
+            key=lambda item: item[2],
+            reverse=True,
+        )
+
+    def summary(self, stats):
+        """Format the profiling statistics as text.
+
+        Args:
+            stats (Stats): The profiling statistics.
+
+        Returns:
+            str: The time spent in each node class, followed by the top functions.
+
+        """
+        stream = io.StringIO()
+        stream.write(f"Graph: {self._graph}\n\n")
+        stream.write(f"{'cumtime':>10} {'calls':>8} {'percall':>10}  node class\n")
+        for name, calls, cumulative in self.classes(stats):
+            stream.write(
+                f"{cumulative:10.3f} {calls:8d} {cumulative / calls * 1000:8.3f}ms  {name}\n"
+            )
+        stream.write("\n")
+        stats.stream = stream
+        stats.sort_stats("cumulative").print_stats(30)
+        return stream.getvalue()
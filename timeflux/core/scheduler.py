@@ -1,34 +1,159 @@
 """timeflux.core.schedule: run nodes"""
 
 import os
+import gc
 import logging
-from time import time, sleep
+import multiprocessing
+from time import time, sleep, perf_counter
 from copy import deepcopy
 from timeflux.core.registry import Registry
+import timeflux.helpers.clock as clock
+import timeflux.helpers.trace as trace
+
+# In manual GC mode, a collection is run even without enough slack time once the
+# allocation count exceeds this multiple of the first generation threshold
+GC_OVERDUE = 10
 
 
 class Scheduler:
-    def __init__(self, path, nodes, rate):
+    def __init__(
+        self, path, nodes, rate, heartbeat=None, gc_mode="auto", profiler=None
+    ):
+        """
+        Args:
+            path (list): The traversal path.
+            nodes (dict): The node instances, by id.
+            rate (float): The number of cycles per second.
+            heartbeat (array): If set, a shared array of three floats, updated after
+                each cycle with the cycle count, the cycle duration and the time.
+            gc_mode (str): If `auto` (the default), Python collects garbage whenever
+                it wants to. If `manual`, the objects that exist when the scheduler
+                starts are frozen, the automatic garbage collection is disabled, and
+                collections are run between cycles, in the slack time before the
+                next deadline.
+            profiler (Profiler): If set, each cycle is run through the profiler.
+
+        Attributes:
+            stats (dict): The number of garbage collections of each generation, the
+                number of collections that occurred during a cycle, and the total
+                and maximum pauses, in seconds.
+
+        """
+        if gc_mode not in ("auto", "manual"):
+            raise ValueError(f"Invalid GC mode '{gc_mode}'")
         self.logger = logging.getLogger(__name__)
         self._path = path
         self._nodes = nodes
         self._rate = rate
         self._sleep = float(os.getenv("TIMEFLUX_SLEEP", 0))
+        self._heartbeat = heartbeat
+        self._profiler = profiler
+        self._graph = multiprocessing.current_process().name
+        self._manual_gc = gc_mode == "manual"
+        self._gc_costs = [0.0, 0.0, 0.0]  # Estimated pause of each generation
+        self._gc_start = None
+        self._in_cycle = False
+        self.stats = {
+            "gc_collections": [0, 0, 0],
+            "gc_in_cycle": 0,
+            "gc_pause": 0.0,
+            "gc_max_pause": 0.0,
+        }
 
     def run(self):
+        gc.callbacks.append(self._on_gc)
+        if self._manual_gc:
+            # Keep the objects created while loading the graph out of the collections
+            gc.collect()
+            gc.freeze()
+            gc.disable()
+        try:
+            self._loop()
+        finally:
+            gc.callbacks.remove(self._on_gc)
+            if self._manual_gc:
+                gc.unfreeze()
+                gc.enable()
+
+    def _loop(self):
         while True:
+            if clock.is_virtual():
+                # Offline mode: follow the simulated time and never sleep
+                Registry.cycle_start = clock.tick()
+                start = time()
+                self._cycle()
+                self._beat(start, time())
+                if self._manual_gc:
+                    self._collect(None)
+                continue
             start = time()
             Registry.cycle_start = start
-            self.next()
-            duration = time() - start
+            self._cycle()
+            end = time()
+            duration = end - start
+            self._beat(start, end)
             if self._rate > 0:
                 max_duration = 1.0 / self._rate
                 if duration > max_duration:
                     self.logger.debug("Congestion")
-                sleep(max(0, max_duration - duration))
+                if self._manual_gc:
+                    self._collect(start + max_duration)
+                sleep(max(0, start + max_duration - time()))
             else:
+                if self._manual_gc:
+                    self._collect(None)
                 sleep(self._sleep)
 
+    def _cycle(self):
+        self._in_cycle = True
+        try:
+            if self._profiler:
+                self._profiler.run(self.next)
+            else:
+                self.next()
+        finally:
+            self._in_cycle = False
+
+    def _collect(self, deadline):
+        # Run the pending collection, if it can be completed before the deadline
+        counts = gc.get_count()
+        thresholds = gc.get_threshold()
+        generation = None
+        for index in range(3):
+            if thresholds[index] <= 0 or counts[index] < thresholds[index]:
+                break
+            generation = index
+        if generation is None:
+            return
+        if deadline is not None and counts[0] < GC_OVERDUE * thresholds[0]:
+            if time() + self._gc_costs[generation] > deadline:
+                return
+        start = perf_counter()
+        gc.collect(generation)
+        cost = perf_counter() - start
+        previous = self._gc_costs[generation]
+        self._gc_costs[generation] = 0.8 * previous + 0.2 * cost if previous else cost
+
+    def _on_gc(self, phase, info):
+        # Measure every collection, whether it was triggered manually or not
+        if phase == "start":
+            self._gc_start = perf_counter()
+        elif self._gc_start is not None:
+            pause = perf_counter() - self._gc_start
+            self._gc_start = None
+            self.stats["gc_collections"][info["generation"]] += 1
+            self.stats["gc_pause"] += pause
+            self.stats["gc_max_pause"] = max(self.stats["gc_max_pause"], pause)
+            if self._in_cycle:
+                self.stats["gc_in_cycle"] += 1
+
+    def _beat(self, start, end):
+        if self._heartbeat is not None:
+            self._heartbeat[0] += 1
+            self._heartbeat[1] = end - start
+            # The time is written last, once the cycle statistics are up to date
+            self._heartbeat[2] = end
+
     def next(self):
         for step in self._path:
             # Clear ports
@@ -50,6 +175,8 @@ class Scheduler:
                                 data = data.copy(deep=True)
                             if meta is not None:
                                 meta = deepcopy(meta)
+                        if meta and "trace" in meta:
+                            meta = trace.hop(meta, f"{self._graph}/{step['node']}")
                         dst_port = getattr(
                             self._nodes[step["node"]], predecessor["dst_port"] + suffix
                         )
@@ -61,3 +188,12 @@ class Scheduler:
     def terminate(self):
         for step in self._path:
             self._nodes[step["node"]].terminate()
+        if any(self.stats["gc_collections"]):
+            self.logger.debug(
+                "GC: %s collections (%d during cycles), pause: %.1f ms total, "
+                "%.1f ms max",
+                "/".join(str(count) for count in self.stats["gc_collections"]),
+                self.stats["gc_in_cycle"],
+                self.stats["gc_pause"] * 1000,
+                self.stats["gc_max_pause"] * 1000,
+            )
@@ -5,7 +5,6 @@ import logging
 import re
 import time
 import numpy as np
-from scipy import stats
 
 
 class Server:
@@ -81,6 +80,8 @@ class Client:
         t = np.array(t)
         offset = ((t[1] - t[0]) + (t[2] - t[3])) / 2
         delay = (t[3] - t[0]) - (t[2] - t[1])
+        from scipy import stats  # Slow import
+
         _, offset, _, _ = stats.theilslopes(offset, delay)
         self.offset_remote = offset
         self.logger.info("Offset: %f", offset)
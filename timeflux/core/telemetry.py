@@ -0,0 +1,209 @@
+"""timeflux.core.telemetry: resource usage of the workers.
+
+Each worker runs a :class:`Sampler` thread that periodically measures the CPU time,
+the resident memory, the garbage collector activity and the size of the node buffers
+of its process, and sends the samples to the manager through a queue. The manager
+aggregates them with :class:`Telemetry`, and can export them as a Prometheus text
+file or as a CSV file.
+
+"""
+
+import csv
+import gc
+import logging
+import os
+import queue
+import threading
+from time import time
+from multiprocessing import current_process
+
+
+def get_interval():
+    """Get the sampling interval from the ``TIMEFLUX_TELEMETRY`` environment variable.
+
+    Returns:
+        float: The interval, in seconds, or `0` if telemetry is disabled.
+
+    """
+    return float(os.getenv("TIMEFLUX_TELEMETRY", 0))
+
+
+def _rss():
+    # Current resident set size, in bytes
+    try:
+        with open("/proc/self/statm") as stream:
+            return int(stream.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+class Sampler(threading.Thread):
+
+    """Periodically sample the resource usage of the current process.
+
+    Samples are sent from a background thread, so that they keep flowing even if the
+    scheduler is stalled. When the queue is full, samples are dropped.
+
+    Args:
+        queue (Queue): The queue where samples are sent.
+        interval (float): The sampling interval, in seconds.
+        nodes (dict): The node instances, by id.
+
+    """
+
+    def __init__(self, queue, interval, nodes):
+        super().__init__(name="telemetry", daemon=True)
+        self._queue = queue
+        self._interval = interval
+        self._nodes = nodes
+        self._graph = current_process().name
+        self._stopped = threading.Event()
+
+    def run(self):
+        while not self._stopped.wait(self._interval):
+            try:
+                self._queue.put_nowait(self.sample())
+            except queue.Full:
+                pass
+
+    def stop(self):
+        """Stop sampling."""
+        self._stopped.set()
+
+    def sample(self):
+        """Measure the resource usage.
+
+        Returns:
+            dict: The sample.
+
+        """
+        times = os.times()
+        buffers = {}
+        for nid, node in self._nodes.items():
+            try:
+                for name, size in node.buffers().items():
+                    buffers[f"{nid}.{name}"] = size
+            except Exception:
+                # The node is being updated by the scheduler thread
+                pass
+        return {
+            "graph": self._graph,
+            "pid": os.getpid(),
+            "time": time(),
+            "cpu": times.user + times.system,
+            "rss": _rss(),
+            "gc_objects": list(gc.get_count()),
+            "gc_collections": [stats["collections"] for stats in gc.get_stats()],
+            "buffers": buffers,
+        }
+
+
+class Telemetry:
+
+    """Aggregate the samples sent by the workers, and export them.
+
+    Args:
+        queue (Queue): The queue where samples are received.
+        prometheus (str|None): Path to a Prometheus text file, rewritten after each
+            update, in the format expected by the textfile collector of the
+            Prometheus node exporter.
+        csv (str|None): Path to a CSV file, where each metric of each sample is
+            appended as a row.
+
+    Attributes:
+        queue (Queue): The queue where samples are received.
+        samples (dict): The last sample of each graph, by graph name, with the CPU
+            usage since the previous sample, as a percentage, in `cpu_percent`.
+
+    """
+
+    def __init__(self, queue, prometheus=None, csv=None):
+        self.logger = logging.getLogger(__name__)
+        self.samples = {}
+        self.queue = queue
+        self._prometheus = prometheus
+        self._csv = csv
+
+    def update(self):
+        """Receive the pending samples and export them.
+
+        Returns:
+            int: The number of received samples.
+
+        """
+        received = []
+        while True:
+            try:
+                sample = self.queue.get_nowait()
+            except (queue.Empty, OSError, ValueError):
+                break
+            previous = self.samples.get(sample["graph"])
+            sample["cpu_percent"] = None
+            if previous and previous["pid"] == sample["pid"]:
+                elapsed = sample["time"] - previous["time"]
+                if elapsed > 0:
+                    sample["cpu_percent"] = (
+                        100 * (sample["cpu"] - previous["cpu"]) / elapsed
+                    )
+            self.samples[sample["graph"]] = sample
+            received.append(sample)
+        if received:
+            try:
+                if self._csv:
+                    self._write_csv(received)
+                if self._prometheus:
+                    self._write_prometheus()
+            except OSError as error:
+                self.logger.warning("Could not export telemetry: %s", error)
+        return len(received)
+
+    @staticmethod
+    def _metrics(sample):
+        # Flatten a sample into (name, labels, value) tuples
+        metrics = [
+            ("cpu_seconds_total", {}, sample["cpu"]),
+            ("cpu_percent", {}, sample["cpu_percent"]),
+            ("rss_bytes", {}, sample["rss"]),
+        ]
+        for generation, value in enumerate(sample["gc_objects"]):
+            metrics.append(("gc_objects", {"generation": generation}, value))
+        for generation, value in enumerate(sample["gc_collections"]):
+            metrics.append(("gc_collections_total", {"generation": generation}, value))
+        for key, value in sample["buffers"].items():
+            node, name = key.split(".", 1)
+            metrics.append(("buffer_size", {"node": node, "buffer": name}, value))
+        return [metric for metric in metrics if metric[2] is not None]
+
+    def _write_prometheus(self):
+        metrics = {}
+        for graph, sample in self.samples.items():
+            for name, labels, value in self._metrics(sample):
+                labels = {"graph": graph, **labels}
+                labels = ",".join(f'{key}="{label}"' for key, label in labels.items())
+                metrics.setdefault(name, []).append(
+                    f"timeflux_{name}{{{labels}}} {value}"
+                )
+        lines = []
+        for name, values in metrics.items():
+            kind = "counter" if name.endswith("_total") else "gauge"
+            lines.append(f"# TYPE timeflux_{name} {kind}")
+            lines += values
+        # Write atomically, so that the file is never read while incomplete
+        path = self._prometheus + ".tmp"
+        with open(path, "w") as stream:
+            stream.write("\n".join(lines) + "\n")
+        os.replace(path, self._prometheus)
+
+    def _write_csv(self, samples):
+        header = not os.path.exists(self._csv)
+        with open(self._csv, "a", newline="") as stream:
+            writer = csv.writer(stream)
+            if header:
+                writer.writerow(["time", "graph", "pid", "metric", "value"])
+            for sample in samples:
+                for name, labels, value in self._metrics(sample):
+                    if labels:
+                        name += "." + ".".join(str(label) for label in labels.values())
+                    writer.writerow(
+                        [sample["time"], sample["graph"], sample["pid"], name, value]
+                    )
@@ -2,28 +2,87 @@
 
 import importlib
 import logging
+import os
 import signal
-from multiprocessing import Process
-from timeflux.core.logging import get_queue, init_worker
+import sys
+import multiprocessing
+from time import time
+from timeflux.core.logging import get_queue, get_level, init_worker, terminate_worker
 from timeflux.core.graph import Graph
 from timeflux.core.scheduler import Scheduler
 from timeflux.core.registry import Registry
+from timeflux.core.telemetry import Sampler, get_interval
+from timeflux.core.profiler import Profiler
 from timeflux.core.exceptions import *
 
 
+def get_context():
+    """Get the multiprocessing context.
+
+    The start method is read from the ``TIMEFLUX_START_METHOD`` environment variable.
+    If it is not set, the platform default is used.
+
+    Returns:
+        The multiprocessing context.
+
+    Raises:
+        ValueError: If the start method is not available on this platform.
+
+    """
+    method = os.getenv("TIMEFLUX_START_METHOD")
+    if not method:
+        return multiprocessing.get_context()
+    methods = multiprocessing.get_all_start_methods()
+    if method not in methods:
+        raise ValueError(
+            f"Invalid start method '{method}'. Valid values are: {', '.join(methods)}"
+        )
+    return multiprocessing.get_context(method)
+
+
 class Worker:
 
-    """Spawn a process and launch a scheduler."""
+    """Spawn a process and launch a scheduler.
+
+    The process exits with status `0` when the graph terminates normally, `1` on
+    runtime errors, and `2` when the graph cannot be loaded.
+
+    Attributes:
+        heartbeat (array): Shared array updated by the scheduler after each cycle with
+            the cycle count, the last cycle duration and the time. Available once the
+            process is started.
+
+    """
 
     def __init__(self, graph):
         self._graph = graph
+        self.heartbeat = None
+
+    def run(self, context=None, telemetry=None):
+        """Run the process
+
+        Args:
+            context: The multiprocessing context used to start the process. If `None`,
+                it is obtained from :func:`get_context`.
+            telemetry (Queue): If set, resource usage samples are sent to this queue.
 
-    def run(self):
-        """Run the process"""
-        p = Process(target=self._run, args=(get_queue(),), name=self._graph["id"])
+        """
+        context = context or get_context()
+        self.heartbeat = context.RawArray("d", 3)
+        p = context.Process(
+            target=self._main,
+            args=(get_queue(), time(), self.heartbeat, telemetry, get_level()),
+            name=self._graph["id"],
+        )
         p.start()
         return p
 
+    def _main(self, *args):
+        status = self._run(*args)
+        terminate_worker()
+        if status:
+            sys.exit(status)
+
     def load(self):
         # Build the graph and compute the traversal path
         g = Graph(self._graph)
@@ -41,19 +100,60 @@ class Worker:
 
         return path, nodes
 
-    def _run(self, log_queue=None):
+    def _run(
+        self,
+        log_queue=None,
+        launched=None,
+        heartbeat=None,
+        telemetry=None,
+        log_level="DEBUG",
+    ):
+        started = time()
+
+        # Set the scheduling options before any thread is started, including the
+        # logging thread, since threads inherit them but they apply per thread
+        messages = self._schedule()
+
         # Initialize logging
         if log_queue:
-            init_worker(log_queue)
+            init_worker(log_queue, log_level)
         logger = logging.getLogger(__name__)
+        for level, message, *args in messages:
+            logger.log(level, message, *args)
 
         scheduler = None
+        sampler = None
+        profiler = None
+        status = 0
 
         try:
             # Initialize the graph and instantiate the nodes
             path, nodes = self.load()
+            if launched is not None:
+                loaded = time()
+                logger.info(
+                    "Worker ready in %.3fs (process start: %.3fs, graph load: %.3fs)",
+                    loaded - launched,
+                    started - launched,
+                    loaded - started,
+                )
+            # Start sampling the resource usage
+            if telemetry is not None:
+                sampler = Sampler(telemetry, get_interval(), nodes)
+                sampler.start()
+            # Profile on demand
+            name = self._graph["id"] or multiprocessing.current_process().name
+            profiler = Profiler.from_env(name, nodes)
+            profiler.install()
             # Launch scheduler and run it
-            scheduler = Scheduler(path, nodes, self._graph["rate"])
+            scheduler = Scheduler(
+                path,
+                nodes,
+                self._graph["rate"],
+                heartbeat,
+                self._graph.get("gc", "auto"),
+                profiler,
+            )
             scheduler.run()
         except KeyboardInterrupt:
             # Ignore further interrupts
@@ -66,15 +166,72 @@ class Worker:
             ValidationError,
         ) as error:
             logger.error(error)
+            status = 2
         except WorkerInterrupt as error:
             logger.debug(error)
         except Exception as error:
             logger.exception(error)
+            status = 1
+
+        if sampler is not None:
+            sampler.stop()
+
+        if profiler is not None:
+            profiler.stop()
 
         if scheduler is not None:
             logger.info("Terminating")
             scheduler.terminate()
 
+        return status
+
+    def _schedule(self):
+        """Apply the CPU affinity, niceness and real-time priority of the graph.
+
+        Logging is not initialized yet, so the messages are returned instead.
+
+        Returns:
+            list: The `(level, message, *args)` tuples to log.
+
+        """
+        messages = []
+        affinity = self._graph.get("affinity")
+        if affinity is not None:
+            try:
+                os.sched_setaffinity(0, affinity)
+                messages.append(
+                    (logging.INFO, "CPU affinity: %s", sorted(os.sched_getaffinity(0)))
+                )
+            except (AttributeError, OSError) as error:
+                messages.append(
+                    (logging.WARNING, "Could not set CPU affinity: %s", error)
+                )
+        nice = self._graph.get("nice")
+        if nice is not None:
+            try:
+                os.setpriority(os.PRIO_PROCESS, 0, nice)
+                messages.append(
+                    (logging.INFO, "Niceness: %d", os.getpriority(os.PRIO_PROCESS, 0))
+                )
+            except (AttributeError, OSError) as error:
+                messages.append((logging.WARNING, "Could not set niceness: %s", error))
+        priority = self._graph.get("priority")
+        if priority is not None:
+            try:
+                os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(priority))
+                messages.append(
+                    (
+                        logging.INFO,
+                        "Real-time scheduling: SCHED_FIFO, priority %d",
+                        priority,
+                    )
+                )
+            except (AttributeError, OSError) as error:
+                messages.append(
+                    (logging.WARNING, "Could not set real-time scheduling: %s", error)
+                )
+        return messages
+
     def _load_node(self, node, nid):
         """Import a module and instantiate class."""
 
@@ -1,6 +1,7 @@
 import os
 import logging
 import pandas as pd
+from timeflux.helpers.hdf5 import is_array, select_array
 
 try:
     import pyedflib
@@ -22,7 +23,10 @@ def convert(
     except:
         return _error(f"Could not read from file: {src}")
     try:
-        data = store.select(data_key)
+        if is_array(store, data_key):
+            data = select_array(store, data_key)
+        else:
+            data = store.select(data_key)
     except:
         return _error("Data key not found.")
     try:
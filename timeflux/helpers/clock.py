@@ -7,13 +7,52 @@ from time import time, perf_counter
 from datetime import datetime
 
 
+_VIRTUAL = None
+
+
 def now():
     """Return the current time as `np.datetime64['us']`."""
     # return pd.Timestamp(time(), unit='s')
     # return float_to_time(time())
+    if _VIRTUAL:
+        return np.datetime64(_VIRTUAL["now"], "us")
     return np.datetime64(int(time() * 1e6), "us")
 
 
+def set_virtual(start, step=None):
+    """Replace the wall clock with a virtual clock, for the current process only.
+
+    Once set, :func:`now` returns the simulated time, which only moves forward when
+    :func:`tick` is called. Time is kept as an integer number of microseconds, so
+    that successive runs are strictly reproducible.
+
+    Args:
+        start (np.datetime64|None): The initial time. If `None`, the wall clock is restored.
+        step (float): The amount of time to advance on each tick, in seconds.
+
+    """
+    if start is None:
+        globals()["_VIRTUAL"] = None
+        return
+    if not step or step <= 0:
+        raise ValueError("The virtual clock step must be positive.")
+    globals()["_VIRTUAL"] = {
+        "now": int(np.datetime64(start, "us").astype(np.int64)),
+        "step": int(round(step * 1e6)),
+    }
+
+
+def is_virtual():
+    """Return `True` if the virtual clock is enabled."""
+    return _VIRTUAL is not None
+
+
+def tick():
+    """Advance the virtual clock by one step and return the new time, in seconds."""
+    _VIRTUAL["now"] += _VIRTUAL["step"]
+    return _VIRTUAL["now"] / 1e6
+
+
 def float_to_time(timestamp):
     """Convert a `np.float64` to a `np.datetime64['us']`."""
     return np.datetime64(datetime.utcfromtimestamp(timestamp), "us")
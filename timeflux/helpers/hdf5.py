@@ -1,12 +1,187 @@
-"""Enumerate groups in a HFD5 file."""
+"""HDF5 helpers.
 
+Besides the standard pandas tables, Timeflux can record numeric signals in a
+column-oriented layout: each key is a group holding a fixed-shape `float32`
+array of values and a separate `int64` array of timestamps, in nanoseconds since
+the epoch. This layout is much faster to write and to read back than a pandas
+table, especially for long recordings with many channels.
+
+When run as a script, enumerate groups in a HFD5 file.
+"""
+
+import os
 import sys
+import json
+import numpy as np
 import pandas as pd
+import tables
+
+#: Recording profiles, see :class:`timeflux.nodes.hdf5.Save`.
+PROFILES = {
+    "default": {"complib": "zlib", "complevel": 3, "layout": "table"},
+    "fast": {"complib": "blosc:lz4", "complevel": 5, "layout": "array"},
+    "compact": {"complib": "blosc:zstd", "complevel": 5, "layout": "array"},
+}
+
+
+def is_array(store, key):
+    """Check if a key is stored with the column-oriented layout.
+
+    Args:
+        store (HDFStore): The store.
+        key (str): The key.
+
+    Returns:
+        bool
+
+    """
+    node = store.get_node(key)
+    if node is None or not isinstance(node, tables.Group):
+        return False
+    return node._v_attrs.__contains__("layout") and node._v_attrs["layout"] == "array"
+
+
+def is_numeric(data):
+    """Check if a DataFrame only contains numeric columns.
+
+    Args:
+        data (DataFrame): The data.
+
+    Returns:
+        bool
+
+    """
+    return isinstance(data, pd.DataFrame) and all(
+        pd.api.types.is_numeric_dtype(dtype) for dtype in data.dtypes
+    )
+
+
+def append_array(store, key, data, filters=None, expectedrows=None):
+    """Append numeric data to a key, using the column-oriented layout.
+
+    The group and its arrays are created on the first call.
+
+    Args:
+        store (HDFStore): The store, opened in write mode.
+        key (str): The key.
+        data (DataFrame): The data, with a datetime index and numeric columns.
+        filters (tables.Filters): The compression filters.
+        expectedrows (int): A hint for the total number of rows.
+
+    """
+    values = np.ascontiguousarray(data.values, dtype=np.float32)
+    timestamps = data.index.values.astype("datetime64[ns]").astype(np.int64)
+    group = store.get_node(key)
+    if group is None:
+        handle = store._handle
+        where, name = key.rsplit("/", 1)
+        group = handle.create_group(where or "/", name, createparents=True)
+        group._v_attrs["layout"] = "array"
+        group._v_attrs["columns"] = list(data.columns)
+        options = {"filters": filters}
+        if expectedrows:
+            options["expectedrows"] = expectedrows
+        shape = (0, values.shape[1])
+        handle.create_earray(group, "values", tables.Float32Atom(), shape, **options)
+        handle.create_earray(group, "timestamps", tables.Int64Atom(), (0,), **options)
+    elif values.shape[1] != len(group._v_attrs["columns"]):
+        raise ValueError(f"{key}: the number of columns cannot change")
+    group._f_get_child("values").append(values)
+    group._f_get_child("timestamps").append(timestamps)
+
+
+def select_array(store, key, start=None, stop=None):
+    """Read rows from a key stored with the column-oriented layout.
+
+    Args:
+        store (HDFStore): The store.
+        key (str): The key.
+        start (int): The first row.
+        stop (int): The row after the last row.
+
+    Returns:
+        DataFrame
+
+    """
+    group = store.get_node(key)
+    values = group._f_get_child("values")[start:stop]
+    timestamps = group._f_get_child("timestamps")[start:stop]
+    index = pd.DatetimeIndex(timestamps.astype("datetime64[ns]"))
+    return pd.DataFrame(values, index=index, columns=group._v_attrs["columns"])
+
+
+def keys(store):
+    """List all the keys of a store, including column-oriented groups.
+
+    Args:
+        store (HDFStore): The store.
+
+    Returns:
+        list
+
+    """
+    found = store.keys()
+    for group in store._handle.walk_groups():
+        key = group._v_pathname
+        if key not in found and is_array(store, key):
+            found.append(key)
+    return found
+
+
+def read_manifest(path):
+    """Load the manifest of a rotated recording.
+
+    Args:
+        path (str): The path to the JSON manifest.
+
+    Returns:
+        list: The segments, in chronological order. Each segment is a dict with an
+        absolute `filename`, and `start` and `stop` timestamps.
+
+    """
+    with open(path) as stream:
+        manifest = json.load(stream)
+    base = os.path.dirname(os.path.abspath(path))
+    segments = []
+    for segment in manifest["segments"]:
+        segments.append(
+            {
+                "filename": os.path.join(base, segment["filename"]),
+                "start": pd.Timestamp(segment["start"]),
+                "stop": pd.Timestamp(segment["stop"]),
+            }
+        )
+    return sorted(segments, key=lambda segment: segment["start"])
+
+
+def write_manifest(path, segments):
+    """Atomically write the manifest of a rotated recording.
+
+    Args:
+        path (str): The path to the JSON manifest.
+        segments (list): The segments. Each segment is a dict with a `filename`,
+            relative to the manifest, and `start` and `stop` timestamps.
+
+    """
+    manifest = {
+        "segments": [
+            {
+                "filename": segment["filename"],
+                "start": pd.Timestamp(segment["start"]).isoformat(),
+                "stop": pd.Timestamp(segment["stop"]).isoformat(),
+            }
+            for segment in segments
+        ]
+    }
+    tmp = path + ".tmp"
+    with open(tmp, "w") as stream:
+        json.dump(manifest, stream, indent=2)
+    os.replace(tmp, path)
 
 
 def info(fname):
     store = pd.HDFStore(fname, "r")
-    for key in store.keys():
+    for key in keys(store):
         print(key)
     store.close()
 
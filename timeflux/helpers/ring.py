@@ -0,0 +1,112 @@
+"""Ring buffers shared between a producer thread and the scheduler."""
+
+import numpy as np
+
+
+class Ring:
+    """Single-producer, single-consumer ring buffer of timestamped rows.
+
+    Rows are stored in preallocated NumPy arrays. The producer and the consumer each
+    own one counter (the total number of rows written and read, respectively), so no
+    lock is required as long as there is only one thread on each side. When the
+    buffer is full, the incoming rows are dropped and counted.
+
+    Args:
+        capacity (int): The maximum number of rows.
+        width (int|None): The number of values per row. If `None`, rows are scalars.
+        dtype (dtype): The type of the values. Use `object` for arbitrary values.
+
+    Attributes:
+        dropped (int): The total number of dropped rows.
+
+    """
+
+    def __init__(self, capacity, width=None, dtype=np.float64):
+        if capacity <= 0:
+            raise ValueError("The capacity must be positive.")
+        shape = (capacity,) if width is None else (capacity, width)
+        self._values = np.empty(shape, dtype=dtype)
+        self._stamps = np.empty(capacity, dtype=np.float64)
+        self._capacity = capacity
+        self._written = 0  # Only modified by the producer
+        self._read = 0  # Only modified by the consumer
+        self.dropped = 0
+
+    def __len__(self):
+        return self._written - self._read
+
+    def push(self, values, stamps):
+        """Append rows. Must only be called by the producer.
+
+        Args:
+            values (array_like): The rows.
+            stamps (array_like): The timestamps, one per row, as floats.
+
+        Returns:
+            int: The number of rows actually stored.
+
+        """
+        count = len(stamps)
+        free = self._capacity - (self._written - self._read)
+        if count > free:
+            self.dropped += count - free
+            count = free
+        if count == 0:
+            return 0
+        start = self._written % self._capacity
+        first = min(count, self._capacity - start)
+        self._values[start : start + first] = values[:first]
+        self._stamps[start : start + first] = stamps[:first]
+        if first < count:
+            self._values[: count - first] = values[first:count]
+            self._stamps[: count - first] = stamps[first:count]
+        # Publish the rows only once they are written
+        self._written += count
+        return count
+
+    def append(self, value, stamp):
+        """Append a single row. Must only be called by the producer.
+
+        This is cheaper than :meth:`push` for one row, and stores `value` as is in
+        buffers of type `object`.
+
+        Args:
+            value: The row.
+            stamp (float): The timestamp.
+
+        Returns:
+            bool: `False` if the row was dropped.
+
+        """
+        if self._written - self._read == self._capacity:
+            self.dropped += 1
+            return False
+        index = self._written % self._capacity
+        self._values[index] = value
+        self._stamps[index] = stamp
+        self._written += 1
+        return True
+
+    def pull(self):
+        """Remove and return all the available rows. Must only be called by the consumer.
+
+        Returns:
+            tuple: A copy of the rows and their timestamps, or `(None, None)` if the
+            buffer is empty.
+
+        """
+        written = self._written
+        count = written - self._read
+        if count == 0:
+            return None, None
+        start = self._read % self._capacity
+        stop = start + count
+        if stop <= self._capacity:
+            values = self._values[start:stop].copy()
+            stamps = self._stamps[start:stop].copy()
+        else:
+            stop -= self._capacity
+            values = np.concatenate((self._values[start:], self._values[:stop]))
+            stamps = np.concatenate((self._stamps[start:], self._stamps[:stop]))
+        self._read = written
+        return values, stamps
@@ -0,0 +1,56 @@
+"""Latency tracing helpers
+
+A traced chunk carries a ``trace`` entry in its meta: a list of ``[label, timestamp]``
+pairs, starting with the origin of the chunk, followed by one pair for each hop it
+went through. Timestamps are given in seconds since the epoch, so that they can be
+compared across processes.
+
+Tracing starts when a chunk goes through a :class:`timeflux.nodes.trace.Origin` node.
+Hops are then added by the scheduler, each time a traced chunk is passed to a node,
+and by the ZeroMQ publishers and subscribers. Meta dictionaries may be shared between
+several ports, so they are never modified in place.
+
+"""
+
+from time import time
+
+
+def origin(meta, label, timestamp=None):
+    """Start a trace.
+
+    Args:
+        meta (dict|None): The meta of the chunk.
+        label (str): The name of the origin.
+        timestamp (float): The time of origin. Default: now.
+
+    Returns:
+        dict: A copy of the meta, with a new trace.
+
+    """
+    if timestamp is None:
+        timestamp = time()
+    meta = dict(meta) if meta else {}
+    meta["trace"] = [[label, timestamp]]
+    return meta
+
+
+def hop(meta, label, timestamp=None):
+    """Add a hop to a trace.
+
+    Args:
+        meta (dict|None): The meta of the chunk.
+        label (str): The name of the hop.
+        timestamp (float): The time of the hop. Default: now.
+
+    Returns:
+        dict: A copy of the meta with the new hop if the chunk is traced, or the meta
+        itself otherwise.
+
+    """
+    if not meta or "trace" not in meta:
+        return meta
+    if timestamp is None:
+        timestamp = time()
+    meta = dict(meta)
+    meta["trace"] = meta["trace"] + [[label, timestamp]]
+    return meta
@@ -1,42 +1,48 @@
 """Accumulation nodes that either, stack, append or, concatenate data after a gate"""
 
+import numpy as np
 import pandas as pd
 import xarray as xr
 from timeflux.core.node import Node
 
 
-class AppendDataFrame(Node):
-    """Accumulates and appends data of type DataFrame after a gate.
-
-    This node should be plugged after a Gate. As long as it receives data,
-    it appends them to an internal buffer. When it receives a meta with key
-    `gate_status` set to `closed`, it releases the accumulated data and empty the
-    buffer.
+class _Append(Node):
+    """Common buffering logic for the accumulation nodes.
 
-    Attributes:
-        i (Port): Default data input, expects DataFrame and meta
-        o (Port): Default output, provides DataFrame
+    Chunks are kept in a list and concatenated only once, when the data is released.
+    The buffer can optionally be capped, in which case the `overflow` policy
+    determines what happens to the extra data:
 
-    Args:
-        **kwargs: key word arguments to pass to pandas.DataFrame.concat method.
+    - `drop_oldest`: the oldest rows are discarded.
+    - `drop_newest`: the incoming rows are discarded.
+    - `release`: the accumulated data is released early, and a new buffer is started.
 
     """
 
-    def __init__(self, meta_keys=None, **kwargs):
-        super().__init__()
+    _policies = ("drop_oldest", "drop_newest", "release")
+
+    def __init__(self, meta_keys=None, max_rows=None, max_duration=None, overflow=None):
+        if overflow is None:
+            overflow = "drop_oldest"
+        if overflow not in self._policies:
+            raise ValueError(
+                f"Invalid overflow policy '{overflow}'. "
+                f"Valid values are: {', '.join(self._policies)}"
+            )
         self._meta_keys = meta_keys
-        self._kwargs = kwargs
+        self._max_rows = max_rows
+        self._max_duration = max_duration
+        self._overflow = overflow
         self._reset()
 
     def _reset(self):
-        self._data = pd.DataFrame()
+        self._data_list = []
         self._meta = []
+        self._rows = 0
+        self._overflowed = False
 
     def _release(self):
-        self.logger.info(
-            f"AppendDataFrame is releasing {len(self._data)} " f"accumulated rows."
-        )
-        self.o.data = self._data
+        self.o.data = self._concat(self._data_list)
         if self._meta_keys is None:
             self.o.meta = {"accumulate": self._meta}
         else:
@@ -51,17 +57,126 @@ class AppendDataFrame(Node):
         if self.i.ready():
             # update the meta
             self._meta.append(self.i.meta)
-
             # append the data
-            self._data = pd.concat([self._data, self.i.data], **self._kwargs)
+            self._append(self.i.data)
 
         # if gate is close, release the data and reset the buffer
-        if gate_status == "closed" and not self._data.empty:
+        if gate_status == "closed" and self._rows:
             self._release()
             self._reset()
 
+    def _append(self, data):
+        if self._overflow == "drop_newest":
+            data = self._slice(data, 0, self._room(data))
+        rows = self._length(data)
+        if not rows:
+            return
+        self._data_list.append(data)
+        self._rows += rows
+        excess = self._excess()
+        if excess:
+            if not self._overflowed:
+                self.logger.warning(
+                    f"{type(self).__name__} buffer is full, applying the "
+                    f"'{self._overflow}' policy."
+                )
+                self._overflowed = True
+            if self._overflow == "drop_oldest":
+                self._drop(excess)
+            elif self._overflow == "release":
+                self._release()
+                self._reset()
+
+    def buffers(self):
+        return {"buffer": self._rows}
+
+    def _room(self, data):
+        # Number of incoming rows that fit in the buffer
+        room = self._length(data)
+        if self._max_rows is not None:
+            room = min(room, max(self._max_rows - self._rows, 0))
+        if self._max_duration is not None and self._data_list:
+            first = self._times(self._data_list[0])[0]
+            limit = first + np.timedelta64(int(self._max_duration * 1e9), "ns")
+            room = min(room, np.searchsorted(self._times(data), limit, "right"))
+        return room
+
+    def _excess(self):
+        # Number of oldest rows that exceed the buffer capacity
+        excess = 0
+        if self._max_rows is not None:
+            excess = max(self._rows - self._max_rows, 0)
+        if self._max_duration is not None:
+            last = self._times(self._data_list[-1])[-1]
+            limit = last - np.timedelta64(int(self._max_duration * 1e9), "ns")
+            count = 0
+            for data in self._data_list:
+                times = self._times(data)
+                index = np.searchsorted(times, limit, "left")
+                count += index
+                if index < len(times):
+                    break
+            excess = max(excess, count)
+        return excess
+
+    def _drop(self, count):
+        # Discard the oldest rows
+        self._rows -= count
+        while count:
+            rows = self._length(self._data_list[0])
+            if rows <= count:
+                self._data_list.pop(0)
+                count -= rows
+            else:
+                self._data_list[0] = self._slice(self._data_list[0], count, rows)
+                count = 0
+
+
+class AppendDataFrame(_Append):
+    """Accumulates and appends data of type DataFrame after a gate.
+
+    This node should be plugged after a Gate. As long as it receives data,
+    it appends them to an internal buffer. When it receives a meta with key
+    `gate_status` set to `closed`, it releases the accumulated data and empty the
+    buffer.
+
+    Attributes:
+        i (Port): Default data input, expects DataFrame and meta
+        o (Port): Default output, provides DataFrame
+
+    Args:
+        max_rows (int|None): The maximum number of buffered rows.
+        max_duration (float|None): The maximum buffered duration, in seconds.
+        overflow (str): The policy to apply when the buffer is full. One of
+            `drop_oldest` (default), `drop_newest` or `release`.
+        **kwargs: key word arguments to pass to pandas.DataFrame.concat method.
+
+    """
 
-class AppendDataArray(Node):
+    def __init__(
+        self, meta_keys=None, max_rows=None, max_duration=None, overflow=None, **kwargs
+    ):
+        super().__init__(meta_keys, max_rows, max_duration, overflow)
+        self._kwargs = kwargs
+
+    def _release(self):
+        self.logger.info(f"AppendDataFrame is releasing {self._rows} accumulated rows.")
+        super()._release()
+
+    def _concat(self, data_list):
+        return pd.concat(data_list, **self._kwargs)
+
+    def _length(self, data):
+        return len(data)
+
+    def _times(self, data):
+        return data.index.values
+
+    def _slice(self, data, start, stop):
+        return data.iloc[start:stop]
+
+
+class AppendDataArray(_Append):
     """Accumulates and appends data of type XArray after a gate.
 
     This node should be plugged after a Gate. As long as it receives DataArrays,
@@ -75,45 +190,43 @@ class AppendDataArray(Node):
 
     Args:
         dim: Name of the dimension to concatenate along.
+        max_rows (int|None): The maximum number of buffered elements along `dim`.
+        max_duration (float|None): The maximum buffered duration, in seconds. Requires
+            `dim` to be a datetime coordinate.
+        overflow (str): The policy to apply when the buffer is full. One of
+            `drop_oldest` (default), `drop_newest` or `release`.
         **kwargs: key word arguments to pass to xarray.concat method.
 
     """
 
-    def __init__(self, dim, meta_keys=None, **kwargs):
-        super().__init__()
+    def __init__(
+        self,
+        dim,
+        meta_keys=None,
+        max_rows=None,
+        max_duration=None,
+        overflow=None,
+        **kwargs,
+    ):
         self._dim = dim
-        self._meta_keys = meta_keys
+        super().__init__(meta_keys, max_rows, max_duration, overflow)
         self._kwargs = kwargs
-        self._reset()
-
-    def _reset(self):
-        self._data_list = []
-        self._meta = []
 
     def _release(self):
         self.logger.info(
             f"AppendDataArray is releasing {len(self._data_list)} "
             f"accumulated data chunks."
         )
-        self.o.data = xr.concat(self._data_list, self._dim, **self._kwargs)
-        if self._meta_keys is None:
-            self.o.meta = {"accumulate": self._meta}
-        else:
-            self.o.meta = {key: [] for key in self._meta_keys}
-            for meta_key in self._meta_keys:
-                for meta in self._meta:
-                    self.o.meta[meta_key] += meta.get(meta_key, [])
+        super()._release()
 
-    def update(self):
-        gate_status = self.i.meta.get("gate_status")
+    def _concat(self, data_list):
+        return xr.concat(data_list, self._dim, **self._kwargs)
 
-        # append the data
-        if self.i.ready():
-            self._data_list.append(self.i.data)
-            # update the meta
-            self._meta.append(self.i.meta)
+    def _length(self, data):
+        return data.sizes[self._dim]
 
-        # if gate is close, release the data and reset the buffer
-        if gate_status == "closed" and self._data_list:
-            self._release()
-            self._reset()
+    def _times(self, data):
+        return data[self._dim].values
+
+    def _slice(self, data, start, stop):
+        return data.isel({self._dim: slice(start, stop)})
@@ -2,7 +2,10 @@
 
 from timeflux.core.node import Node
 from importlib import import_module
+from inspect import signature
+import numpy as np
 import pandas as pd
+import xarray as xr
 
 
 class ApplyMethod(Node):
@@ -23,9 +26,11 @@ class ApplyMethod(Node):
        apply_mode (str`): {`universal`, `reduce`, `expand` }. Default: `universal`.
              -  `universal` if function is a transformation from n_array to n_array
              -  `reduce` if function is a transformation from n_array to scalar
-             -  `expand` if function is a transformation from n_array to nk_array [not yet implemented]
+             -  `expand` if function is a transformation from n_array to nk_array
        axis (int) : if 0, the transformation is applied to columns, if 1 to rows. Default: `0`.
        closed (str) : {`left`, `right`, `center`}: timestamp to transfer in the output, only when method_type is "reduce" and axis = 0, in which case, the output port's lenght is 1. Default: `right`.
+       vectorized (bool|None): if `True`, the function is called once on the whole 2-D array instead of once per column or row.
+             If `None`, NumPy ufuncs and functions accepting an ``axis`` argument are automatically vectorized, as long as the shape of the result matches ``apply_mode``. Default: `None`.
        kwargs:  additional keyword arguments to pass as keywords arguments to `func`.
 
     Notes:
@@ -33,10 +38,11 @@ class ApplyMethod(Node):
         Note that the passed function will receive ndarray objects for performance purposes.
         For universal functions, ie. transformation from n_array to n_array, input and output ports have the same size.
         For reducing function, ie. from n_array to scalar, output ports's index is set to first (if ``closed`` = `left`), last (if ``closed`` = `right`), or middle (if ``closed`` = `center`)
+        For expanding functions, ie. from n_array to nk_array, the output port provides a DataArray with dimensions ('time', 'space', 'feature').
 
-
-    .. todo::
-        Allow expanding functions such as n_array to nk_array (with XArray usage)
+        Functions accepting an ``axis`` argument receive it when vectorized, with the same meaning as above.
+        Other vectorized functions receive the whole array and are responsible for the orientation:
+        universal functions must return an array of the same shape, reducing functions a 1-D array, and expanding functions a 3-D array of shape (time, space, feature).
 
     Example:
 
@@ -102,8 +108,11 @@ class ApplyMethod(Node):
         axis=0,
         closed="right",
         func=None,
+        vectorized=None,
         **kwargs,
     ):
+        if apply_mode not in ("universal", "reduce", "expand"):
+            raise ValueError(f"Invalid apply mode: {apply_mode}")
         self._axis = axis
         self._closed = closed
         self._kwargs = kwargs
@@ -126,26 +135,100 @@ class ApplyMethod(Node):
                 )
 
             if not callable(self._func):
-                raise ValueError(f"Could not call the method {self._methode_name}")
-
-            self._kwargs.update({"raw": True, "axis": axis})
-            if self._apply_mode == "reduce":
-                self._kwargs["result_type"] = "reduce"
+                raise ValueError(f"Could not call the method {method}")
+
+        try:
+            self._axis_aware = "axis" in signature(self._func).parameters
+        except (TypeError, ValueError):
+            self._axis_aware = False
+        # Automatic vectorization falls back to the generic path if the shape of the
+        # result does not match the apply mode, such as a reducer in universal mode
+        self._auto = vectorized is None
+        if vectorized is None:
+            vectorized = self._axis_aware or (
+                apply_mode == "universal" and isinstance(self._func, np.ufunc)
+            )
+        self._vectorized = vectorized
 
     def update(self):
         if not self.i.ready():
             return
 
         self.o.meta = self.i.meta
-        self.o.data = self.i.data.apply(func=self._func, **self._kwargs)
+        data = self.i.data
+        values = self._vectorize(data) if self._vectorized else None
+        if self._apply_mode == "expand":
+            self.o.data = self._expand(data, values)
+            return
+        if values is not None:
+            if self._apply_mode == "universal":
+                self.o.data = pd.DataFrame(
+                    values, index=data.index, columns=data.columns
+                )
+            else:
+                index = data.columns if self._axis == 0 else data.index
+                self.o.data = pd.Series(values, index=index)
+        else:
+            self.o.data = data.apply(
+                func=self._func,
+                raw=True,
+                axis=self._axis,
+                result_type="reduce" if self._apply_mode == "reduce" else None,
+                **self._kwargs,
+            )
         if self._apply_mode == "reduce":
             if self._axis == 0:
                 if self._closed == "right":
-                    index_to_keep = self.i.data.index[-1]
+                    index_to_keep = data.index[-1]
                 elif self._closed == "left":
-                    index_to_keep = self.i.data.index[0]
+                    index_to_keep = data.index[0]
                 else:  # self._closed == 'middle':
-                    index_to_keep = self.i.data.index[len(self.i.data) // 2]
+                    index_to_keep = data.index[len(data) // 2]
                 self.o.data = pd.DataFrame(self.o.data, columns=[index_to_keep]).T
             else:  # self._axis == 1:
                 self.o.data = self.o.data.to_frame()
+
+    def _vectorize(self, data):
+        if self._axis_aware:
+            values = self._func(data.values, axis=self._axis, **self._kwargs)
+        else:
+            values = self._func(data.values, **self._kwargs)
+        values = np.asarray(values)
+        if self._apply_mode == "universal":
+            valid = values.shape == data.shape
+        elif self._apply_mode == "reduce":
+            valid = values.shape == (data.shape[1 - self._axis],)
+        else:  # self._apply_mode == "expand"
+            valid = values.ndim == 3 and values.shape[:2] == data.shape
+        if valid:
+            return values
+        if not self._auto:
+            raise ValueError(
+                f"The vectorized function returned an array of shape {values.shape}, "
+                f"which does not match the '{self._apply_mode}' apply mode"
+            )
+        self.logger.debug(
+            "Result of shape %s does not match the '%s' apply mode, "
+            "falling back to DataFrame.apply",
+            values.shape,
+            self._apply_mode,
+        )
+        self._vectorized = False
+        return None
+
+    def _expand(self, data, values=None):
+        if values is None:
+            if self._axis == 0:
+                values = np.stack(
+                    [self._func(column, **self._kwargs) for column in data.values.T],
+                    axis=1,
+                )
+            else:  # self._axis == 1
+                values = np.stack(
+                    [self._func(row, **self._kwargs) for row in data.values], axis=0
+                )
+        return xr.DataArray(
+            values,
+            coords=[data.index, data.columns, np.arange(values.shape[2])],
+            dims=("time", "space", "feature"),
+        )
@@ -16,9 +16,9 @@ class Display(Node):
 
     def update(self):
         if self.i.ready() and self._data:
-            self.logger.debug("\n %s" % self.i.data)
+            self.logger.debug("\n %s", self.i.data)
         if self.i.meta and self._meta:
-            self.logger.debug("\n %s" % self.i.meta)
+            self.logger.debug("\n %s", self.i.meta)
 
 
 class Dump(Node):
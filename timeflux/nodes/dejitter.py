@@ -2,6 +2,7 @@
 
 import numpy as np
 import pandas as pd
+from functools import partial
 from time import time
 from timeflux.core.node import Node
 from timeflux.core.exceptions import WorkerInterrupt
@@ -97,7 +98,10 @@ class Interpolate(Node):
     This nodes continuously buffers a small amount of data to allow for interpolating
     missing samples.
     The output data is resampled at a fixed rate.
-    The interpolation is performed by Pandas methods.
+    The interpolation is evaluated directly on the new target timestamps, using NumPy
+    for the linear method and SciPy for the others. Only the last ``n_max`` samples
+    are kept between updates, so that the cost per update only depends on the number
+    of new samples, while the interpolation remains continuous across chunks.
 
     Attributes:
        i (Port): Default input, expects DataFrame and meta.
@@ -105,7 +109,7 @@ class Interpolate(Node):
 
     Args:
         rate (float|None): (optional) nominal sampling frequency of the data. If None, the rate will be obtained from the meta of the input port.
-        method: interpolation method. See the pandas.DataFrame.interpolate documentation.
+        method: interpolation method: `linear`, `nearest`, `zero`, `slinear`, `quadratic`, `cubic`, `previous`, `next`, `pchip` or `akima`.
         n_min: minimum number of samples to perform the interpolation.
         n_max: number of samples to keep in the buffer.
 
@@ -115,21 +119,52 @@ class Interpolate(Node):
         computation duration.
     """
 
+    _methods = (
+        "linear",
+        "nearest",
+        "zero",
+        "slinear",
+        "quadratic",
+        "cubic",
+        "previous",
+        "next",
+        "pchip",
+        "akima",
+    )
+
     def __init__(self, rate=None, method="cubic", n_min=3, n_max=10):
+        if method not in self._methods:
+            raise ValueError(f"Unsupported interpolation method: {method}")
         self._rate = rate
         if self._rate is not None:
             self._set_timedelta()
-
-        self._method = method  # {‘linear’, ‘time’, ‘index’, ‘values’, ‘nearest’, ‘zero’, ‘slinear’, ‘quadratic’, ‘cubic’, ‘barycentric’, ‘krogh’, ‘polynomial’, ‘spline’, ‘piecewise_polynomial’, ‘from_derivatives’, ‘pchip’, ‘akima’}
+        self._method = method
+        self._interpolator = None
+        if method != "linear":
+            self._interpolator = self._resolve(method)
         self._n_min = n_min
         self._n_max = n_max
-        self._last_datetime = None
+        self._next = None  # next target timestamp, in nanoseconds
+        self._times = None  # buffered timestamps, in nanoseconds
+        self._values = None  # buffered values
 
     def _set_timedelta(self):
-        self._timespan = 1 / self._rate
-        self._timedelta = pd.to_timedelta(
-            self._timespan, "s"
-        )  # sampling period of the interpolated signal
+        self._timedelta = int(round(1e9 / self._rate))  # sampling period, in ns
+
+    @staticmethod
+    def _resolve(method):
+        # return a factory of interpolators, given the timestamps and the values
+        from scipy.interpolate import (  # Slow import
+            interp1d,
+            PchipInterpolator,
+            Akima1DInterpolator,
+        )
+
+        if method == "pchip":
+            return partial(PchipInterpolator, axis=0)
+        if method == "akima":
+            return partial(Akima1DInterpolator, axis=0)
+        return partial(interp1d, kind=method, axis=0, assume_sorted=True)
 
     def update(self):
         self.o.meta = self.i.meta
@@ -143,63 +178,82 @@ class Interpolate(Node):
         if self.i.data is None or self.i.data.empty:
             return
 
-        # initialize the first datetime index.
-        if self._last_datetime is None:
-            self._last_datetime = self.i.data.index.round(str(self._timespan) + "S")[0]
-            self._buffer = pd.DataFrame()
-            self._times = np.arange(
-                self._last_datetime,
-                self.i.data.index[-1],
-                self._timedelta,
-                dtype="datetime64[us]",
-            )
-        else:
-            self._times = np.arange(
-                self._last_datetime + self._timedelta,
-                self.i.data.index[-1],
-                self._timedelta,
-                dtype="datetime64[us]",
-            )
+        times = self.i.data.index.values.astype("datetime64[ns]").astype(np.int64)
+        values = self.i.data.values.astype(np.float64)
+
+        # initialize the first target timestamp
+        if self._next is None:
+            self._next = (times[0] + self._timedelta // 2) // self._timedelta
+            self._next *= self._timedelta
+            self._times = np.empty(0, dtype=np.int64)
+            self._values = np.empty((0, values.shape[1]))
+
+        # drop samples that are not strictly posterior to all the previous ones
+        last = self._times[-1] if len(self._times) else np.iinfo(np.int64).min
+        previous = np.maximum.accumulate(np.concatenate(([last], times)))[:-1]
+        keep = times > previous
+        if not keep.all():
+            self.logger.warning("Data index should be strictly monotonic")
+            times = times[keep]
+            values = values[keep]
+
+        # append to the buffer
+        self._times = np.concatenate((self._times, times))
+        self._values = np.concatenate((self._values, values))
 
         # interpolate
         self._interpolate()
 
-    def _drop_duplicates(self, data):
-        return data.loc[~data.index.duplicated(keep="first")]
-
-    def _make_monotonic(self, data):
-        return data[
-            np.diff(pd.Index([self._last_datetime]).append(data.index))
-            / np.timedelta64(1, "s")
-            > 0
-        ]
-
     def _interpolate(self):
-        # interpolate current chunk
-        self._buffer = pd.concat(
-            [self._buffer, self.i.data], sort=True
-        )  # append last sample be able to interpolate
-
-        if not self._buffer.index.is_monotonic_increasing:
-            self.logger.warning("Data index should be strictly monotonic")
-            self._buffer = self._make_monotonic(self._buffer)
+        valid = ~np.isnan(self._values)
+        if not (valid.sum(axis=0) > self._n_min).all():
+            # not enough samples yet, but the buffer must stay bounded
+            self._trim()
+            return
 
-        data_to_interpolate = pd.concat(
-            [self._buffer, pd.DataFrame(index=self._times)], sort=True
-        )
-        data_to_interpolate = self._drop_duplicates(data_to_interpolate).sort_index()
-
-        if (self._buffer.notnull().sum(axis=0) > self._n_min).all():
-            self.o.data = (
-                data_to_interpolate.interpolate(axis=0, method=self._method)
-                .reindex(self._times)
-                .loc[self._last_datetime :]
-                .dropna(axis=0, how="any")
+        # target timestamps, within the buffered range
+        targets = np.arange(self._next, self._times[-1], self._timedelta)
+        targets = targets[targets >= self._times[0]]
+        if len(targets) > 0:
+            if valid.all():
+                values = self._evaluate(self._times, self._values, targets)
+            else:
+                # missing values are interpolated column by column
+                values = np.empty((len(targets), self._values.shape[1]))
+                for column in range(self._values.shape[1]):
+                    mask = valid[:, column]
+                    values[:, column] = self._evaluate(
+                        self._times[mask], self._values[mask, column], targets
+                    )
+            self.o.data = pd.DataFrame(
+                values,
+                index=pd.DatetimeIndex(targets.astype("datetime64[ns]")),
+                columns=self.i.data.columns,
             )
-
-            if not self.o.data.empty:
-                self._last_datetime = self.o.data.index[-1]
-                self._buffer = self._buffer.tail(self._n_max)
+            self._next = targets[-1] + self._timedelta
+
+        self._trim()
+
+    def _trim(self):
+        # keep the last samples
+        self._times = self._times[-self._n_max :]
+        self._values = self._values[-self._n_max :]
+
+    def _evaluate(self, times, values, targets):
+        if self._method == "linear":
+            # vectorized linear interpolation, exact on the samples
+            start = np.searchsorted(times, targets, side="right") - 1
+            start = np.clip(start, 0, len(times) - 2)
+            weights = (targets - times[start]) / (times[start + 1] - times[start])
+            if values.ndim > 1:
+                weights = weights[:, np.newaxis]
+            return values[start] + weights * (values[start + 1] - values[start])
+        # rescale the timestamps to improve the conditioning of the problem
+        origin = times[0]
+        times = (times - origin) / self._timedelta
+        targets = (targets - origin) / self._timedelta
+        interpolator = self._interpolator(times, values)
+        return interpolator(targets)
 
 
 class Space(Node):
@@ -228,3 +282,105 @@ class Space(Node):
                 start, self._stop, len(self.o.data), False, dtype="datetime64[us]"
             )
             self.o.data.index = indices
+
+
+class Drift(Node):
+    """Correct clock drift with an online linear regression of timestamps.
+
+    Devices rarely sample at exactly their nominal rate, and their clock drifts
+    relatively to the host clock. This node continuously fits the arrival timestamps
+    against the sample count with exponentially weighted least squares, and replaces
+    the timestamps with their smoothed, drift-corrected estimation. Only a handful of
+    running sums are kept between updates, so the cost does not grow with the
+    duration of the recording.
+
+    Attributes:
+       i (Port): Default input, expects DataFrame and meta.
+       o (Port): Default output, provides DataFrame and meta.
+
+    Args:
+        rate (float|None): Nominal sampling rate. If `None`, the value will be read from the meta data.
+        window (float): The effective memory of the regression, in seconds.
+
+    Notes:
+        This node assumes that no samples were lost. The estimated rate and the drift
+        relative to the nominal rate, in parts per million, are provided in the
+        ``drift`` meta.
+    """
+
+    def __init__(self, rate=None, window=600):
+        self._rate = rate
+        self._window = window
+        self._decay = None
+        self._origin = None  # timestamp of the regression origin, in ns
+        self._next = 0  # sample count of the next sample, relative to the origin
+        self._sums = np.zeros(5)  # weight, x, y, x*x, x*y
+        self._last = None  # last emitted timestamp, in ns
+
+    def update(self):
+        if not self.i.ready():
+            return
+
+        if self._rate is None:
+            self._rate = self.i.meta.get("rate")
+            if self._rate is None:
+                self.logger.error("The rate parameter is required")
+                raise WorkerInterrupt
+
+        times = self.i.data.index.values.astype("datetime64[ns]").astype(np.int64)
+        if self._origin is None:
+            self._origin = times[0]
+            self._decay = 1 - 1 / max(self._window * self._rate, 1)
+
+        # Accumulate the exponentially weighted sums
+        count = len(times)
+        x = self._next + np.arange(count, dtype=np.float64)
+        y = (times - self._origin) / 1e9
+        weights = self._decay ** np.arange(count - 1, -1, -1, dtype=np.float64)
+        self._sums *= self._decay**count
+        self._sums += [
+            weights.sum(),
+            weights @ x,
+            weights @ y,
+            weights @ (x * x),
+            weights @ (x * y),
+        ]
+
+        # Fit, falling back to the nominal rate until the samples span about a second
+        s, sx, sy, sxx, sxy = self._sums
+        determinant = s * sxx - sx * sx
+        slope = 1 / self._rate
+        if determinant > (s * self._rate) ** 2:
+            fitted = (s * sxy - sx * sy) / determinant
+            if fitted > 0:
+                slope = fitted
+        intercept = (sy - slope * sx) / s
+
+        # Smoothed timestamps
+        stamps = self._origin + np.round((intercept + slope * x) * 1e9).astype(np.int64)
+        if self._last is not None and stamps[0] <= self._last:
+            stamps += self._last - stamps[0] + int(round(slope * 1e9))
+        self._last = stamps[-1]
+
+        # Move the origin to the last sample to preserve numerical precision
+        dx = x[-1]
+        dy = (times[-1] - self._origin) / 1e9
+        self._sums = np.array(
+            [
+                s,
+                sx - dx * s,
+                sy - dy * s,
+                sxx - 2 * dx * sx + dx * dx * s,
+                sxy - dx * sy - dy * sx + dx * dy * s,
+            ]
+        )
+        self._origin = times[-1]
+        self._next = 1
+
+        self.o = self.i
+        self.o.data.index = pd.DatetimeIndex(stamps.astype("datetime64[ns]"))
+        self.o.meta["rate"] = self._rate
+        self.o.meta["drift"] = {
+            "rate": 1 / slope,
+            "ppm": (1 / (slope * self._rate) - 1) * 1e6,
+        }
@@ -123,6 +123,12 @@ class Samples(Node):
                 low = len(self._buffer) - self._length_buffer
                 self._buffer = self._buffer[low:]
 
+    def buffers(self):
+        return {
+            "buffer": 0 if self._buffer is None else len(self._buffer),
+            "epochs": len(self._epochs),
+        }
+
 
 class Epoch(Node):
     """Event-triggered epoching.
@@ -223,6 +229,12 @@ class Epoch(Node):
                 del self._epochs[:complete]  # Unqueue
                 self.o = self.o_0  # Bind default output to the first epoch
 
+    def buffers(self):
+        return {
+            "buffer": 0 if self._buffer is None else len(self._buffer),
+            "epochs": len(self._epochs),
+        }
+
 
 class Trim(Node):
     """Trim data so epochs are of equal length.
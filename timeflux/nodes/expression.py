@@ -1,8 +1,136 @@
+import ast
 import numpy as np
 import pandas as pd
 from timeflux.core.io import Port
 from timeflux.core.node import Node
 
+try:
+    import numexpr
+except ModuleNotFoundError:
+    numexpr = None
+
+# Syntax that numexpr evaluates exactly like pandas
+_NUMEXPR_NODES = (
+    ast.BinOp,
+    ast.UnaryOp,
+    ast.Compare,
+    ast.Call,
+    ast.Name,
+    ast.Constant,
+    ast.Load,
+    ast.Add,
+    ast.Sub,
+    ast.Mult,
+    ast.Div,
+    ast.Pow,
+    ast.Mod,
+    ast.BitAnd,
+    ast.BitOr,
+    ast.USub,
+    ast.UAdd,
+    ast.Invert,
+    ast.Eq,
+    ast.NotEq,
+    ast.Lt,
+    ast.LtE,
+    ast.Gt,
+    ast.GtE,
+)
+_NUMEXPR_FUNCTIONS = (
+    "sin",
+    "cos",
+    "tan",
+    "arcsin",
+    "arccos",
+    "arctan",
+    "arctan2",
+    "sinh",
+    "cosh",
+    "tanh",
+    "arcsinh",
+    "arccosh",
+    "arctanh",
+    "log",
+    "log10",
+    "log1p",
+    "exp",
+    "expm1",
+    "sqrt",
+    "abs",
+)
+
+
+def _parse(expr):
+    """Parse an expression for the numexpr engine.
+
+    Args:
+        expr (str): The expression, optionally assigned to a single target.
+
+    Returns:
+        tuple: The assignment target (or `None`), the source of the right-hand side
+        and its variable names, or `None` if the expression cannot be safely evaluated
+        by numexpr.
+
+    """
+    try:
+        module = ast.parse(expr.strip())
+    except SyntaxError:
+        return None
+    if len(module.body) != 1:
+        return None
+    statement = module.body[0]
+    target = None
+    if isinstance(statement, ast.Assign):
+        if len(statement.targets) != 1 or not isinstance(
+            statement.targets[0], ast.Name
+        ):
+            return None
+        target = statement.targets[0].id
+        value = statement.value
+    elif isinstance(statement, ast.Expr):
+        value = statement.value
+    else:
+        return None
+    names = set()
+    for node in ast.walk(value):
+        if not isinstance(node, _NUMEXPR_NODES):
+            return None
+        if isinstance(node, ast.Compare):
+            # pandas binds & and | looser than comparisons, Python does not
+            if len(node.ops) > 1:
+                return None
+            for operand in (node.left, *node.comparators):
+                if isinstance(operand, ast.BinOp) and isinstance(
+                    operand.op, (ast.BitAnd, ast.BitOr)
+                ):
+                    return None
+        elif isinstance(node, ast.Call):
+            if (
+                not isinstance(node.func, ast.Name)
+                or node.func.id not in _NUMEXPR_FUNCTIONS
+                or node.keywords
+            ):
+                return None
+        elif isinstance(node, ast.Name) and node.id not in _NUMEXPR_FUNCTIONS:
+            names.add(node.id)
+        elif isinstance(node, ast.Constant) and not isinstance(
+            node.value, (int, float, bool)
+        ):
+            return None
+    source = ast.get_source_segment(expr.strip(), value)
+    try:
+        # Compile and cache the expression
+        numexpr.evaluate(source, local_dict={name: np.ones(1) for name in names})
+    except Exception:
+        return None
+    return target, source, names
+
+
+def _is_numeric(data):
+    return isinstance(data, pd.DataFrame) and all(
+        dtype.kind in "biuf" for dtype in data.dtypes
+    )
+
 
 class Expression(Node):
     """Evaluate a Python expression as a string.
@@ -16,6 +144,11 @@ class Expression(Node):
     (python engine only) along with the following boolean operations:
     | (or), & (and), and ~ (not).
 
+    The expression is parsed once. When numexpr is installed, and when the
+    operands are numeric and share the same index and columns, the expression is
+    evaluated directly on the underlying arrays. Otherwise, it is delegated to
+    pandas, which takes care of the index alignment. The chosen engine is logged.
+
 
     Attributes:
         i (Port): default data input, expects DataFrame.
@@ -107,6 +240,17 @@ class Expression(Node):
         self._kwargs = kwargs
         self._expr = expr
         self._expr_ports = None
+        self._parsed = None
+        if (
+            numexpr is not None
+            and set(kwargs) <= {"engine"}
+            and kwargs.get("engine") in (None, "numexpr")
+        ):
+            self._parsed = _parse(expr)
+            if self._parsed and self._parsed[0] and eval_on == "ports":
+                self._parsed = None
+        self._engine = None
+        self._set_engine("numexpr" if self._parsed else "pandas")
 
     def update(self):
         self.o.meta = self.i.meta
@@ -115,7 +259,11 @@ class Expression(Node):
                 self._expr_ports = [
                     port_name
                     for port_name, _, _ in self.iterate("i_*")
-                    if port_name in self._expr
+                    if (
+                        port_name in self._parsed[2]
+                        if self._parsed
+                        else port_name in self._expr
+                    )
                 ]
             _local_dict = {
                 port_name: self.ports.get(port_name).data
@@ -123,12 +271,50 @@ class Expression(Node):
             }
             if np.any([data is None or data.empty for data in _local_dict.values()]):
                 return
-            self.o.data = pd.eval(
-                expr=self._expr, local_dict=_local_dict, **self._kwargs
-            )
+            self.o.data = self._eval_ports(_local_dict)
             for port_name in self._expr_ports:
                 self.o.meta.update(self.ports.get(port_name).meta)
         elif self._eval_on == "columns":
             self.o = self.i
             if self.i.data is not None and not self.i.data.empty:
-                self.o.data = self.i.data.eval(expr=self._expr, **self._kwargs)
+                self.o.data = self._eval_columns(self.i.data)
+
+    def _eval_ports(self, local_dict):
+        frames = list(local_dict.values())
+        first = frames[0]
+        if (
+            self._parsed
+            and set(local_dict) == self._parsed[2]
+            and all(_is_numeric(frame) for frame in frames)
+            and all(
+                frame.index.equals(first.index) and frame.columns.equals(first.columns)
+                for frame in frames[1:]
+            )
+        ):
+            self._set_engine("numexpr")
+            arrays = {name: frame.values for name, frame in local_dict.items()}
+            values = numexpr.evaluate(self._parsed[1], local_dict=arrays)
+            return pd.DataFrame(values, index=first.index, columns=first.columns)
+        self._set_engine("pandas")
+        return pd.eval(expr=self._expr, local_dict=local_dict, **self._kwargs)
+
+    def _eval_columns(self, data):
+        if self._parsed and self._parsed[2] <= set(data.columns):
+            target, source, names = self._parsed
+            if _is_numeric(data[list(names)]):
+                self._set_engine("numexpr")
+                arrays = {name: data[name].values for name in names}
+                values = numexpr.evaluate(source, local_dict=arrays)
+                if target is None:
+                    return pd.Series(values, index=data.index)
+                data = data.copy()
+                data[target] = values
+                return data
+        self._set_engine("pandas")
+        return data.eval(expr=self._expr, **self._kwargs)
+
+    def _set_engine(self, engine):
+        if engine != self._engine:
+            log = self.logger.info if self._engine is None else self.logger.debug
+            self._engine = engine
+            log(f"Evaluating '{self._expr}' with {engine}")
@@ -1,35 +1,45 @@
 """Gate node that resume or stop the streaming data """
 
-from itertools import cycle
-
-from timeflux.core.node import Node
+import numpy as np
+import pandas as pd
 import xarray as xr
+from timeflux.core.node import Node
 
 
 class Gate(Node):
     """Data-gate based on event triggers.
 
     This node cuts off or puts through data depending on event triggers
-    It has 3 operating mode/status:
-    - silent: the node waits for an opening trigger in the events and returns nothing
-    - opened: the node waits for a closing trigger in the events and free pass the data
-    - closed: the node has just received a closing trigger, so free pass the data and resets its state.
+    It has 2 operating modes:
+    - closed: the node waits for an opening trigger in the events and returns nothing
+    - open: the node waits for a closing trigger in the events and free pass the data
 
+    When the gate closes, the last chunk of the segment is released with the
+    `gate_status` meta set to `closed` and the opening and closing times in the
+    `gate_times` meta.
 
-    It continuously iterates over events data to update its operating mode.
+    Events are matched all at once, so that several segments can be opened and closed
+    within a single chunk. Each completed segment is released separately, one per
+    update, so that downstream accumulators can process them one by one. Pending
+    segments are released while the gate is closed.
+
+    Every input port other than `i_events` is gated, and forwarded to the output port
+    with the same suffix.
 
     Attributes:
         i (Port): Default data input, expects DataFrame or or XArray.
-
+        i_* (Port): Dynamic data inputs, expect DataFrame or XArray.
         i_events (Port): Event input, expects DataFrame.
         o (Port): Default output, provides DataFrame or XArray and meta.
+        o_* (Port): Dynamic outputs, provide DataFrame or XArray and meta.
 
     Args:
         event_opens (string): The marker name on which the gate open.s
         event_closes (string): The marker name on which the the gate closes.
         event_label (string): The column to match for event_trigger.
-
-    Todo: allow for multiple input ports.
+        truncate (bool): If `True`, only the data between the opening and the closing
+            times are released. Otherwise, each segment receives every chunk it
+            overlaps, entirely.
 
     """
 
@@ -38,62 +48,119 @@ class Gate(Node):
         self._event_opens = event_opens
         self._event_closes = event_closes
         self._truncate = truncate
-        self._reset()
+        self._opened = None  # Opening time of the current segment
+        self._segments = []  # Segments waiting to be released
+        self._status = "closed"
+        self._trigger = event_opens
 
     def update(self):
-        # Iter over events to match the opening/closing trigger.
-
-        if self.i_events.ready():
-            for index, row in self.i_events.data.iterrows():
-                if row[self._event_label] == self._trigger:
-                    self.logger.debug(f"Gate received {self._trigger}.")
-                    self._next()
-                    # keep track of opening/closing of the gate
-                    self._times.append(index)
-        self._update()
-
-    def _update(self):
-        # if the gate is either open or closing, truncate and forward the data,
-        # if the gate is closing, reset status and trigger iterator,
-        # else (gate is closed), return
-
-        if self._status == "open":
-            self.o = self.i
-            self.o.meta["gate_status"] = self._status
-            if self._truncate and self.o.ready():
-                if isinstance(self.o.data, xr.DataArray):
-                    self.o.data = self.o.data.sel(
-                        {"time": slice(self._times[0], self.o.data.time[-1])}
-                    )
-                else:  # isinstance(self.o.data,pd.DataFrame)
-                    # truncate the data after opening time
-                    self.o.data = self.o.data[self._times[0] :]
-        elif self._status == "closing":
-            self.o = self.i
-            self.o.meta.update({"gate_status": "closed", "gate_times": self._times})
-            # truncate the data between opening and closing times
-            if self._truncate and self.o.ready():
-                if isinstance(self.o.data, xr.DataArray):
-                    self.o.data = self.o.data.sel(
-                        {"time": slice(self._times[0], self._times[1])}
-                    )
-                else:  # isinstance(self.o.data,pd.DataFrame)
-                    self.o.data = self.o.data[self._times[0] : self._times[1]]
-            self._reset()
-        else:  # self._status == 'closed'
-            self.o.data = None
-            self.o.meta = {"gate_status": "closed"}
-
-    def _next(self):
-        # iterates trigger (expected event) and status (defining the mode of the node)
-        self._status = next(self._status_iterator)
-        self._trigger = next(self._trigger_iterator)
-        self.logger.debug(f"Gate is {self._status}.")
-
-    def _reset(self):
-        # Reset iterator states
-        self._times = []
-        self._trigger_iterator = cycle([self._event_opens, self._event_closes])
-        self._status_iterator = cycle(["closed", "open", "closing"])
-        # initialize trigger and status
-        self._next()
+        ports = [
+            (suffix, port)
+            for _, suffix, port in self.iterate("i*")
+            if suffix != "_events"
+        ]
+
+        # Pair the opening and closing times
+        segments = []
+        for time in self._boundaries():
+            if self._opened is None:
+                self._opened = time
+            else:
+                segments.append((self._opened, time))
+                self._opened = None
+        if self._opened is not None:
+            segments.append((self._opened, None))
+        status = "closed" if self._opened is None else "open"
+        if status != self._status:
+            self._status = status
+            self.logger.debug(f"Gate is {self._status}.")
+        self._trigger = self._event_opens if status == "closed" else self._event_closes
+
+        # Cut the data
+        for start, stop in segments:
+            if self._segments and self._segments[-1]["times"] == [start]:
+                segment = self._segments[-1]
+            else:
+                segment = {"times": [start], "data": {}, "meta": {}}
+                self._segments.append(segment)
+            for suffix, port in ports:
+                if port.ready():
+                    data = self._cut(port.data, start, stop)
+                    segment["data"].setdefault(suffix, []).append(data)
+                segment["meta"][suffix] = port.meta
+            if stop is not None:
+                segment["times"].append(stop)
+
+        self._release([suffix for suffix, _ in ports])
+
+    def buffers(self):
+        return {"segments": len(self._segments)}
+
+    def _boundaries(self):
+        # Find the opening and closing times, ignoring repeated triggers
+        if not self.i_events.ready():
+            return []
+        events = self.i_events.data
+        labels = events[self._event_label].values
+        if self._event_opens == self._event_closes:
+            # Toggle marker: each occurrence alternately opens and closes the gate
+            return list(events.index[labels == self._event_opens])
+        codes = np.select(
+            [labels == self._event_opens, labels == self._event_closes], [1, 2], 0
+        )
+        matches = codes > 0
+        codes = codes[matches]
+        if len(codes) == 0:
+            return []
+        previous = 2 if self._opened is None else 1
+        accepted = np.diff(codes, prepend=previous) != 0
+        return list(events.index[matches][accepted])
+
+    def _cut(self, data, start, stop):
+        # Select the rows between the opening and the closing times
+        if not self._truncate:
+            return data
+        if isinstance(data, xr.DataArray):
+            times = data.time.values
+        else:  # isinstance(data, pd.DataFrame)
+            times = data.index.values
+        first = np.searchsorted(times, pd.Timestamp(start).to_datetime64(), "left")
+        last = len(times)
+        if stop is not None:
+            last = np.searchsorted(times, pd.Timestamp(stop).to_datetime64(), "right")
+        if isinstance(data, xr.DataArray):
+            return data.isel({"time": slice(first, last)})
+        return data.iloc[first:last]
+
+    def _release(self, suffixes):
+        # Release the oldest segment, if any
+        if not self._segments:
+            for suffix in suffixes:
+                port = getattr(self, "o" + suffix)
+                port.data = None
+                port.meta = {"gate_status": "closed"}
+            return
+        segment = self._segments[0]
+        closed = len(segment["times"]) == 2
+        if closed:
+            self._segments.pop(0)
+        for suffix in set(suffixes) | set(segment["meta"]):
+            port = getattr(self, "o" + suffix)
+            port.data = self._concat(segment["data"].pop(suffix, []))
+            port.meta = dict(segment["meta"].get(suffix, {}))
+            if closed:
+                port.meta.update(
+                    {"gate_status": "closed", "gate_times": segment["times"]}
+                )
+            else:
+                port.meta["gate_status"] = "open"
+
+    @staticmethod
+    def _concat(chunks):
+        if not chunks:
+            return None
+        if len(chunks) == 1:
+            return chunks[0]
+        if isinstance(chunks[0], xr.DataArray):
+            return xr.concat(chunks, "time")
+        return pd.concat(chunks)
@@ -1,12 +1,27 @@
 """timeflux.nodes.hdf5: HDF5 nodes"""
 
+import numpy as np
 import pandas as pd
+import tables
 import timeflux.helpers.clock as clock
 import sys
 import os
 import time
+from copy import deepcopy
+from queue import Queue, Full
+from threading import Thread
 from timeflux.core.exceptions import WorkerInterrupt, WorkerLoadError
 from timeflux.core.node import Node
+from timeflux.core.registry import Registry
+from timeflux.helpers.hdf5 import (
+    PROFILES,
+    is_array,
+    is_numeric,
+    append_array,
+    select_array,
+    read_manifest,
+    write_manifest,
+)
 
 # Ignore the "object name is not a valid Python identifier" message
 import warnings
@@ -18,14 +33,24 @@ warnings.simplefilter("ignore", NaturalNameWarning)
 class Replay(Node):
     """Replay a HDF5 file."""
 
-    def __init__(self, filename, keys, speed=1, timespan=None, resync=True, start=0):
+    def __init__(
+        self,
+        filename,
+        keys,
+        speed=1,
+        timespan=None,
+        resync=True,
+        start=0,
+        offline=False,
+    ):
         """
         Initialize.
 
         Parameters
         ----------
         filename : string
-            The path to the HDF5 file.
+            The path to the HDF5 file, or to the JSON manifest of a rotated
+            recording, in which case the segments are streamed seamlessly.
         keys: list
             The list of keys to replay.
         speed: float
@@ -41,66 +66,66 @@ class Replay(Node):
         start: float
             Start directly at the given time offset, in seconds
             Default: 0
+        offline: boolean
+            If True, replay as fast as possible. The wall clock is replaced by a
+            virtual clock that starts at the first recorded timestamp and advances
+            by `timespan` (or by the graph period if `timespan` is not set) on
+            each cycle. The scheduler never sleeps and the outputs are strictly
+            reproducible. The `speed` and `resync` parameters are ignored.
+            Default: False
         """
 
-        # Load store
-        try:
-            self._store = pd.HDFStore(self._find_path(filename), mode="r")
-        except IOError as e:
-            raise WorkerInterrupt(e)
+        # The virtual clock needs a fixed step
+        if offline and not timespan:
+            if not Registry.rate:
+                raise ValueError(
+                    "Offline mode requires either a timespan or a non-zero graph rate."
+                )
+            timespan = 1 / Registry.rate
+
+        # Load the list of files
+        path = self._find_path(filename)
+        if path.endswith(".json"):
+            segments = read_manifest(path)
+        else:
+            segments = [{"filename": path, "start": None, "stop": None}]
 
         # Init
+        self._keys = keys
         self._sources = {}
+        self._segments = []
         self._start = pd.Timestamp.max
         self._stop = pd.Timestamp.min
         self._speed = speed
         self._timespan = None if not timespan else pd.Timedelta(f"{timespan}s")
         self._resync = resync
+        self._offline = False
 
-        for key in keys:
-            try:
-                # Check format
-                if not self._store.get_storer(key).is_table:
-                    self.logger.warning("%s: Fixed format. Will be skipped.", key)
-                    continue
-                # Get first index
-                first = self._store.select(key, start=0, stop=1).index[0]
-                # Get last index
-                nrows = self._store.get_storer(key).nrows
-                last = self._store.select(key, start=nrows - 1, stop=nrows).index[0]
-                # Check index type
-                if type(first) != pd.Timestamp:
-                    self.logger.warning("%s: Invalid index. Will be skipped.", key)
-                    continue
-                # Find lowest and highest indices across stores
-                if first < self._start:
-                    self._start = first
-                if last > self._stop:
-                    self._stop = last
-                # Extract meta
-                if self._store.get_node(key)._v_attrs.__contains__("meta"):
-                    meta = self._store.get_node(key)._v_attrs["meta"]
-                else:
-                    meta = {}
-                # Set output port name, port will be created dynamically
-                name = "o" + key.replace("/", "_")
-                # Update sources
-                self._sources[key] = {
-                    "start": first,
-                    "stop": last,
-                    "nrows": nrows,
-                    "name": name,
-                    "meta": meta,
-                }
-            except KeyError:
-                self.logger.warning("%s: Key not found.", key)
-
-        # Current time
-        now = clock.now()
+        for index, segment in enumerate(segments):
+            segment["store"] = None
+            segment["sources"] = None
+            self._segments.append(segment)
+            if index == 0 or segment["start"] is None:
+                # Single files are opened right away, other segments when needed
+                self._open(segment)
+            if segment["start"] < self._start:
+                self._start = segment["start"]
+            if segment["stop"] > self._stop:
+                self._stop = segment["stop"]
 
         # Starting timestamp
         self._start += pd.Timedelta(f"{start}s")
 
+        # Drive a virtual clock
+        if offline:
+            clock.set_virtual(self._start.to_datetime64(), timespan)
+            self._timespan = pd.Timedelta(int(round(timespan * 1e6)), "us")
+            self._resync = False
+        self._offline = offline
+
+        # Current time
+        now = clock.now()
+
         # Time offset
         self._offset = pd.Timestamp(now) - self._start
 
@@ -124,22 +149,111 @@ class Replay(Node):
             max = min + ellapsed * self._speed
             self._last = now
 
-        for key, source in self._sources.items():
-            # Select data
-            data = self._store.select(key, "index >= min & index < max")
+        # Select data across segments
+        chunks = {}
+        for segment in self._segments:
+            if segment["stop"] < min:
+                self._close(segment)
+                continue
+            if segment["start"] >= max:
+                break
+            self._open(segment)
+            for key, source in segment["sources"].items():
+                data = self._select(segment["store"], key, source, min, max)
+                chunks.setdefault(key, []).append(data)
+
+        for key, data in chunks.items():
+            data = data[0] if len(data) == 1 else pd.concat(data)
 
             # Add offset
             if self._resync:
                 data.index += self._offset
 
             # Update port
+            source = self._sources[key]
             getattr(self, source["name"]).data = data
             getattr(self, source["name"]).meta = source["meta"]
 
         self._current = max
 
     def terminate(self):
-        self._store.close()
+        for segment in self._segments:
+            self._close(segment)
+        if self._offline:
+            clock.set_virtual(None)
+
+    def _open(self, segment):
+        if segment["store"] is not None:
+            return
+        try:
+            store = pd.HDFStore(segment["filename"], mode="r")
+        except IOError as e:
+            raise WorkerInterrupt(e)
+        start = pd.Timestamp.max
+        stop = pd.Timestamp.min
+        sources = {}
+        for key in self._keys:
+            try:
+                if is_array(store, key):
+                    # Column-oriented layout: keep the timestamps in memory
+                    timestamps = store.get_node(key)._f_get_child("timestamps")[:]
+                    nrows = len(timestamps)
+                    first = pd.Timestamp(timestamps[0])
+                    last = pd.Timestamp(timestamps[-1])
+                else:
+                    timestamps = None
+                    # Check format
+                    if not store.get_storer(key).is_table:
+                        self.logger.warning("%s: Fixed format. Will be skipped.", key)
+                        continue
+                    # Get first index
+                    first = store.select(key, start=0, stop=1).index[0]
+                    # Get last index
+                    nrows = store.get_storer(key).nrows
+                    last = store.select(key, start=nrows - 1, stop=nrows).index[0]
+                # Check index type
+                if type(first) != pd.Timestamp:
+                    self.logger.warning("%s: Invalid index. Will be skipped.", key)
+                    continue
+                # Find lowest and highest indices across keys
+                if first < start:
+                    start = first
+                if last > stop:
+                    stop = last
+                # Extract meta
+                if store.get_node(key)._v_attrs.__contains__("meta"):
+                    meta = store.get_node(key)._v_attrs["meta"]
+                else:
+                    meta = {}
+                # Set output port name, port will be created dynamically
+                name = "o" + key.replace("/", "_")
+                # Update sources
+                sources[key] = {
+                    "start": first,
+                    "stop": last,
+                    "nrows": nrows,
+                    "timestamps": timestamps,
+                }
+                self._sources[key] = {"name": name, "meta": meta}
+            except KeyError:
+                self.logger.warning("%s: Key not found.", key)
+        segment["store"] = store
+        segment["sources"] = sources
+        if segment["start"] is None:
+            segment["start"] = start
+            segment["stop"] = stop
+
+    def _close(self, segment):
+        if segment["store"] is not None:
+            segment["store"].close()
+            segment["store"] = None
+            segment["sources"] = None
+
+    def _select(self, store, key, source, min, max):
+        if source["timestamps"] is not None:
+            start, stop = np.searchsorted(source["timestamps"], [min.value, max.value])
+            return select_array(store, key, start, stop)
+        return store.select(key, "index >= min & index < max")
 
     def _find_path(self, path):
         path = os.path.normpath(path)
@@ -155,10 +269,32 @@ class Replay(Node):
 
 
 class Save(Node):
-    """Save to HDF5."""
+    """Save to HDF5.
+
+    Incoming rows are buffered per key and written in large batches, either when a
+    key holds enough rows or when enough time has elapsed since the last flush.
+    By default, the batches are written from a dedicated thread, so that disk I/O
+    and compression never stall the processing graph. The writer queue is bounded:
+    if the disk cannot keep up, a warning is logged and the node blocks until the
+    queue drains.
+    """
 
     def __init__(
-        self, filename=None, path="/tmp", complib="zlib", complevel=3, min_itemsize=None
+        self,
+        filename=None,
+        path="/tmp",
+        complib=None,
+        complevel=None,
+        min_itemsize=None,
+        profile="default",
+        layout=None,
+        batch_size=10000,
+        flush_interval=1,
+        queue_size=16,
+        expectedrows=None,
+        threaded=True,
+        rotate_duration=None,
+        rotate_size=None,
     ):
         """
         Initialize.
@@ -172,18 +308,62 @@ class Save(Node):
             The directory where the HDF5 file will be written.
             Default: "/tmp"
         complib : string
-            The compression lib to be used.
+            The compression lib to be used. Byte shuffling is always enabled.
             see: https://www.pytables.org/usersguide/libref/helper_classes.html
-            Default: "zlib"
+            Default: set by the profile
         complevel : int
             The compression level. A value of 0 disables compression.
-            Default: 3
+            Default: set by the profile
             see: https://www.pytables.org/usersguide/libref/helper_classes.html
         min_itemsize : int
             The string columns size
             Default: None
             see: https://pandas.pydata.org/pandas-docs/stable/generated/pandas.HDFStore.append.html
             see: http://pandas.pydata.org/pandas-docs/stable/io.html#string-columns
+        profile : string
+            The recording profile, which sets the default compression and layout:
+            `default` (zlib, table), `fast` (blosc:lz4, array) or `compact`
+            (blosc:zstd, array).
+            Default: "default"
+        layout : string
+            If `table`, data is stored as pandas tables. If `array`, numeric data is
+            stored as a `float32` array of values and a separate `int64` array of
+            timestamps, which is much faster to write and read back. Non-numeric
+            data, such as events, is always stored as tables.
+            see: :mod:`timeflux.helpers.hdf5`
+            Default: set by the profile
+        batch_size : int
+            The number of rows to buffer for a key before it is flushed.
+            Default: 10000
+        flush_interval : float
+            The maximum time, in seconds, between two flushes.
+            Default: 1
+        queue_size : int
+            The maximum number of batches waiting to be written.
+            Default: 16
+        expectedrows : int
+            A hint for the total number of rows per key, used by PyTables to
+            compute an efficient chunk shape when the table is created.
+            Default: None
+            see: https://www.pytables.org/usersguide/optimization.html
+        threaded : boolean
+            If False, batches are written synchronously in the scheduler thread.
+            Default: True
+        rotate_duration : float
+            If set, start a new file when the current one spans this duration, in
+            seconds of recorded data.
+            Default: None
+        rotate_size : float
+            If set, start a new file when the current one reaches this size, in
+            megabytes.
+            Default: None
+
+        Notes
+        -----
+        When rotation is enabled, the files are suffixed with a sequence number
+        (e.g. `20200101-120000-0000.hdf5`) and a JSON manifest listing the files and
+        their time ranges is written next to them (e.g. `20200101-120000.json`).
+        The manifest is updated on each rotation and can be given to :class:`Replay`.
 
         """
         os.makedirs(path, exist_ok=True)
@@ -193,31 +373,186 @@ class Save(Node):
             )
         else:
             filename = os.path.join(path, filename)
-        self.logger.info("Saving to %s", filename)
-        self._store = pd.HDFStore(filename, complib=complib, complevel=complevel)
+        if profile not in PROFILES:
+            raise ValueError(f"Unknown profile: {profile}")
+        complib = complib or PROFILES[profile]["complib"]
+        complevel = PROFILES[profile]["complevel"] if complevel is None else complevel
+        self._layout = layout or PROFILES[profile]["layout"]
+        if self._layout not in ("table", "array"):
+            raise ValueError(f"Unknown layout: {self._layout}")
+        self._layouts = {}
+        self._filters = tables.Filters(complevel, complib, shuffle=True)
+        self._complib = complib
+        self._complevel = complevel
+        self._rotate_duration = None
+        if rotate_duration:
+            self._rotate_duration = pd.Timedelta(rotate_duration, "s")
+        self._rotate_size = rotate_size * 1e6 if rotate_size else None
+        self._filename = filename
+        self._manifest = None
+        if rotate_duration or rotate_size:
+            root, extension = os.path.splitext(filename)
+            self._manifest = root + ".json"
+            self._filename = root + "-{:04d}" + extension
+        self._segments = []
+        self._meta = {}
+        self._open()
         self.min_itemsize = min_itemsize
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._expectedrows = expectedrows
+        self._buffers = {}
+        self._last_flush = time.time()
+        self._error = None
+        self._queue = None
+        self._thread = None
+        if threaded:
+            self._queue = Queue(maxsize=queue_size)
+            self._thread = Thread(target=self._writer, daemon=True)
+            self._thread.start()
 
     def update(self):
+        if self._error:
+            raise WorkerInterrupt(f"Could not write to HDF5 store: {self._error}")
         if self.ports is not None:
             for name, port in self.ports.items():
                 if not name.startswith("i"):
                     continue
                 key = "/" + name[2:].replace("_", "/")
+                if key not in self._buffers:
+                    self._buffers[key] = {"data": [], "rows": 0, "meta": None}
+                buffer = self._buffers[key]
+                # Chunks are written later, possibly from another thread: copy
+                # them so that nodes sharing them cannot alter the recording
                 if port.data is not None:
-                    if isinstance(port.data, pd.DataFrame):
-                        port.data.index.freq = None
-                    self._store.append(key, port.data, min_itemsize=self.min_itemsize)
+                    buffer["data"].append(port.data.copy())
+                    buffer["rows"] += len(port.data)
                 if port.meta is not None and port.meta:
                     # Note: not none and not an empty dict, because this operation
                     #       overwrites previous metadata and an empty dict would
                     #       just remove any previous change
-                    node = self._store.get_node(key)
-                    if node:
-                        self._store.get_node(key)._v_attrs["meta"] = port.meta
+                    buffer["meta"] = deepcopy(port.meta)
+                if buffer["rows"] >= self._batch_size:
+                    self._flush(key)
+        if time.time() - self._last_flush >= self._flush_interval:
+            self._flush_all()
 
     def terminate(self):
+        try:
+            self._flush_all()
+            if self._thread:
+                self._queue.put(None)
+                self._thread.join()
+        except Exception as error:
+            self.logger.error(error)
         try:
             self._store.close()
         except Exception:
             # Just in case
             pass
+        if self._manifest and self._segment["start"] is not None:
+            self._segments.append(self._segment)
+            write_manifest(self._manifest, self._segments)
+
+    def _open(self):
+        filename = self._filename
+        if self._manifest:
+            filename = filename.format(len(self._segments))
+        self.logger.info("Saving to %s", filename)
+        self._store = pd.HDFStore(
+            filename, complib=self._complib, complevel=self._complevel
+        )
+        self._segment = {
+            "filename": os.path.basename(filename),
+            "start": None,
+            "stop": None,
+            "keys": set(),
+        }
+
+    def _rotate(self):
+        self._store.close()
+        self._segments.append(self._segment)
+        write_manifest(self._manifest, self._segments)
+        self._open()
+
+    def _expired(self):
+        if self._segment["start"] is None:
+            return False
+        if self._rotate_duration:
+            if self._segment["stop"] - self._segment["start"] >= self._rotate_duration:
+                return True
+        if self._rotate_size:
+            if os.path.getsize(self._store.filename) >= self._rotate_size:
+                return True
+        return False
+
+    def _flush_all(self):
+        for key in self._buffers:
+            self._flush(key)
+        self._last_flush = time.time()
+
+    def _flush(self, key):
+        buffer = self._buffers[key]
+        if not buffer["data"] and not buffer["meta"]:
+            return
+        data = None
+        if buffer["data"]:
+            data = pd.concat(buffer["data"])
+            if isinstance(data, pd.DataFrame):
+                data.index.freq = None
+        batch = (key, data, buffer["meta"])
+        self._buffers[key] = {"data": [], "rows": 0, "meta": None}
+        if not self._thread:
+            self._write(*batch)
+            return
+        try:
+            self._queue.put_nowait(batch)
+        except Full:
+            self.logger.warning("The HDF5 writer is falling behind")
+            self._queue.put(batch)
+
+    def _write(self, key, data, meta):
+        fresh = False
+        if data is not None:
+            if self._manifest and self._expired():
+                self._rotate()
+            fresh = key not in self._segment["keys"]
+            self._segment["keys"].add(key)
+            if key not in self._layouts:
+                # The layout is chosen once and for all for each key
+                array = self._layout == "array" and is_numeric(data)
+                self._layouts[key] = "array" if array else "table"
+            if self._layouts[key] == "array":
+                append_array(self._store, key, data, self._filters, self._expectedrows)
+            else:
+                self._store.append(
+                    key,
+                    data,
+                    min_itemsize=self.min_itemsize,
+                    expectedrows=self._expectedrows,
+                )
+            if not data.empty:
+                # Keep track of the time range of the current file
+                first, last = data.index.min(), data.index.max()
+                if self._segment["start"] is None or first < self._segment["start"]:
+                    self._segment["start"] = first
+                if self._segment["stop"] is None or last > self._segment["stop"]:
+                    self._segment["stop"] = last
+        if meta:
+            self._meta[key] = meta
+        if (meta or fresh) and key in self._meta:
+            # Meta is copied to each new file
+            node = self._store.get_node(key)
+            if node:
+                node._v_attrs["meta"] = self._meta[key]
+
+    def _writer(self):
+        while True:
+            batch = self._queue.get()
+            if batch is None:
+                break
+            try:
+                self._write(*batch)
+            except Exception as error:
+                self.logger.error(error)
+                self._error = error
@@ -19,8 +19,49 @@ from pylsl import (
     resolve_byprop,
     pylsl,
 )
-from time import time
+from threading import Thread
+from time import time, sleep
 from timeflux.core.node import Node
+from timeflux.helpers.ring import Ring
+
+# LSL channel format: (buffer dtype, output dtype)
+_FORMATS = {
+    pylsl.cf_float32: (np.float32, np.float64),
+    pylsl.cf_double64: (np.float64, np.float64),
+    pylsl.cf_int8: (np.int8, np.int64),
+    pylsl.cf_int16: (np.int16, np.int64),
+    pylsl.cf_int32: (np.int32, np.int64),
+    pylsl.cf_int64: (np.int64, np.int64),
+}
+
+
+def _describe(info, channels=None):
+    """Get the meta data and the channel labels of a stream.
+
+    Args:
+        info (StreamInfo): The stream info.
+        channels (list, None): Override the channel names.
+
+    Returns:
+        tuple: The meta data and the channel labels.
+
+    """
+    meta = {
+        "name": info.name(),
+        "type": info.type(),
+        "rate": info.nominal_srate(),
+        "info": str(info.as_xml()).replace("\n", "").replace("\t", ""),
+    }
+    if isinstance(channels, list):
+        labels = channels
+    else:
+        description = info.desc()
+        channel = description.child("channels").first_child()
+        labels = [channel.child_value("label")]
+        for _ in range(info.channel_count() - 1):
+            channel = channel.next_sibling()
+            labels.append(channel.child_value("label"))
+    return meta, labels
 
 
 class Send(Node):
@@ -37,6 +78,13 @@ class Send(Node):
         rate (float): The nominal sampling rate. Set to ``0.0`` to indicate a variable sampling rate.
         source (string, None): The unique identifier for the stream. If ``None``, it will be auto-generated.
         config_path (string, None): The path to an LSL config file.
+        chunk_size (int): The preferred chunk size, in samples, of the outlet. If ``0``, each pushed chunk is transmitted as is.
+        max_buffered (int): The maximum amount of data buffered by the outlet, in seconds (or in samples if ``rate`` is ``0.0``).
+
+    Notes:
+        The columns matching the format are selected on the first chunk, and the
+        selection is reused as long as the columns do not change. Each chunk is
+        pushed at once, with per-sample timestamps.
 
     Example:
         .. literalinclude:: /../examples/lsl.yaml
@@ -54,6 +102,8 @@ class Send(Node):
         rate=0.0,
         source=None,
         config_path=None,
+        chunk_size=0,
+        max_buffered=360,
     ):
         if not source:
             source = str(uuid.uuid4())
@@ -62,34 +112,62 @@ class Send(Node):
         self._format = format
         self._rate = rate
         self._source = source
+        self._chunk_size = chunk_size
+        self._max_buffered = max_buffered
         self._outlet = None
+        self._columns = None
+        self._labels = None
+        self._positions = None
+        self._stamped = True  # Per-sample timestamps are supported by pylsl
         if config_path:
             os.environ["LSLAPICFG"] = config_path
 
     def update(self):
         if isinstance(self.i.data, pd.core.frame.DataFrame):
             if not self._outlet:
-                labels = list(
+                self._labels = list(
                     self.i.data.select_dtypes(include=[self._dtypes[self._format]])
                 )
                 info = StreamInfo(
                     self._name,
                     self._type,
-                    len(labels),
+                    len(self._labels),
                     self._rate,
                     self._format,
                     self._source,
                 )
                 channels = info.desc().append_child("channels")
-                for label in labels:
+                for label in self._labels:
                     if not isinstance("string", type(label)):
                         label = str(label)
                     channels.append_child("channel").append_child_value("label", label)
-                self._outlet = StreamOutlet(info)
-            values = self.i.data.select_dtypes(
-                include=[self._dtypes[self._format]]
-            ).values
+                self._outlet = StreamOutlet(info, self._chunk_size, self._max_buffered)
+            if self._columns is None or not self.i.data.columns.equals(self._columns):
+                self._columns = self.i.data.columns
+                self._positions = self._columns.get_indexer(self._labels)
+                if (self._positions < 0).any():
+                    self.logger.warning("Missing columns, the chunk is ignored")
+                    self._columns = None
+                    return
+                if np.array_equal(self._positions, np.arange(len(self._columns))):
+                    self._positions = None
+            if self.i.data.empty:
+                return
+            data = self.i.data
+            if self._positions is not None:
+                data = data.iloc[:, self._positions]
+            if self._format == "double64":
+                values = data.to_numpy(dtype=np.float64)
+            else:
+                values = data.values.tolist()
             stamps = self.i.data.index.values.astype(np.float64) / 1e9
+            if self._stamped:
+                try:
+                    self._outlet.push_chunk(values, stamps)
+                    return
+                except TypeError:
+                    # Older versions of pylsl only accept the timestamp of the last sample
+                    self._stamped = False
             for row, stamp in zip(values, stamps):
                 self._outlet.push_sample(row, stamp)
 
@@ -106,7 +184,7 @@ class Receive(Node):
         value (string): The value that the property should have (e.g., ``EEG`` for the type property).
         timeout (float): The resolution timeout, in seconds.
         channels (list, None): Override the channel names. If ``None``, the names defined in the LSL stream will be used.
-        max_samples (int): The maximum number of samples to return per call.
+        max_samples (int): The maximum number of samples to return per call. Numeric streams are pulled into a buffer of this size, allocated once.
         clocksync (bool): Perform automatic clock synchronization.
         dejitter (bool): Remove jitter from timestamps using a smoothing algorithm to the received timestamps.
         monotonize (bool): Force the timestamps to be monotonically ascending. Only makes sense if timestamps are dejittered.
@@ -141,6 +219,8 @@ class Receive(Node):
         self._channels = channels
         self._timeout = timeout
         self._max_samples = max_samples
+        self._buffer = None
+        self._dtype = None
         self._flags = 0
         self._offset = 0
         if clocksync:
@@ -165,26 +245,190 @@ class Receive(Node):
             self._flags = pylsl.proc_clocksync | pylsl.proc_dejitter
             self._inlet = StreamInlet(streams[0], processing_flags=self._flags)
             info = self._inlet.info()
-            self._meta = {
-                "name": info.name(),
-                "type": info.type(),
-                "rate": info.nominal_srate(),
-                "info": str(info.as_xml()).replace("\n", "").replace("\t", ""),
-            }
-            if isinstance(self._channels, list):
-                self._labels = self._channels
-            else:
-                description = info.desc()
-                channel = description.child("channels").first_child()
-                self._labels = [channel.child_value("label")]
-                for _ in range(info.channel_count() - 1):
-                    channel = channel.next_sibling()
-                    self._labels.append(channel.child_value("label"))
+            self._meta, self._labels = _describe(info, self._channels)
+            if info.channel_format() in _FORMATS:
+                dtype, self._dtype = _FORMATS[info.channel_format()]
+                self._buffer = np.empty(
+                    (self._max_samples, info.channel_count()), dtype=dtype
+                )
         if self._inlet:
-            values, stamps = self._inlet.pull_chunk(max_samples=self._max_samples)
-            if stamps:
-                if self._offset != 0:
-                    self._offset
-                    stamps = np.array(stamps) + self._offset
+            if self._buffer is not None:
+                # Let liblsl write directly into the buffer
+                _, stamps = self._inlet.pull_chunk(
+                    max_samples=self._max_samples, dest_obj=self._buffer
+                )
+                # Copy the filled slice, as the buffer is reused
+                values = self._buffer[: len(stamps)].astype(self._dtype)
+            else:
+                values, stamps = self._inlet.pull_chunk(max_samples=self._max_samples)
+            if len(stamps):
+                stamps = np.asarray(stamps, dtype=np.float64) + self._offset
                 stamps = pd.to_datetime(stamps, format=None, unit="s")
                 self.o.set(values, stamps, self._labels, self._meta)
+
+
+class MultiReceive(Node):
+
+    """Receive from several LSL streams, in a background thread.
+
+    Streams are resolved continuously, without ever blocking the graph. Once a stream
+    is acquired, its samples are pulled by the background thread, independently of
+    the graph rate, into a ring buffer. On each update, the buffered samples are
+    provided on the output port named after the stream.
+
+    Attributes:
+        o_* (Port): Dynamic outputs, provide DataFrame and meta, one for each stream.
+
+    Args:
+        streams (dict): The streams to receive. Keys are port suffixes, and values are
+            dicts with a ``prop`` and a ``value`` used for stream resolution (see
+            :class:`Receive`), and optional ``channels`` to override the channel names.
+        buffer (float): The capacity of each ring buffer, in seconds at the nominal
+            rate. Irregular streams get a capacity of ``buffer`` times ``max_samples``.
+        max_samples (int): The maximum number of samples to pull at once from a stream.
+        interval (float): The delay between two pulling rounds, in seconds.
+        clocksync (bool): Perform automatic clock synchronization.
+        dejitter (bool): Remove jitter from timestamps using a smoothing algorithm to the received timestamps.
+        monotonize (bool): Force the timestamps to be monotonically ascending. Only makes sense if timestamps are dejittered.
+        config_path (string, None): The path to an LSL config file.
+
+    Example:
+        .. code-block:: yaml
+
+           - id: lsl
+             module: timeflux.nodes.lsl
+             class: MultiReceive
+             params:
+               streams:
+                 eeg: { prop: type, value: EEG }
+                 markers: { prop: name, value: Markers, channels: [label] }
+
+        The streams are provided on the ``o_eeg`` and ``o_markers`` ports.
+
+    """
+
+    def __init__(
+        self,
+        streams,
+        buffer=10,
+        max_samples=1024,
+        interval=0.005,
+        clocksync=True,
+        dejitter=False,
+        monotonize=False,
+        config_path=None,
+    ):
+        if not streams or not isinstance(streams, dict):
+            raise ValueError("Please specify a dict of streams.")
+        if config_path:
+            os.environ["LSLAPICFG"] = config_path
+        self._buffer = buffer
+        self._max_samples = max_samples
+        self._interval = interval
+        self._flags = pylsl.proc_threadsafe
+        self._offset = 0
+        if clocksync:
+            self._flags |= pylsl.proc_clocksync
+            self._offset = time() - pylsl.local_clock()
+        if dejitter:
+            self._flags |= pylsl.proc_dejitter
+        if monotonize:
+            self._flags |= pylsl.proc_monotonize
+        self._streams = {}
+        for name, stream in streams.items():
+            if not stream.get("prop") or not stream.get("value"):
+                raise ValueError(f"Please specify a property and value for '{name}'.")
+            self._streams[name] = {
+                "resolver": pylsl.ContinuousResolver(stream["prop"], stream["value"]),
+                "channels": stream.get("channels"),
+                "inlet": None,
+                "ring": None,
+                "dropped": 0,
+                "retry": 0,
+            }
+        self._running = True
+        self._thread = Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def update(self):
+        for name, stream in self._streams.items():
+            ring = stream["ring"]
+            if ring is None:
+                continue
+            values, stamps = ring.pull()
+            if ring.dropped != stream["dropped"]:
+                self.logger.warning(
+                    f"{ring.dropped - stream['dropped']} samples dropped from '{name}'"
+                )
+                stream["dropped"] = ring.dropped
+            if values is None:
+                continue
+            if stream["dtype"] is not None:
+                values = values.astype(stream["dtype"], copy=False)
+            stamps = pd.to_datetime(stamps + self._offset, unit="s")
+            getattr(self, "o_" + name).set(
+                values, stamps, stream["labels"], dict(stream["meta"])
+            )
+
+    def terminate(self):
+        self._running = False
+        self._thread.join()
+
+    def _run(self):
+        while self._running:
+            for name, stream in self._streams.items():
+                try:
+                    if stream["inlet"] is not None:
+                        self._pull(stream)
+                    elif time() >= stream["retry"]:
+                        self._resolve(name, stream)
+                except Exception as error:
+                    # Typically, a lost stream: resolve it again, a bit later
+                    self.logger.warning(f"Stream '{name}': {error}")
+                    stream["inlet"] = None
+                    stream["retry"] = time() + 1
+            sleep(self._interval)
+
+    def _resolve(self, name, stream):
+        results = stream["resolver"].results()
+        if not results:
+            return
+        inlet = StreamInlet(results[0], processing_flags=self._flags)
+        info = inlet.info()
+        meta, labels = _describe(info, stream["channels"])
+        rate = info.nominal_srate()
+        if rate > 0:
+            capacity = max(int(self._buffer * rate), self._max_samples)
+        else:
+            capacity = int(self._buffer * self._max_samples)
+        if info.channel_format() in _FORMATS:
+            dtype, stream["dtype"] = _FORMATS[info.channel_format()]
+            stream["chunk"] = np.empty(
+                (self._max_samples, info.channel_count()), dtype=dtype
+            )
+        else:
+            dtype, stream["dtype"], stream["chunk"] = object, None, None
+        stream.update({"meta": meta, "labels": labels})
+        # The ring is replaced only if the stream was never acquired before
+        if stream["ring"] is None:
+            stream["ring"] = Ring(capacity, info.channel_count(), dtype)
+        stream["inlet"] = inlet
+        self.logger.debug(f"Stream '{name}' acquired")
+
+    def _pull(self, stream):
+        while True:
+            if stream["chunk"] is not None:
+                _, stamps = stream["inlet"].pull_chunk(
+                    max_samples=self._max_samples, dest_obj=stream["chunk"]
+                )
+                values = stream["chunk"]
+            else:
+                values, stamps = stream["inlet"].pull_chunk(
+                    max_samples=self._max_samples
+                )
+                values = np.array(values, dtype=object)
+            if not len(stamps):
+                return
+            stream["ring"].push(values, np.asarray(stamps, dtype=np.float64))
+            if len(stamps) < self._max_samples:
+                return
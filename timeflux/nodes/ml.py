@@ -4,9 +4,7 @@ import importlib
 import numpy as np
 import pandas as pd
 import json
-from joblib import load
 from jsonschema import validate
-from sklearn.pipeline import make_pipeline
 from timeflux.core.node import Node
 from timeflux.core.exceptions import ValidationError, WorkerInterrupt
 from timeflux.helpers.background import Task
@@ -274,10 +272,14 @@ class Pipeline(Node):
 
     def _make_pipeline(self, steps):
         # TODO: memory and verbose args
+        from sklearn.pipeline import make_pipeline  # Slow import
+
         pipeline = self._instantiate_pipeline(steps)
         self._pipeline = make_pipeline(*pipeline, memory=None, verbose=False)
 
     def _load_pipeline(self, path):
+        from joblib import load  # Slow import
+
         try:
             self._pipeline = load(path)
         except:
@@ -1,49 +1,69 @@
 """timeflux.nodes.osc: Simple OSC client and server"""
 
+import numpy as np
 import pandas as pd
-from threading import Thread, Lock
+from threading import Thread
 from pythonosc.dispatcher import Dispatcher
 from pythonosc.osc_server import BlockingOSCUDPServer
+from pythonosc.osc_bundle_builder import OscBundleBuilder, IMMEDIATELY
+from pythonosc.osc_message_builder import OscMessageBuilder
 from pythonosc.udp_client import SimpleUDPClient
 from timeflux.helpers.clock import now
+from timeflux.helpers.ring import Ring
 from timeflux.core.node import Node
 
 
 class Server(Node):
 
-    """A simple OSC server."""
+    """A simple OSC server.
 
-    def __init__(self, addresses=[], ip="127.0.0.1", port=5005):
+    Incoming messages are written by the server thread into one ring buffer per
+    address, without locking. If a buffer is full, incoming messages are dropped and
+    a warning is issued.
+
+    Args:
+        addresses (list): The OSC addresses to listen to.
+        ip (string): The IP address to bind to.
+        port (int): The port to bind to.
+        capacity (int): The maximum number of messages buffered between two updates,
+            per address.
+
+    """
+
+    def __init__(self, addresses=[], ip="127.0.0.1", port=5005, capacity=4096):
         self._server = None
-        self._data = {}
-        self._lock = Lock()
+        self._rings = {}
+        self._dropped = {}
         if not addresses or not isinstance(addresses, list):
             raise ValueError("You must provide a list of addresses.")
         dispatcher = Dispatcher()
         for address in addresses:
-            self._data[self._address_to_port(address)] = {"timestamps": [], "rows": []}
-            dispatcher.map(address, self._handler)
+            ring = Ring(capacity, dtype=object)
+            self._rings[self._address_to_port(address)] = ring
+            self._dropped[self._address_to_port(address)] = 0
+            dispatcher.map(address, self._handler, ring)
         self._server = BlockingOSCUDPServer((ip, port), dispatcher)
         Thread(target=self._server.serve_forever).start()
 
     def update(self):
-        with self._lock:
-            for port, data in self._data.items():
-                if data["rows"]:
-                    getattr(self, port).set(data["rows"], data["timestamps"])
-                    self._data[port] = {"timestamps": [], "rows": []}
+        for port, ring in self._rings.items():
+            rows, timestamps = ring.pull()
+            if ring.dropped != self._dropped[port]:
+                self.logger.warning(
+                    f"{ring.dropped - self._dropped[port]} messages dropped on {port}"
+                )
+                self._dropped[port] = ring.dropped
+            if rows is not None:
+                timestamps = timestamps.astype(np.int64).astype("datetime64[us]")
+                getattr(self, port).set(rows.tolist(), timestamps)
 
     def terminate(self):
         if self._server:
             self._server.shutdown()
+            self._server.server_close()
 
-    def _handler(self, address, *args):
-        time = now()
-        port = self._address_to_port(address)
-        values = list(args)
-        with self._lock:
-            self._data[port]["rows"].append(values)
-            self._data[port]["timestamps"].append(time)
+    def _handler(self, address, ring, *args):
+        ring[0].append(list(args), now().astype(np.int64))
 
     def _address_to_port(self, address):
         address = "/" + address if not address.startswith("/") else address
@@ -52,15 +72,37 @@ class Server(Node):
 
 class Client(Node):
 
-    """A simple OSC client."""
+    """A simple OSC client.
+
+    Args:
+        address (string): The OSC address.
+        ip (string): The IP address of the server.
+        port (int): The port of the server.
+        bundle (bool): If `True`, each chunk is sent as a single OSC bundle, with one
+            message per row. Bundles are sent as single UDP datagrams, so make sure
+            that chunks are small enough.
+
+    """
 
-    def __init__(self, address="", ip="127.0.0.1", port=5005):
+    def __init__(self, address="", ip="127.0.0.1", port=5005, bundle=False):
         if not address or not isinstance(address, str):
             raise ValueError("You must provide an address.")
         self._address = address
+        self._bundle = bundle
         self._client = SimpleUDPClient(ip, port)
 
     def update(self):
         if self.i.data is not None:
-            for row in self.i.data.itertuples(index=False):
-                self._client.send_message(self._address, row)
+            if self._bundle:
+                if self.i.data.empty:
+                    return
+                bundle = OscBundleBuilder(IMMEDIATELY)
+                for row in self.i.data.values.tolist():
+                    message = OscMessageBuilder(self._address)
+                    for value in row:
+                        message.add_arg(value)
+                    bundle.add_content(message.build())
+                self._client.send(bundle.build())
+            else:
+                for row in self.i.data.itertuples(index=False):
+                    self._client.send_message(self._address, row)
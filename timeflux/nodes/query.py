@@ -1,9 +1,55 @@
 import re
 import numpy as np
+import pandas as pd
 from timeflux.core.exceptions import WorkerInterrupt
 from timeflux.core.node import Node
 
 
+class _Selector:
+    """Resolve a label-based selection into cached integer positions.
+
+    The selection is applied to a Series mapping each label to its position, so that
+    it follows the pandas semantics. The positions are computed again only when the
+    labels change, so this is only worth it for the columns: the time index changes
+    with every chunk.
+
+    Args:
+        select (callable): Takes the positions Series and returns the selected subset.
+
+    """
+
+    def __init__(self, select):
+        self._select = select
+        self._labels = None
+        self._positions = None
+        self._result = None
+
+    def __call__(self, labels):
+        """Get the positions and the resulting labels.
+
+        Args:
+            labels (Index): The labels along the selected axis.
+
+        Returns:
+            tuple: The selected positions, and the labels of the selection. If the
+            selection is a single scalar, the labels are `None`.
+
+        """
+        if self._labels is None or not (
+            labels is self._labels
+            or (labels.equals(self._labels) and labels.names == self._labels.names)
+        ):
+            selected = self._select(pd.Series(np.arange(len(labels)), index=labels))
+            if isinstance(selected, pd.Series):
+                self._positions = selected.values
+                self._result = selected.index
+            else:
+                self._positions = np.array([selected])
+                self._result = None
+            self._labels = labels
+        return self._positions, self._result
+
+
 class SelectRange(Node):
     """Select a subset of the given data along vertical (index) or horizontal (columns) axis.
 
@@ -48,6 +94,7 @@ class SelectRange(Node):
         self._ranges = ranges  # list of ranges per level
         self._inclusive = inclusive  # include boundaries.
         self._axis = axis
+        self._selector = _Selector(lambda positions: positions[self._mask(positions)])
 
     def update(self):
         if not self.i.ready():
@@ -55,31 +102,28 @@ class SelectRange(Node):
 
         self.o.meta = self.i.meta
 
-        if self._axis == 1:
-            self.i.data = self.i.data.T
-
-        mask = self._mask()
-
-        self.o.data = self.i.data[np.logical_and.reduce(mask)]
-        if self._axis == 1:
-            self.o.data = self.o.data.T
+        if self._axis == 0:
+            self.o.data = self.i.data[self._mask(self.i.data)]
+        else:
+            positions, _ = self._selector(self.i.data.columns)
+            self.o.data = self.i.data.take(positions, axis=1)
 
-    def _mask(self):
+    def _mask(self, data):
+        index = data.index
         if self._inclusive:
             mask = [
-                (self.i.data.index.get_level_values(l) >= r[0])
-                & (self.i.data.index.get_level_values(l) <= r[1])
+                (index.get_level_values(l) >= r[0])
+                & (index.get_level_values(l) <= r[1])
                 for l, r in (self._ranges).items()
                 if r is not None
             ]
         else:
             mask = [
-                (self.i.data.index.get_level_values(l) > r[0])
-                & (self.i.data.index.get_level_values(l) < r[1])
+                (index.get_level_values(l) > r[0]) & (index.get_level_values(l) < r[1])
                 for l, r in (self._ranges).items()
                 if r is not None
             ]
-        return mask
+        return np.logical_and.reduce(mask)
 
 
 class XsQuery(Node):
@@ -136,7 +180,12 @@ class XsQuery(Node):
         """
 
         self._key = key
-        self._kwargs = kwargs
+        self._kwargs = dict(kwargs)
+        axis = self._kwargs.pop("axis", 0)
+        self._axis = {"index": 0, "rows": 0, "columns": 1}.get(axis, axis)
+        self._selector = _Selector(
+            lambda positions: positions.xs(key=self._key, **self._kwargs)
+        )
         self._ready = False
 
     def update(self):
@@ -153,7 +202,16 @@ class XsQuery(Node):
             self._query()
 
     def _query(self):
-        self.o.data = self.i.data.xs(key=self._key, **self._kwargs)
+        data = self.i.data
+        if self._axis == 0:
+            self.o.data = data.xs(key=self._key, axis=0, **self._kwargs)
+            return
+        positions, labels = self._selector(data.columns)
+        if labels is None:
+            # A single column
+            self.o.data = data.iloc[:, positions[0]]
+        else:
+            self.o.data = data.take(positions, axis=1).set_axis(labels, axis=1)
 
 
 class LocQuery(Node):
@@ -202,6 +260,7 @@ class LocQuery(Node):
             self._key = [key]
         else:
             self._key = key
+        self._selector = _Selector(self._locate)
         self._ready = False
 
     def update(self):
@@ -220,13 +279,27 @@ class LocQuery(Node):
             except KeyError as e:
                 raise WorkerInterrupt(e)
         else:
-            self.o.data = self.i.data.loc[:, self._key]
+            self._query()
 
     def _query(self):
+        data = self.i.data
         if self._axis == 0:
-            self.o.data = self.i.data.loc[self._key, :]
-        else:  # self._axis == 1:
-            self.o.data = self.i.data.loc[:, self._key]
+            self.o.data = data.loc[self._key, :]
+            return
+        positions, labels = self._selector(data.columns)
+        if labels is None:
+            # A single column
+            self.o.data = data.iloc[:, positions[0]]
+        else:
+            # The labels of the selection, with the levels dropped by partial keys
+            self.o.data = data.take(positions, axis=1).set_axis(labels, axis=1)
+
+    def _locate(self, positions):
+        # Tuples are single labels in a MultiIndex, and lists of labels otherwise
+        key = self._key
+        if not (isinstance(key, tuple) and isinstance(positions.index, pd.MultiIndex)):
+            key = list(key)
+        return positions.loc[key]
 
 
 class Match(Node):
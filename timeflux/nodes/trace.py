@@ -0,0 +1,197 @@
+"""End-to-end latency tracing
+
+Chunks going through an :class:`Origin` node are traced: each time they are passed
+to another node, published or received, a hop is recorded in their meta (see
+:mod:`timeflux.helpers.trace`). A :class:`Latency` node placed at the end of the
+pipeline computes latency histograms for each hop and for each complete path.
+
+Traces only survive through nodes that forward the meta of their inputs.
+
+"""
+
+import numpy as np
+import pandas as pd
+from time import time
+from timeflux.core.node import Node
+from timeflux.helpers.clock import now
+import timeflux.helpers.trace as trace
+
+
+class Origin(Node):
+
+    """Start tracing the chunks.
+
+    This node should be placed right after the acquisition node. Every input port is
+    forwarded to the output port with the same suffix.
+
+    Attributes:
+        i (Port): Default input, expects DataFrame.
+        i_* (Port): Dynamic inputs, expect DataFrame.
+        o (Port): Default output, provides DataFrame and meta.
+        o_* (Port): Dynamic outputs, provide DataFrame and meta.
+
+    Args:
+        label (str): The name of the origin, as it appears in the traces.
+        source (str): If `now` (the default), the origin is the time at which the
+            chunk goes through this node. If `index`, it is the timestamp of the last
+            row of the chunk, so that the acquisition delay is taken into account.
+            This only makes sense if the acquisition device clock is synchronized
+            with the local clock.
+
+    """
+
+    def __init__(self, label="origin", source="now"):
+        if source not in ("now", "index"):
+            raise ValueError(f"Invalid source '{source}'")
+        self._label = label
+        self._source = source
+
+    def update(self):
+        for _, suffix, port in list(self.iterate("i*")):
+            if not port.ready():
+                continue
+            timestamp = None
+            if self._source == "index":
+                timestamp = pd.Timestamp(port.data.index[-1]).value / 1e9
+            output = getattr(self, "o" + suffix)
+            output.data = port.data
+            output.meta = trace.origin(port.meta, self._label, timestamp)
+
+
+class Hop(Node):
+
+    """Record a hop in the traced chunks.
+
+    The scheduler already records a hop each time a traced chunk is passed to a node.
+    This node can be used to add explicit checkpoints, with meaningful labels.
+
+    Attributes:
+        i (Port): Default input, expects DataFrame.
+        i_* (Port): Dynamic inputs, expect DataFrame.
+        o (Port): Default output, provides DataFrame and meta.
+        o_* (Port): Dynamic outputs, provide DataFrame and meta.
+
+    Args:
+        label (str): The name of the hop.
+
+    """
+
+    def __init__(self, label):
+        self._label = label
+
+    def update(self):
+        for _, suffix, port in list(self.iterate("i*")):
+            if port.ready():
+                output = getattr(self, "o" + suffix)
+                output.data = port.data
+                output.meta = trace.hop(port.meta, self._label)
+
+
+class Latency(Node):
+
+    """Compute latency histograms of traced chunks.
+
+    Latencies are accumulated in logarithmic histograms, for each hop (the delay
+    between two consecutive entries of the trace) and for each complete path (the
+    delay between the origin and this node). The statistics are periodically
+    logged and sent to the output port.
+
+    Attributes:
+        i (Port): Default input, expects traced chunks.
+        i_* (Port): Dynamic inputs, expect traced chunks.
+        o (Port): Default output, provides DataFrame with one row for each hop and
+            each path, and the following columns: `kind` (`hop` or `path`), `name`,
+            `count`, and `mean`, `p50`, `p95`, `p99` and `max` latencies in
+            milliseconds.
+
+    Args:
+        label (str): The name of this node, as it appears in the traces.
+        interval (float): The reporting interval, in seconds.
+        low (float): The lower bound of the histograms, in seconds.
+        high (float): The upper bound of the histograms, in seconds.
+        bins (int): The number of bins of the histograms.
+
+    """
+
+    def __init__(self, label="sink", interval=10, low=1e-5, high=10, bins=100):
+        self._label = label
+        self._interval = interval
+        self._edges = np.geomspace(low, high, bins + 1)
+        self._histograms = {}
+        self._reported = time()
+
+    def update(self):
+        timestamp = time()
+        for _, _, port in self.iterate("i*"):
+            if port.ready() and port.meta and "trace" in port.meta:
+                self._add(port.meta["trace"] + [[self._label, timestamp]])
+        if self._histograms and timestamp - self._reported >= self._interval:
+            self._reported = timestamp
+            self.o.data = self.report()
+
+    def terminate(self):
+        if self._histograms:
+            self.report()
+
+    def report(self):
+        """Log the statistics.
+
+        Returns:
+            DataFrame: The statistics.
+
+        """
+        rows = []
+        for (kind, name), histogram in self._histograms.items():
+            row = {
+                "kind": kind,
+                "name": name,
+                "count": histogram["count"],
+                "mean": histogram["sum"] / histogram["count"] * 1000,
+                "p50": self._quantile(histogram, 0.5) * 1000,
+                "p95": self._quantile(histogram, 0.95) * 1000,
+                "p99": self._quantile(histogram, 0.99) * 1000,
+                "max": histogram["max"] * 1000,
+            }
+            rows.append(row)
+            log = self.logger.info if kind == "path" else self.logger.debug
+            log(
+                "%s %s: %d chunks, mean %.2f ms, p50 %.2f ms, p95 %.2f ms, "
+                "p99 %.2f ms, max %.2f ms",
+                kind.capitalize(),
+                name,
+                row["count"],
+                row["mean"],
+                row["p50"],
+                row["p95"],
+                row["p99"],
+                row["max"],
+            )
+        return pd.DataFrame(rows, index=[now()] * len(rows))
+
+    def _add(self, hops):
+        for (source, start), (target, stop) in zip(hops, hops[1:]):
+            self._record("hop", f"{source} > {target}", stop - start)
+        path = " > ".join(label for label, _ in hops)
+        self._record("path", path, hops[-1][1] - hops[0][1])
+
+    def _record(self, kind, name, latency):
+        histogram = self._histograms.get((kind, name))
+        if histogram is None:
+            histogram = {
+                "counts": np.zeros(len(self._edges) - 1, dtype=np.int64),
+                "count": 0,
+                "sum": 0.0,
+                "max": 0.0,
+            }
+            self._histograms[(kind, name)] = histogram
+        index = np.searchsorted(self._edges, latency, "right") - 1
+        histogram["counts"][min(max(index, 0), len(self._edges) - 2)] += 1
+        histogram["count"] += 1
+        histogram["sum"] += latency
+        histogram["max"] = max(histogram["max"], latency)
+
+    def _quantile(self, histogram, q):
+        # Upper edge of the bin containing the quantile, bounded by the maximum
+        cumulative = np.cumsum(histogram["counts"])
+        index = np.searchsorted(cumulative, q * histogram["count"], "left")
+        return min(self._edges[index + 1], histogram["max"])
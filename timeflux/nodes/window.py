@@ -84,6 +84,12 @@ class Slide(Node):
             del self._windows[:complete]  # Unqueue
             self.o = self.o_0  # Bind default output to the first epoch
 
+    def buffers(self):
+        return {
+            "windows": len(self._windows),
+            "rows": sum(len(window) for window in self._windows),
+        }
+
 
 class Window(Node):
 
@@ -122,6 +128,9 @@ class Window(Node):
     def update(self):
         pass
 
+    def buffers(self):
+        return {"buffer": 0 if self._buffer is None else len(self._buffer)}
+
 
 class TimeWindow(Node):
     def __init__(self, length, step=None):
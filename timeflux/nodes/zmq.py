@@ -8,6 +8,7 @@ from timeflux.core.node import Node
 from timeflux.core.exceptions import WorkerInterrupt
 from timeflux.core.io import Port
 import timeflux.core.message
+import timeflux.helpers.trace as trace
 
 
 class Broker(Node):
@@ -174,8 +175,11 @@ class Pub(Node):
                 try:
                     if not port.ready():
                         port.data = None  # make sure we do not send corrupted data
+                    meta = port.meta
+                    if meta and "trace" in meta:
+                        meta = trace.hop(meta, "pub/" + topic.decode("utf-8"))
                     self._socket.send_serialized(
-                        [topic, port.data, port.meta], self._serializer
+                        [topic, port.data, meta], self._serializer
                     )
                 except zmq.ZMQError as e:
                     self.logger.error(e)
@@ -186,6 +190,7 @@ class Sub(Node):
         self, topics=[""], address="tcp://127.0.0.1:5560", deserializer="pickle"
     ):
         """Create a subscriber"""
+        self._received = 0
         try:
             context = zmq.Context.instance()
             self._socket = context.socket(zmq.SUB)
@@ -203,11 +208,15 @@ class Sub(Node):
 
     def update(self):
         self._chunks = {}
+        self._received = 0
         try:
             while True:
                 [topic, data, meta] = self._socket.recv_serialized(
                     self._deserializer, zmq.NOBLOCK
                 )
+                self._received += 1
+                if meta and "trace" in meta:
+                    meta = trace.hop(meta, "sub/" + topic)
                 if not topic in self._chunks:
                     self._chunks[topic] = {"data": [], "meta": {}}
                 self._append_data(topic, data)
@@ -216,6 +225,10 @@ class Sub(Node):
             pass  # No more data
         self._update_ports()
 
+    def buffers(self):
+        # Number of messages that were waiting in the socket at the last update
+        return {"backlog": self._received}
+
     def _append_data(self, topic, data):
         if data is not None:
             self._chunks[topic]["data"].append(data)
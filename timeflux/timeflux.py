@@ -8,7 +8,6 @@ from runpy import run_module
 from dotenv import load_dotenv
 from timeflux import __version__
 from timeflux.core.logging import init_listener, terminate_listener
-from timeflux.core.manager import Manager
 
 LOGGER = logging.getLogger(__name__)
 
@@ -20,6 +19,9 @@ def main():
     _init_logging(args.debug)
     LOGGER.info("Timeflux %s" % __version__)
     _run_hook("pre")
+    # Imported here so that --help and --version do not load the whole stack
+    from timeflux.core.manager import Manager
+
     try:
         Manager(args.app).run()
     except Exception as error: